@@ -0,0 +1,87 @@
+"""
+Compare JSON and CSV wire formats for building the dashboard's DataFrames
+
+Synthetic vault_events-shaped rows are serialised the way PostgREST sends them
+(JSON array of objects, or text/csv) and timed from response bytes to frame.
+No network is involved, so only the client-side decode cost is measured.
+
+    python benchmarks/bench_wire_format.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_REPEAT = 3
+
+
+def make_rows(n, seed=0):
+    """Frame shaped like vault_events (projected columns) with n rows"""
+    rng = np.random.default_rng(seed)
+    vaults = [f'0x{i:040x}' for i in range(max(n // 20, 1))]
+    return pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='10s', tz='UTC').strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+        'event_type': rng.choice(['VaultUpdated', 'VaultLiquidated'], n, p=[0.9, 0.1]),
+        'vault_id': rng.choice(vaults, n),
+        'transaction_hash': [f'0x{i:064x}' for i in rng.integers(0, 2**62, n)],
+        'block_number': np.arange(n) // 4 + 4_000_000,
+        'collateral_btc': rng.random(n).round(8),
+    })
+
+
+def decode_json(body):
+    return pd.DataFrame(json.loads(body))
+
+
+def decode_csv(engine):
+    def decode(body):
+        return pd.read_csv(io.BytesIO(body), engine=engine)
+    return decode
+
+
+def best_of(func, body, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = func(body)
+        timings.append(time.perf_counter() - start)
+    return min(timings), frame
+
+
+def run(sizes, repeat):
+    decoders = [('json', decode_json), ('csv/c', decode_csv('c'))]
+    if importlib.util.find_spec('pyarrow'):
+        decoders.append(('csv/pyarrow', decode_csv('pyarrow')))
+
+    print(f"{'rows':>10} {'format':<12} {'payload MiB':>12} {'seconds':>9} {'rows/s':>12} {'frame MiB':>10}")
+    for n in sizes:
+        df = make_rows(n)
+        bodies = {
+            'json': df.to_json(orient='records').encode(),
+            'csv': df.to_csv(index=False).encode(),
+        }
+        for name, decode in decoders:
+            body = bodies[name.split('/')[0]]
+            seconds, frame = best_of(decode, body, repeat)
+            assert len(frame) == n
+            print(f"{n:>10,} {name:<12} {len(body) / 2**20:>12.1f} {seconds:>9.3f} "
+                  f"{n / seconds:>12,.0f} {frame.memory_usage(deep=True).sum() / 2**20:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='best of this many runs')
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
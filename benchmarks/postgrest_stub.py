@@ -0,0 +1,257 @@
+"""
+Minimal PostgREST-compatible server over a SQLite file, for benchmarks
+
+Serves the subset of PostgREST the dashboard uses: select/order/limit, the
+eq/neq/gt/gte/lt/lte/in/is filters and and()/or() trees, HEAD counts through
+Content-Range, CSV responses for Accept: text/csv and the vault_event_summary
+RPC. GET /api/mp-staking-wallets stands in for the Vercel wallet scanner.
+
+    python benchmarks/postgrest_stub.py /tmp/mp-1m.sqlite --port 8765
+"""
+
+import argparse
+import csv
+import io
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+REST_PREFIX = '/rest/v1/'
+WALLETS_PATH = '/api/mp-staking-wallets'
+# Columns stored as JSON text but returned by PostgREST as JSON values
+JSON_COLUMNS = {'topics'}
+OPERATORS = {'eq': '=', 'neq': '!=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _identifier(name):
+    if not IDENTIFIER.match(name):
+        raise BadRequest(f"bad identifier {name!r}")
+    return f'"{name}"'
+
+
+def _split_top_level(text):
+    """Split on commas outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, ''
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0 and not quoted:
+            parts.append(current)
+            current = ''
+        else:
+            current += ch
+    parts.append(current)
+    return parts
+
+
+def _condition(column, expression, args):
+    op, _, value = expression.partition('.')
+    column = _identifier(column)
+    if op == 'in':
+        values = [v.strip('"') for v in _split_top_level(value.strip('()'))]
+        args.extend(values)
+        return f"{column} IN ({', '.join('?' * len(values))})"
+    if op == 'is':
+        return f"{column} IS {'NOT ' if value != 'null' else ''}NULL"
+    if op not in OPERATORS:
+        raise BadRequest(f"unsupported operator {op!r}")
+    args.append(value.strip('"'))
+    return f"{column} {OPERATORS[op]} ?"
+
+
+def _logic_tree(kind, body, args):
+    parts = []
+    for term in _split_top_level(body):
+        nested = re.match(r'^(and|or)\((.*)\)$', term)
+        if nested:
+            parts.append(_logic_tree(nested.group(1), nested.group(2), args))
+        else:
+            column, _, expression = term.partition('.')
+            parts.append(_condition(column, expression, args))
+    return '(' + f' {kind.upper()} '.join(parts) + ')'
+
+
+def build_query(table, params):
+    """SELECT and COUNT statements (with their arguments) for a PostgREST table query"""
+    columns, order, limit, where, args = '*', '', '', [], []
+    for key, value in params:
+        if key == 'select':
+            columns = '*' if value == '*' else ', '.join(_identifier(c) for c in value.split(','))
+        elif key == 'order':
+            terms = []
+            for term in value.split(','):
+                name, _, direction = term.partition('.')
+                terms.append(f"{_identifier(name)} {'DESC' if direction.startswith('desc') else 'ASC'}")
+            order = ' ORDER BY ' + ', '.join(terms)
+        elif key == 'limit':
+            limit = f' LIMIT {int(value)}'
+        elif key in ('and', 'or'):
+            where.append(_logic_tree(key, value[1:-1], args))
+        else:
+            where.append(_condition(key, value, args))
+    source = f' FROM {_identifier(table)}' + (' WHERE ' + ' AND '.join(where) if where else '')
+    return f'SELECT {columns}{source}{order}{limit}', f'SELECT COUNT(*){source}', args
+
+
+def _utc_text(value):
+    """A timestamp bound in the generator's storage format (UTC, seconds precision)"""
+    if value is None:
+        return None
+    moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec='seconds')
+
+
+def vault_event_summary(con, start_ts=None, end_ts=None, event_types=None):
+    """SQLite version of supabase-vault-summary-schema.sql"""
+    where, args = [], []
+    if start_ts is not None:
+        where.append('timestamp >= ?')
+        args.append(_utc_text(start_ts))
+    if end_ts is not None:
+        where.append('timestamp <= ?')
+        args.append(_utc_text(end_ts))
+    if event_types:
+        where.append(f"event_type IN ({', '.join('?' * len(event_types))})")
+        args.extend(event_types)
+    row = con.execute(f'''
+        SELECT COUNT(*), COUNT(DISTINCT vault_id),
+               SUM(event_type = 'VaultUpdated'), SUM(event_type = 'VaultLiquidated'),
+               COALESCE(MAX(block_number), 0)
+        FROM vault_events {'WHERE ' + ' AND '.join(where) if where else ''}''', args).fetchone()
+    keys = ['total_events', 'unique_vaults', 'total_updates', 'total_liquidations', 'latest_block']
+    return [{key: value or 0 for key, value in zip(keys, row)}]
+
+
+def staking_wallets(con):
+    """Response of the Vercel /api/mp-staking-wallets endpoint"""
+    con.row_factory = sqlite3.Row
+    wallets = [dict(row) for row in con.execute('SELECT * FROM mp_staking_wallets ORDER BY total_mp_staked DESC')]
+    for wallet in wallets:
+        wallet['recent_transactions'] = []
+    current_block = max((w['last_activity_block'] for w in wallets), default=0)
+    return {
+        'success': True,
+        'summary': {
+            'total_wallets': len(wallets),
+            'total_mp_staked': sum(w['total_mp_staked'] for w in wallets),
+            'total_mp_rewards': sum(w['total_mp_rewards'] for w in wallets),
+            'blocks_scanned': current_block,
+            'current_block': current_block,
+        },
+        'wallets': wallets,
+    }
+
+
+def _csv_body(rows):
+    buffer = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    database = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json', headers=(), head=False):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _connect(self):
+        return sqlite3.connect(f'file:{self.database}?mode=ro', uri=True)
+
+    def _table(self, head=False):
+        parts = urlsplit(self.path)
+        if parts.path == WALLETS_PATH:
+            with self._connect() as con:
+                return self._send(200, json.dumps(staking_wallets(con)).encode(), head=head)
+        if not parts.path.startswith(REST_PREFIX):
+            return self._send(404, b'{}', head=head)
+
+        table = parts.path[len(REST_PREFIX):]
+        try:
+            select, count, args = build_query(table, parse_qsl(parts.query, keep_blank_values=True))
+            with self._connect() as con:
+                con.row_factory = sqlite3.Row
+                total = con.execute(count, args).fetchone()[0]
+                rows = [] if head else [dict(row) for row in con.execute(select, args)]
+        except (BadRequest, ValueError, sqlite3.Error) as e:
+            return self._send(400, json.dumps({'message': str(e)}).encode(), head=head)
+
+        if 'text/csv' in self.headers.get('Accept', ''):
+            body, content_type = _csv_body(rows), 'text/csv'
+        else:
+            for row in rows:
+                for column in JSON_COLUMNS & row.keys():
+                    if isinstance(row[column], str):
+                        row[column] = json.loads(row[column])
+            body, content_type = json.dumps(rows).encode(), 'application/json'
+        content_range = f"0-{max(len(rows) - 1, 0)}/{total}" if rows else f"*/{total}"
+        self._send(200, body, content_type, [('Content-Range', content_range)], head=head)
+
+    def do_GET(self):
+        self._table()
+
+    def do_HEAD(self):
+        self._table(head=True)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path != REST_PREFIX + 'rpc/vault_event_summary':
+            return self._send(404, json.dumps({'message': f'no function {path}'}).encode())
+        length = int(self.headers.get('Content-Length') or 0)
+        arguments = json.loads(self.rfile.read(length) or b'{}')
+        with self._connect() as con:
+            result = vault_event_summary(con, **arguments)
+        self._send(200, json.dumps(result).encode())
+
+
+def serve(database, host='127.0.0.1', port=0):
+    """Serve database from a daemon thread; returns (server, base URL)"""
+    handler = type('Handler', (Handler,), {'database': database})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='postgrest-stub', daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('database', help='SQLite file written by synthetic_data.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    handler = type('Handler', (Handler,), {'database': args.database})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"Serving {args.database} at http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Profile each dashboard section offline against recorded HTTP fixtures
+
+Drives streamlit_app.py with Streamlit's AppTest. For every section all caches
+and the local event store are cleared, then the section is rendered cold
+(loaders fetch) and rerun warm (cache hits), reporting wall time and the peak
+traced memory.
+
+Record once against the live services, then replay as often as needed:
+
+    python benchmarks/profile_sections.py --mode record
+    python benchmarks/profile_sections.py --mode replay --latency 20-80
+
+The steps are identical in both modes, so every request made during replay has
+a fixture. Only the default "All Time" window is used: it keeps timestamps out
+of the requests.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+APP_PATH = os.path.join(REPO_DIR, 'streamlit_app.py')
+SECTIONS = [
+    "🏠 Overview",
+    "🏦 Vault Analytics",
+    "💰 TVL Analytics",
+    "🪙 BPD Analytics",
+    "📈 Gains from Staking Analytics",
+    "🔄 Redemption Gains from Staking Analytics",
+    "🎯 MP Staking Analytics",
+]
+DEFAULT_RERUNS = 2
+DEFAULT_TIMEOUT = 300
+
+
+def reset_caches(cache_dir):
+    """Forget every loaded dataset: loader caches, cached resources and the on-disk store"""
+    import streamlit as st
+    from dashboard.swr_cache import clear_all
+
+    clear_all()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir)
+
+
+def timed_run(at, action, memory):
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    action(at)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def profile(sections, reruns, memory, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    cache_dir = os.environ['MP_CACHE_DIR']
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    reset_caches(cache_dir)
+    at.run()
+
+    print(f"{'section':<45} {'cold s':>8} {'warm s':>8} {'peak MiB':>9}  errors")
+    for section in sections:
+        reset_caches(cache_dir)
+        cold, peak = timed_run(at, lambda at: at.sidebar.selectbox[0].select(section).run(), memory)
+        warm = min(timed_run(at, lambda at: at.run(), False)[0] for _ in range(reruns)) if reruns else float('nan')
+        errors = [e.value for e in at.exception] + [e.value for e in at.error]
+        peak_text = f"{peak / 2**20:>9.1f}" if peak is not None else f"{'-':>9}"
+        print(f"{section:<45} {cold:>8.2f} {warm:>8.2f} {peak_text}  {len(errors)}")
+        for error in errors:
+            print(f"    {str(error)[:200]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--mode', choices=['record', 'replay'], default='replay')
+    parser.add_argument('--fixtures', help='fixture directory (default: MP_FIXTURE_DIR or .fixtures/)')
+    parser.add_argument('--latency', default='0', help="replay delay in ms, e.g. '50' or '20-80'")
+    parser.add_argument('--sections', nargs='+', default=SECTIONS, choices=SECTIONS)
+    parser.add_argument('--reruns', type=int, default=DEFAULT_RERUNS, help='warm reruns per section (best is reported)')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip tracemalloc (faster)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds allowed per script run')
+    args = parser.parse_args()
+
+    os.environ['MP_FIXTURE_MODE'] = args.mode
+    os.environ['MP_REPLAY_LATENCY_MS'] = args.latency
+    if args.fixtures:
+        os.environ['MP_FIXTURE_DIR'] = args.fixtures
+    os.environ['MP_CACHE_DIR'] = tempfile.mkdtemp(prefix='mp-profile-')
+    os.environ.setdefault('MP_METRICS_LOG', '')
+    if args.mode == 'replay':
+        # Any URL works: fixtures are matched without the host
+        os.environ.setdefault('SUPABASE_URL', 'https://replay.invalid')
+        os.environ.setdefault('SUPABASE_ANON_KEY', 'replay')
+
+    try:
+        profile(args.sections, args.reruns, args.memory, args.timeout)
+    finally:
+        shutil.rmtree(os.environ['MP_CACHE_DIR'], ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark every dashboard section against synthetic data at increasing scale
+
+For each scale a synthetic database is generated (or reused) by
+synthetic_data.py and served by postgrest_stub.py; the dashboard is pointed at
+it and every section is rendered cold and warm with Streamlit's AppTest. Each
+row reports wall time, the peak resident memory of the process during the cold
+render and the size of the Plotly figures sent to the browser, so it shows
+which section stops scaling first.
+
+    python benchmarks/scale_sections.py --rows 10000 1000000 10000000 --data-dir /tmp/mp-scale
+
+A run that exceeds --timeout is reported as such and the next section goes on.
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import threading
+import time
+
+import postgrest_stub
+import synthetic_data
+from profile_sections import APP_PATH, DEFAULT_TIMEOUT, SECTIONS, reset_caches
+
+DEFAULT_SCALES = [10_000, 1_000_000, 10_000_000]
+DEFAULT_RERUNS = 1
+RSS_SAMPLE_INTERVAL = 0.02
+
+
+def _rss_bytes():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+class PeakRSS:
+    """Highest resident set size seen while the block runs
+
+    /proc is sampled from a thread because ru_maxrss never goes down, so it
+    cannot attribute a peak to one section. Falls back to ru_maxrss without /proc.
+    """
+
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._sampled = os.path.exists('/proc/self/statm')
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self):
+        if self._sampled:
+            self.peak = _rss_bytes()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._sampled:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _rss_bytes())
+        else:
+            # ru_maxrss is in KiB on Linux
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return False
+
+
+def figure_bytes(at):
+    """Serialized size of every Plotly chart on the page"""
+    return sum(chart.proto.ByteSize() for chart in at.get('plotly_chart'))
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    return time.perf_counter() - start
+
+
+def run_section(at, section, cache_dir, reruns):
+    reset_caches(cache_dir)
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        at.sidebar.selectbox[0].select(section).run()
+        cold = time.perf_counter() - start
+    warm = min((_timed_run(at) for _ in range(reruns)), default=float('nan'))
+    errors = [e.value for e in at.exception] + [e.value for e in at.error]
+    return cold, warm, rss.peak, figure_bytes(at), errors
+
+
+def benchmark_scale(rows, data_dir, sections, reruns, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    database = os.path.join(data_dir, f'mp-{rows}.sqlite')
+    if not os.path.exists(database):
+        start = time.perf_counter()
+        synthetic_data.generate(database, rows)
+        print(f"Generated {database} in {time.perf_counter() - start:.1f}s")
+
+    server, url = postgrest_stub.serve(database)
+    os.environ['SUPABASE_URL'] = url
+    os.environ['MP_STAKING_WALLETS_URL'] = url + postgrest_stub.WALLETS_PATH
+    cache_dir = os.environ['MP_CACHE_DIR']
+    try:
+        print(f"\n{rows:,} vault events")
+        print(f"{'section':<45} {'cold s':>8} {'warm s':>8} {'peak RSS MiB':>13} {'figures KiB':>12}  errors")
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        reset_caches(cache_dir)
+        at.run()
+        for section in sections:
+            try:
+                cold, warm, peak, payload, errors = run_section(at, section, cache_dir, reruns)
+            except RuntimeError as e:
+                # AppTest raises RuntimeError when a script run exceeds its timeout
+                print(f"{section:<45} {'timeout':>8}  {str(e)[:120]}")
+                at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+                continue
+            print(f"{section:<45} {cold:>8.2f} {warm:>8.2f} {peak / 2**20:>13.0f} {payload / 2**10:>12.0f}  {len(errors)}")
+            for error in errors:
+                print(f"    {str(error)[:200]}")
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_SCALES, help='vault_events rows per scale')
+    parser.add_argument('--data-dir', help='where generated databases are kept and reused (default: a temp dir)')
+    parser.add_argument('--sections', nargs='+', default=SECTIONS, choices=SECTIONS)
+    parser.add_argument('--reruns', type=int, default=DEFAULT_RERUNS, help='warm reruns per section (best is reported)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds allowed per script run')
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='mp-scale-data-')
+    os.makedirs(data_dir, exist_ok=True)
+    os.environ['MP_CACHE_DIR'] = tempfile.mkdtemp(prefix='mp-scale-')
+    os.environ.setdefault('MP_METRICS_LOG', '')
+    os.environ.setdefault('SUPABASE_ANON_KEY', 'synthetic')
+    os.environ.pop('MP_FIXTURE_MODE', None)
+
+    try:
+        for rows in args.rows:
+            benchmark_scale(rows, data_dir, args.sections, args.reruns, args.timeout)
+    finally:
+        shutil.rmtree(os.environ['MP_CACHE_DIR'], ignore_errors=True)
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+Generate a synthetic Money Protocol dataset as a SQLite database
+
+Produces the tables the dashboard reads, shaped like the Supabase schema:
+vault_events at the requested scale, and the snapshot and hourly tables scaled
+down from it. Timestamps end at generation time, so the relative time ranges
+("Last 24 Hours", ...) select data.
+
+    python benchmarks/synthetic_data.py --rows 1000000 --out /tmp/mp-1m.sqlite
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+DEFAULT_ROWS = 10_000
+BATCH_SIZE = 100_000
+# Span of vault event history, whatever the row count
+HISTORY = timedelta(days=365)
+FIRST_BLOCK = 4_000_000
+
+TABLES = {
+    'vault_events': '''
+        id INTEGER PRIMARY KEY, contract_address TEXT, event_type TEXT, transaction_hash TEXT,
+        block_number INTEGER, timestamp TEXT, topics TEXT, data TEXT, vault_id TEXT, processed_at TEXT''',
+    'tvl_snapshots': '''
+        id INTEGER PRIMARY KEY, timestamp TEXT, block_number INTEGER, total_btc REAL,
+        active_pool_btc REAL, default_pool_btc REAL''',
+    'pool_balance_hourly': '''
+        hour TEXT, pool_type TEXT, hourly_change_btc REAL, ending_balance_btc REAL,
+        transaction_count INTEGER, btc_price_usd REAL, ending_balance_usd REAL''',
+    'pool_balances_current': '''
+        pool_type TEXT, current_balance_btc REAL, current_balance_usd REAL, last_updated TEXT, last_btc_price REAL''',
+    'bpd_supply_hourly': '''
+        hour TEXT, supply_change REAL, cumulative_supply REAL, mint_count INTEGER, burn_count INTEGER''',
+    'bpd_supply_snapshots': '''
+        id INTEGER PRIMARY KEY, timestamp TEXT, block_number INTEGER, total_supply_bpd REAL''',
+    'bpd_transfer_events': '''
+        id INTEGER PRIMARY KEY, block_timestamp TEXT, event_type TEXT, value_bpd REAL,
+        transaction_hash TEXT, block_number INTEGER''',
+    'vault_count_hourly': '''
+        hour TEXT, vault_count_change INTEGER, number_of_vaults INTEGER, created_count INTEGER,
+        closed_count INTEGER, liquidated_count INTEGER''',
+    'vault_lifecycle_events': '''
+        id INTEGER PRIMARY KEY, block_timestamp TEXT, event_type TEXT, vault_address TEXT,
+        collateral_amount REAL, debt_amount REAL, transaction_hash TEXT, block_number INTEGER''',
+    'staking_gains_daily': '''
+        day TEXT, daily_gain REAL, cumulative_gain REAL''',
+    'redemption_gains_daily': '''
+        day TEXT, daily_redemption_gain REAL, cumulative_redemption_gain REAL''',
+    'mp_staking_hourly': '''
+        hour TEXT, total_mp_staked REAL, total_mp_claimed REAL, mp_claimed_in_hour REAL''',
+    # Stand-in for the Vercel wallet scanner (served as /api/mp-staking-wallets by postgrest_stub)
+    'mp_staking_wallets': '''
+        wallet_address TEXT, total_mp_staked REAL, total_mp_rewards REAL, last_activity_block INTEGER,
+        transaction_count INTEGER, percentage_of_total REAL''',
+}
+
+INDEXES = [
+    'CREATE INDEX ix_vault_events_timestamp ON vault_events (timestamp, id)',
+    'CREATE INDEX ix_vault_events_event_type ON vault_events (event_type)',
+]
+
+
+def _hex(values, width):
+    return [f'0x{v:0{width}x}' for v in values]
+
+
+def _iso(start, step, n):
+    """n ISO-8601 UTC timestamps from start, step apart"""
+    return [(start + step * i).isoformat(timespec='seconds') for i in range(n)]
+
+
+def _insert(con, table, columns):
+    names = list(columns)
+    n = len(columns[names[0]])
+    sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+    for offset in range(0, n, BATCH_SIZE):
+        batch = [columns[name][offset:offset + BATCH_SIZE] for name in names]
+        con.executemany(sql, zip(*[b.tolist() if isinstance(b, np.ndarray) else b for b in batch]))
+
+
+def vault_events(rng, n, end):
+    step = HISTORY / n
+    start = end - HISTORY
+    vaults = _hex(rng.choice(2**60, size=max(n // 50, 10), replace=False), 40)
+    timestamps = _iso(start, step, n)
+    return {
+        'id': np.arange(1, n + 1),
+        'contract_address': ['0x' + 'a' * 40] * n,
+        'event_type': np.where(rng.random(n) < 0.9, 'VaultUpdated', 'VaultLiquidated'),
+        'transaction_hash': _hex(rng.integers(0, 2**62, n), 64),
+        'block_number': FIRST_BLOCK + np.arange(n) // 2,
+        'timestamp': timestamps,
+        'topics': [json.dumps(['0x' + 'b' * 64, '0x' + 'c' * 64])] * n,
+        'data': ['0x' + 'f' * 128] * n,
+        'vault_id': [vaults[i] for i in rng.integers(0, len(vaults), n)],
+        'processed_at': timestamps,
+    }
+
+
+def hourly(hours, end):
+    start = end.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+    return _iso(start, timedelta(hours=1), hours)
+
+
+def generate(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    end = datetime.now(timezone.utc).replace(microsecond=0)
+    if os.path.exists(path):
+        os.remove(path)
+
+    con = sqlite3.connect(path)
+    for table, columns in TABLES.items():
+        con.execute(f'CREATE TABLE {table} ({columns})')
+
+    _insert(con, 'vault_events', vault_events(rng, rows, end))
+
+    snapshots = max(rows // 10, 100)
+    hours = max(rows // 100, 168)
+    events = max(rows // 100, 100)
+    days = max(rows // 2400, 30)
+
+    times = hourly(snapshots, end)
+    active = np.cumsum(rng.normal(0.01, 0.05, snapshots)).clip(0) + 10
+    default = rng.random(snapshots)
+    _insert(con, 'tvl_snapshots', {
+        'id': np.arange(1, snapshots + 1), 'timestamp': times,
+        'block_number': FIRST_BLOCK + np.arange(snapshots) * 120,
+        'total_btc': active + default, 'active_pool_btc': active, 'default_pool_btc': default,
+    })
+    _insert(con, 'bpd_supply_snapshots', {
+        'id': np.arange(1, snapshots + 1), 'timestamp': times,
+        'block_number': FIRST_BLOCK + np.arange(snapshots) * 120,
+        'total_supply_bpd': np.cumsum(rng.random(snapshots) * 100),
+    })
+
+    times = hourly(hours, end)
+    change = rng.normal(0, 0.02, hours)
+    price = 65000 + np.cumsum(rng.normal(0, 50, hours))
+    pool_types = ['active', 'default', 'stability']
+    _insert(con, 'pool_balance_hourly', {
+        'hour': [t for t in times for _ in pool_types],
+        'pool_type': pool_types * hours,
+        'hourly_change_btc': np.repeat(change, 3),
+        'ending_balance_btc': np.repeat(np.cumsum(change).clip(0) + 5, 3),
+        'transaction_count': rng.integers(0, 20, hours * 3),
+        'btc_price_usd': np.repeat(price, 3),
+        'ending_balance_usd': np.repeat((np.cumsum(change).clip(0) + 5) * price, 3),
+    })
+    supply_change = rng.normal(50, 200, hours)
+    _insert(con, 'bpd_supply_hourly', {
+        'hour': times, 'supply_change': supply_change, 'cumulative_supply': np.cumsum(supply_change),
+        'mint_count': rng.integers(0, 5, hours), 'burn_count': rng.integers(0, 3, hours),
+    })
+    vault_change = rng.integers(-2, 4, hours)
+    _insert(con, 'vault_count_hourly', {
+        'hour': times, 'vault_count_change': vault_change,
+        'number_of_vaults': np.cumsum(vault_change).clip(0),
+        'created_count': vault_change.clip(0), 'closed_count': (-vault_change).clip(0),
+        'liquidated_count': rng.integers(0, 2, hours),
+    })
+    staked = 1_000_000 + np.cumsum(rng.random(hours) * 100)
+    claimed_in_hour = rng.random(hours) * 10
+    _insert(con, 'mp_staking_hourly', {
+        'hour': times, 'total_mp_staked': staked,
+        'total_mp_claimed': np.cumsum(claimed_in_hour), 'mp_claimed_in_hour': claimed_in_hour,
+    })
+
+    times = _iso(end - timedelta(hours=events), timedelta(hours=1), events)
+    _insert(con, 'bpd_transfer_events', {
+        'id': np.arange(1, events + 1), 'block_timestamp': times,
+        'event_type': np.where(rng.random(events) < 0.7, 'mint', 'burn'),
+        'value_bpd': rng.random(events) * 1000, 'transaction_hash': _hex(rng.integers(0, 2**62, events), 64),
+        'block_number': FIRST_BLOCK + np.arange(events) * 120,
+    })
+    _insert(con, 'vault_lifecycle_events', {
+        'id': np.arange(1, events + 1), 'block_timestamp': times,
+        'event_type': rng.choice(['created', 'closed', 'liquidated'], events, p=[0.6, 0.3, 0.1]),
+        'vault_address': _hex(rng.integers(0, 2**60, events), 40),
+        'collateral_amount': rng.random(events), 'debt_amount': rng.random(events) * 20000,
+        'transaction_hash': _hex(rng.integers(0, 2**62, events), 64),
+        'block_number': FIRST_BLOCK + np.arange(events) * 120,
+    })
+
+    times = _iso(end.replace(hour=0, minute=0, second=0) - timedelta(days=days - 1), timedelta(days=1), days)
+    gains = rng.random(days)
+    _insert(con, 'staking_gains_daily', {'day': times, 'daily_gain': gains, 'cumulative_gain': np.cumsum(gains)})
+    _insert(con, 'redemption_gains_daily', {
+        'day': times, 'daily_redemption_gain': gains / 2, 'cumulative_redemption_gain': np.cumsum(gains / 2),
+    })
+
+    _insert(con, 'pool_balances_current', {
+        'pool_type': pool_types, 'current_balance_btc': [10.0, 0.5, 2.0],
+        'current_balance_usd': [650000.0, 32500.0, 130000.0],
+        'last_updated': [end.isoformat()] * 3, 'last_btc_price': [65000.0] * 3,
+    })
+
+    wallets = max(rows // 1000, 50)
+    stakes = rng.pareto(1.5, wallets) * 1000
+    _insert(con, 'mp_staking_wallets', {
+        'wallet_address': _hex(rng.integers(0, 2**60, wallets), 40), 'total_mp_staked': stakes,
+        'total_mp_rewards': stakes * 0.05, 'last_activity_block': FIRST_BLOCK + rng.integers(0, rows, wallets),
+        'transaction_count': rng.integers(1, 50, wallets), 'percentage_of_total': stakes / stakes.sum() * 100,
+    })
+
+    for sql in INDEXES:
+        con.execute(sql)
+    con.commit()
+    con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='vault_events rows; other tables scale from it')
+    parser.add_argument('--out', required=True, help='SQLite file to (re)create')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate(args.out, args.rows, args.seed)
+    print(f"Wrote {args.rows:,} vault events to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
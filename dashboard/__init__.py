@@ -0,0 +1,3 @@
+"""
+Helpers for the Money Protocol Streamlit dashboard (streamlit_app.py)
+"""
@@ -0,0 +1,68 @@
+"""
+Largest-Triangle-Three-Buckets downsampling for time-series charts
+
+A chart cannot show more points than it has pixels, so long series are reduced
+to a few points per pixel before the figure is built. LTTB keeps the points that
+shape the line (peaks, dips, steps), unlike taking every n-th row.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Plot width of a full-width chart in the wide layout; charts in st.columns get a share of it
+DEFAULT_CHART_WIDTH_PX = 1200
+POINTS_PER_PIXEL = 2
+
+
+def target_points(width_px=DEFAULT_CHART_WIDTH_PX, points_per_px=POINTS_PER_PIXEL):
+    """Number of points worth sending for a chart of the given width"""
+    return max(int(width_px * points_per_px), 3)
+
+
+def _as_float(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return (series - series.min()).dt.total_seconds().to_numpy(dtype=float)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """Positions of the n_out points LTTB keeps from x/y (float arrays sorted by x)"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    y = np.nan_to_num(y)
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Third vertex: the average of the next bucket (the last point for the final bucket)
+        following = slice(end, edges[i + 2]) if i + 2 < len(edges) else slice(n - 1, n)
+        avg_x, avg_y = x[following].mean(), y[following].mean()
+
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(df, x, y, width_px=DEFAULT_CHART_WIDTH_PX):
+    """Rows of df worth plotting as lines of y (one column or a list) against x
+
+    df must be sorted by x. With several y columns the points kept for each are
+    combined, so every trace keeps its own shape. Short frames are returned as is.
+    """
+    n_out = target_points(width_px)
+    if len(df) <= n_out:
+        return df
+
+    x_values = _as_float(df[x])
+    keep = set()
+    for column in [y] if isinstance(y, str) else y:
+        keep.update(lttb_indices(x_values, _as_float(df[column]), n_out).tolist())
+    return df.iloc[sorted(keep)]
@@ -0,0 +1,93 @@
+"""
+Compact per-table dtype schemas applied to DataFrames at load time
+
+Every session holds its own cached copy of each frame, so memory per frame is
+what limits concurrent sessions. Repeated strings become categoricals, block
+numbers and counters drop to 32-bit integers.
+"""
+
+import logging
+import sys
+
+import pandas as pd
+
+from dashboard import metrics
+
+logger = logging.getLogger(__name__)
+
+# Dtype kinds:
+#   'category' - low-cardinality labels (event types, pool types)
+#   'hex'      - 42/66-char addresses and hashes; categorical when values repeat, interned otherwise
+#   'int32'    - block numbers and counters (nullable Int32 when values are missing)
+TABLE_DTYPES = {
+    'vault_events': {
+        'event_type': 'category',
+        'contract_address': 'hex',
+        'vault_id': 'hex',
+        'transaction_hash': 'hex',
+        'block_number': 'int32',
+    },
+    'tvl_snapshots': {
+        'block_number': 'int32',
+    },
+    'bpd_transfer_events': {
+        'event_type': 'category',
+        'transaction_hash': 'hex',
+        'block_number': 'int32',
+    },
+    'vault_lifecycle_events': {
+        'event_type': 'category',
+        'vault_address': 'hex',
+        'transaction_hash': 'hex',
+        'block_number': 'int32',
+    },
+    'pool_balance_hourly': {
+        'pool_type': 'category',
+        'transaction_count': 'int32',
+    },
+    'pool_balances_current': {
+        'pool_type': 'category',
+    },
+}
+
+# A hex column becomes categorical when it has fewer distinct values than this share of rows
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Bytes before/after the last apply_dtypes() call, per table
+MEMORY_REPORTS = {}
+
+
+def _compact_hex(series):
+    if series.nunique(dropna=True) < CATEGORY_MAX_UNIQUE_RATIO * len(series):
+        return series.astype('category')
+    # Mostly unique (e.g. transaction hashes): share identical strings instead
+    return series.map(lambda v: sys.intern(v) if isinstance(v, str) else v)
+
+
+def _to_int32(series):
+    series = pd.to_numeric(series, errors='coerce')
+    return series.astype('Int32' if series.isna().any() else 'int32')
+
+
+def apply_dtypes(df, table):
+    """Convert a freshly loaded frame to its table's compact schema and record the memory saved"""
+    schema = TABLE_DTYPES.get(table)
+    if df.empty or not schema:
+        return df
+
+    before = int(df.memory_usage(deep=True).sum())
+    with metrics.timed('frame'):
+        for column, kind in schema.items():
+            if column not in df.columns:
+                continue
+            if kind == 'category':
+                df[column] = df[column].astype('category')
+            elif kind == 'hex':
+                df[column] = _compact_hex(df[column])
+            elif kind == 'int32':
+                df[column] = _to_int32(df[column])
+    after = int(df.memory_usage(deep=True).sum())
+
+    MEMORY_REPORTS[table] = {'rows': len(df), 'bytes_before': before, 'bytes_after': after}
+    logger.info("%s: %d rows, %.1f KiB -> %.1f KiB", table, len(df), before / 1024, after / 1024)
+    return df
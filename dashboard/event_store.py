@@ -0,0 +1,176 @@
+"""
+Persistent local copy of append-only Supabase tables (SQLite)
+
+Rows are only ever appended upstream, so a refresh only has to ask Supabase for
+ids above the highest one already stored. Cold starts read straight from disk.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+
+from dashboard import metrics
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+
+# Internal bookkeeping table listing columns stored as JSON text (e.g. topics arrays)
+JSON_COLUMNS_TABLE = '_json_columns'
+
+# Layout of the store file, kept in PRAGMA user_version; a file with another version is emptied
+# and resynced. Bump when the way tables are stored changes.
+SCHEMA_VERSION = 1
+
+
+def _quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class EventStore:
+    """SQLite-backed store of append-only tables keyed by their Supabase id"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Serialises writers inside this process; SQLite's own lock covers other processes
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as con, con:
+            con.execute('PRAGMA journal_mode=WAL')
+            if con.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                tables = [row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+                for table in tables:
+                    con.execute(f'DROP TABLE IF EXISTS {_quote_ident(table)}')
+                con.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            con.execute(f'CREATE TABLE IF NOT EXISTS {JSON_COLUMNS_TABLE} (tbl TEXT, col TEXT, PRIMARY KEY (tbl, col))')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _table_exists(con, table):
+        row = con.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _stored_columns(con, table):
+        return {row[1] for row in con.execute(f'PRAGMA table_info({_quote_ident(table)})')}
+
+    def columns(self, table):
+        """Columns of a stored table (empty if nothing is stored yet)"""
+        with closing(self._connect()) as con:
+            return self._stored_columns(con, table)
+
+    def max_id(self, table):
+        """Highest stored id for a table, or None if nothing is stored yet"""
+        with closing(self._connect()) as con:
+            if not self._table_exists(con, table):
+                return None
+            return con.execute(f'SELECT MAX(id) FROM {_quote_ident(table)}').fetchone()[0]
+
+    def drop(self, table):
+        """Forget a table, e.g. after it was truncated upstream"""
+        with self._lock, closing(self._connect()) as con, con:
+            con.execute(f'DROP TABLE IF EXISTS {_quote_ident(table)}')
+            con.execute(f'DELETE FROM {JSON_COLUMNS_TABLE} WHERE tbl = ?', (table,))
+
+    def append(self, table, rows, indexes=()):
+        """Append rows (list of dicts) whose id is above the stored maximum; returns the count written"""
+        if not rows:
+            return 0
+
+        df = pd.DataFrame(rows)
+        json_columns = [
+            col for col in df.columns
+            if df[col].map(lambda v: isinstance(v, (list, dict))).any()
+        ]
+        for col in json_columns:
+            df[col] = df[col].map(lambda v: json.dumps(v) if isinstance(v, (list, dict)) else v)
+
+        with self._lock, closing(self._connect()) as con, con:
+            created = not self._table_exists(con, table)
+            if not created:
+                current_max = con.execute(f'SELECT MAX(id) FROM {_quote_ident(table)}').fetchone()[0]
+                if current_max is not None:
+                    df = df[df['id'] > current_max]
+                if df.empty:
+                    return 0
+                # Columns added upstream since the table was created; older rows read them as NULL
+                for col in df.columns.difference(sorted(self._stored_columns(con, table))):
+                    con.execute(f'ALTER TABLE {_quote_ident(table)} ADD COLUMN {_quote_ident(col)}')
+
+            df.to_sql(table, con, if_exists='append', index=False)
+
+            if created:
+                con.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {_quote_ident("ix_" + table + "_id")} '
+                            f'ON {_quote_ident(table)} (id)')
+                for col in indexes:
+                    con.execute(f'CREATE INDEX IF NOT EXISTS {_quote_ident("ix_" + table + "_" + col)} '
+                                f'ON {_quote_ident(table)} ({_quote_ident(col)})')
+            con.executemany(
+                f'INSERT OR IGNORE INTO {JSON_COLUMNS_TABLE} (tbl, col) VALUES (?, ?)',
+                [(table, col) for col in json_columns]
+            )
+            return len(df)
+
+    def sync(self, client, table, page_size, select='*', indexes=()):
+        """Pull rows with id above the stored maximum from Supabase; returns the number of new rows
+
+        select narrows the columns mirrored locally (the id is always kept).
+        """
+        since = self.max_id(table)
+
+        if since is not None:
+            # A lower upstream maximum means the table was cleaned up, and columns missing
+            # locally mean the select list or the upstream schema changed: start over either way
+            probe = select if select == '*' or 'id' in select.split(',') else f'{select},id'
+            response = client.get(table, params=[('select', probe), ('order', 'id.desc'), ('limit', '1')])
+            response.raise_for_status()
+            latest = response.json()
+            if not latest or latest[0]['id'] < since or not set(latest[0]) <= self.columns(table):
+                self.drop(table)
+                since = None
+
+        filters = [('id', f'gt.{since}')] if since is not None else []
+        appended = 0
+        for rows in client.iter_pages(table, select=select, filters=filters, keys=('id',), page_size=page_size):
+            appended += self.append(table, rows, indexes=indexes)
+        return appended
+
+    def count_distinct(self, table, column, where=None, params=()):
+        """COUNT(DISTINCT column) over stored rows, computed inside SQLite"""
+        with closing(self._connect()) as con:
+            if not self._table_exists(con, table):
+                return 0
+            sql = f'SELECT COUNT(DISTINCT {_quote_ident(column)}) FROM {_quote_ident(table)}'
+            if where:
+                sql += ' WHERE ' + ' AND '.join(where)
+            return con.execute(sql, list(params)).fetchone()[0]
+
+    def read(self, table, columns=None, where=None, params=(), order_by=None, limit=None):
+        """Read stored rows back as a DataFrame shaped like the Supabase JSON response"""
+        with metrics.timed('store'), closing(self._connect()) as con:
+            if not self._table_exists(con, table):
+                return pd.DataFrame()
+
+            select = ', '.join(_quote_ident(c) for c in columns) if columns else '*'
+            sql = f'SELECT {select} FROM {_quote_ident(table)}'
+            if where:
+                sql += ' WHERE ' + ' AND '.join(where)
+            if order_by:
+                sql += f' ORDER BY {order_by}'
+            if limit:
+                sql += f' LIMIT {int(limit)}'
+
+            df = pd.read_sql_query(sql, con, params=list(params))
+            json_columns = [row[0] for row in con.execute(
+                f'SELECT col FROM {JSON_COLUMNS_TABLE} WHERE tbl = ?', (table,)
+            )]
+
+        for col in json_columns:
+            if col in df.columns:
+                df[col] = df[col].map(lambda v: json.loads(v) if isinstance(v, str) else v)
+        return df
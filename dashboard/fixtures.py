@@ -0,0 +1,130 @@
+"""
+Record/replay of the dashboard's HTTP traffic (Supabase and the Vercel API)
+
+In record mode every response is written to a fixture directory as it passes
+through the shared session. Replay mode serves those files instead of touching
+the network, optionally with injected latency. This gives a deterministic
+offline harness for profiling.
+
+Requests are matched on method, path, query string and body; the host is left
+out so a replay works with any SUPABASE_URL. Start both the recording and the
+replay with an empty MP_CACHE_DIR: the local event store decides which
+incremental requests are made.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+
+MODES = ('record', 'replay')
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.fixtures')
+
+
+def fixture_key(request):
+    """Stable name for a prepared request: method, path, sorted query and body"""
+    parts = urlsplit(request.url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode()
+    accept = request.headers.get('Accept', '')
+    prefer = request.headers.get('Prefer', '')
+    raw = '\n'.join([request.method, parts.path, query, accept, prefer]).encode() + b'\n' + body
+    return f"{request.method.lower()}-{hashlib.sha1(raw).hexdigest()}"
+
+
+def parse_latency(value):
+    """Parse MP_REPLAY_LATENCY_MS: '50' for a fixed delay, '20-80' for a uniform range (milliseconds)"""
+    if not value:
+        return (0.0, 0.0)
+    low, _, high = str(value).partition('-')
+    low = float(low)
+    return (low, float(high) if high else low)
+
+
+class RecordingAdapter(BaseAdapter):
+    """Pass requests to the real adapter and save each response as a fixture"""
+
+    def __init__(self, inner, directory):
+        super().__init__()
+        self.inner = inner
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        fixture = {
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'body': base64.b64encode(response.content).decode('ascii'),
+        }
+        path = os.path.join(self.directory, fixture_key(request) + '.json')
+        with self._lock, open(path, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f, indent=1)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serve responses from recorded fixtures, never touching the network"""
+
+    def __init__(self, directory, latency_ms=(0.0, 0.0)):
+        super().__init__()
+        self.directory = directory
+        self.latency_ms = latency_ms
+
+    def send(self, request, **kwargs):
+        path = os.path.join(self.directory, fixture_key(request) + '.json')
+        if not os.path.exists(path):
+            raise ConnectionError(f"No recorded fixture for {request.method} {request.url}", request=request)
+        with open(path, encoding='utf-8') as f:
+            fixture = json.load(f)
+
+        delay = random.uniform(*self.latency_ms) / 1000
+        if delay:
+            time.sleep(delay)
+
+        response = Response()
+        response.status_code = fixture['status']
+        response.reason = fixture['reason']
+        response.headers = CaseInsensitiveDict(fixture['headers'])
+        # The recorded body is already decoded, so it must not be decompressed again
+        response.headers.pop('Content-Encoding', None)
+        response._content = base64.b64decode(fixture['body'])
+        response.encoding = None
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=delay)
+        return response
+
+    def close(self):
+        pass
+
+
+def install(session, mode, directory=DEFAULT_FIXTURE_DIR, latency_ms=(0.0, 0.0)):
+    """Route a requests session through record or replay adapters"""
+    if mode not in MODES:
+        raise ValueError(f"fixture mode must be one of {MODES}, not {mode!r}")
+    for prefix in ('https://', 'http://'):
+        if mode == 'record':
+            adapter = RecordingAdapter(session.get_adapter(prefix), directory)
+        else:
+            adapter = ReplayAdapter(directory, latency_ms)
+        session.mount(prefix, adapter)
@@ -0,0 +1,130 @@
+"""
+In-memory supersets of append-only tables, sliced per view
+
+One frame per table holds every stored row. Refreshing it reads only the rows
+above its highest id from the local event store, so a new time window is a slice
+of memory rather than another query.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard import metrics
+from dashboard.dtypes import apply_dtypes
+
+
+class IncrementalFrame:
+    """Every row of an append-only store table, extended at its leading edge
+
+    prepare(df) parses freshly read rows (e.g. timestamps). The frame is kept
+    sorted newest-first on sort_by, which must end with the id column.
+    Subscribers (see subscribe()) are handed each batch of new rows.
+    """
+
+    def __init__(self, store, table, columns, prepare=None, sort_by=('id',)):
+        self.store = store
+        self.table = table
+        self.columns = list(dict.fromkeys(['id', *columns]))
+        self.prepare = prepare
+        self.sort_by = list(sort_by)
+        self.frame = pd.DataFrame()
+        self.max_id = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """Call callback(rows, reset) with every batch of new rows, starting with the current frame
+
+        reset is True when the rows replace everything seen so far.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+            callback(self.frame, True)
+
+    def _publish(self, rows, reset):
+        for callback in self._subscribers:
+            callback(rows, reset)
+
+    def refresh(self):
+        """Append rows stored since the last refresh and return the whole frame"""
+        with self._lock:
+            stored_max = self.store.max_id(self.table)
+            if self.max_id is not None and (stored_max is None or stored_max < self.max_id):
+                # The store was rebuilt (table truncated upstream): start over
+                self.frame, self.max_id = pd.DataFrame(), None
+                self._publish(self.frame, True)
+
+            if stored_max is None or stored_max == self.max_id:
+                return self.frame
+
+            where, params = (['id > ?'], [self.max_id]) if self.max_id is not None else (None, ())
+            order_by = ', '.join(f'{col} DESC' for col in self.sort_by)
+            new = self.store.read(self.table, columns=self.columns, where=where, params=params, order_by=order_by)
+            if new.empty:
+                return self.frame
+            if self.prepare:
+                new = self.prepare(new)
+            # Only the new rows are converted; the frame's rows keep their compact dtypes
+            new = apply_dtypes(new, self.table)
+
+            if self.frame.empty:
+                frame = new
+            else:
+                with metrics.timed('frame'):
+                    new = _match_dtypes(new, self.frame)
+                    frame = pd.concat([new, self.frame], ignore_index=True)
+                    # Rows are normally appended in order; only re-sort when they were not
+                    first_key = self.sort_by[0]
+                    if new[first_key].min() < self.frame[first_key].max():
+                        frame = frame.sort_values(self.sort_by, ascending=False, ignore_index=True)
+
+            self.frame = frame
+            self.max_id = int(new['id'].max())
+            self._publish(new, False)
+            return self.frame
+
+
+def _match_dtypes(new, frame):
+    """Give new rows the frame's categorical and object dtypes so concat does not re-cast the frame
+
+    Categories new rows bring are appended to the frame's categoricals, which
+    leaves the frame's codes untouched, and the new rows are coded against the
+    combined categories.
+    """
+    for column in new.columns.intersection(frame.columns):
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            categories = frame[column].cat.categories
+            extra = pd.Index(new[column].dropna().unique()).difference(categories)
+            if len(extra):
+                frame[column] = frame[column].cat.add_categories(extra)
+                categories = frame[column].cat.categories
+            new[column] = pd.Categorical(new[column], categories=categories)
+        elif isinstance(new[column].dtype, pd.CategoricalDtype):
+            # The frame keeps this column as interned strings (mostly unique values)
+            new[column] = new[column].astype(object)
+    return new
+
+
+def time_mask(timestamps, start=None, end=None):
+    """Boolean mask of timestamps within [start, end]; naive bounds are taken as UTC for tz-aware data"""
+    mask = pd.Series(True, index=timestamps.index)
+    tz = getattr(timestamps.dt, 'tz', None)
+    for bound, keep in ((start, timestamps.__ge__), (end, timestamps.__le__)):
+        if bound is None:
+            continue
+        bound = pd.Timestamp(bound)
+        if tz is not None and bound.tzinfo is None:
+            bound = bound.tz_localize('UTC')
+        mask &= keep(bound)
+    return mask
+
+
+def category_mask(series, values):
+    """isin() for a categorical column, matched on its integer codes instead of strings"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values)
+    categories = series.cat.categories
+    codes = [categories.get_loc(value) for value in values if value in categories]
+    return pd.Series(np.isin(series.cat.codes.to_numpy(), codes), index=series.index)
@@ -0,0 +1,146 @@
+"""
+Per-fetch instrumentation for the dashboard's loaders
+
+Every call of a cached loader opens a record on the calling thread. The HTTP
+client, JSON decoding, the event store and frame construction add their timings
+to it. Finished records are kept in memory for the Diagnostics panel and
+appended to a JSON-lines log.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Finished records kept in memory for the Diagnostics panel
+HISTORY_SIZE = 500
+
+# Timed stages, each stored as '<stage>_s' on a record
+STAGES = ('http', 'decode', 'store', 'frame')
+
+_history = deque(maxlen=HISTORY_SIZE)
+_history_lock = threading.Lock()
+_log_path = None
+_local = threading.local()
+
+
+def set_log_path(path):
+    """Append finished records to this JSON-lines file (None disables the log)"""
+    global _log_path
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    _log_path = path
+
+
+def _current():
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def _row_count(value):
+    if isinstance(value, tuple) and value:
+        value = value[0]  # (frame, extra) loaders such as the MP staking wallets
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def _write_log(record):
+    if not _log_path:
+        return
+    try:
+        with open(_log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+    except OSError as e:
+        logger.warning("Could not write fetch metrics to %s: %s", _log_path, e)
+
+
+@contextmanager
+def record(label, cache=None):
+    """Measure one loader call on this thread; yields the record dict
+
+    Nested records (a loader calling another loader) keep their own timings.
+    """
+    entry = {
+        'loader': label,
+        'at': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'thread': threading.current_thread().name,
+        'cache': cache,
+        'wall_s': 0.0,
+        **{f'{stage}_s': 0.0 for stage in STAGES},
+        'requests': 0,
+        'bytes': 0,
+        'rows': None,
+        'error': None,
+    }
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+
+    stack.append(entry)
+    start = time.perf_counter()
+    try:
+        yield entry
+    except Exception as e:
+        entry['error'] = str(e)
+        raise
+    finally:
+        entry['wall_s'] = round(time.perf_counter() - start, 4)
+        for stage in STAGES:
+            entry[f'{stage}_s'] = round(entry[f'{stage}_s'], 4)
+        stack.pop()
+        with _history_lock:
+            _history.append(entry)
+        _write_log(entry)
+
+
+def annotate(**fields):
+    """Set fields (e.g. cache='hit') on the record open on this thread, if any"""
+    entry = _current()
+    if entry is not None:
+        entry.update(fields)
+
+
+def set_rows(value):
+    """Record the row count of a loader's result"""
+    annotate(rows=_row_count(value))
+
+
+def add_http(seconds, nbytes):
+    """Account one HTTP request to the record open on this thread"""
+    entry = _current()
+    if entry is not None:
+        entry['http_s'] += seconds
+        entry['bytes'] += nbytes
+        entry['requests'] += 1
+
+
+@contextmanager
+def timed(stage):
+    """Add the time spent in the block to the current record's '<stage>_s'"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = _current()
+        if entry is not None:
+            entry[f'{stage}_s'] += time.perf_counter() - start
+
+
+def history(limit=None):
+    """Finished records, most recent last"""
+    with _history_lock:
+        records = list(_history)
+    return records[-limit:] if limit else records
+
+
+def clear():
+    with _history_lock:
+        _history.clear()
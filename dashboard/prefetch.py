@@ -0,0 +1,53 @@
+"""
+Concurrent prefetch of the datasets a dashboard section depends on
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Stays below the Supabase client's connection pool so workers never queue on a socket
+DEFAULT_MAX_WORKERS = 4
+
+
+def prefetch(loaders, max_workers=DEFAULT_MAX_WORKERS):
+    """Call every loader on a bounded thread pool and return their results in order
+
+    Loaders are the section's cached fetch_* functions (or partials of them), so
+    once this returns the render code reads warm cache entries and the section
+    waits for the slowest request instead of the sum of all of them.
+    """
+    if len(loaders) < 2:
+        return [loader() for loader in loaders]
+
+    # Workers inherit the script run context so st.* calls inside loaders
+    # (e.g. st.sidebar.error) still reach the current session, and the caller's
+    # context variables (e.g. swr_cache.refreshing)
+    ctx = get_script_run_ctx()
+
+    def run(loader, context):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return context.run(loader)
+
+    contexts = [contextvars.copy_context() for _ in loaders]
+    workers = min(max_workers, len(loaders))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch') as pool:
+        return list(pool.map(run, loaders, contexts))
+
+
+def warm(loaders):
+    """Call loaders on a background thread without waiting for them (a prefetch hint)
+
+    The thread gets no script run context: the rerun that asked for the hint
+    may be over by the time the loaders finish, and errors only reach the log.
+    """
+    if not loaders:
+        return
+
+    def run():
+        for loader in loaders:
+            loader()
+
+    threading.Thread(target=run, name='prefetch-hint', daemon=True).start()
@@ -0,0 +1,226 @@
+"""
+Push ingestion of new rows over Supabase Realtime
+
+A background thread keeps one websocket open to Supabase Realtime (Phoenix
+channel protocol) and subscribes to INSERTs on a few tables. Inserted rows are
+handed to a per-table callback a fraction of a second after they are committed
+upstream, so the dashboard can extend its cached frames without polling the
+REST API.
+
+Needs the optional websockets package; without it available() is False and the
+dashboard keeps polling.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+try:
+    import websockets
+except ImportError:  # Optional dependency: realtime stays off without it
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds between Phoenix heartbeats; the server drops sockets silent for 60s
+HEARTBEAT_INTERVAL = 25
+# Seconds to wait before each reconnect attempt (the last value repeats)
+RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+# Rows arriving within this many seconds of each other are delivered as one batch
+BATCH_WINDOW = 0.2
+MAX_BATCH_ROWS = 5000
+# Seconds the server has to accept every channel join before the socket is retried
+JOIN_TIMEOUT = 10
+# Seconds between catch-up calls while connected, in case a push was lost anyway
+RESYNC_INTERVAL = 300
+
+
+def available():
+    return websockets is not None
+
+
+def realtime_url(supabase_url, key):
+    """Realtime websocket endpoint of a Supabase project"""
+    parts = urlsplit(supabase_url)
+    scheme = 'wss' if parts.scheme == 'https' else 'ws'
+    query = urlencode({'apikey': key, 'vsn': '1.0.0'})
+    return urlunsplit((scheme, parts.netloc, '/realtime/v1/websocket', query, ''))
+
+
+def join_message(table, ref, key=None, schema='public'):
+    """Phoenix phx_join subscribing to INSERTs on one table"""
+    payload = {'config': {'postgres_changes': [{'event': 'INSERT', 'schema': schema, 'table': table}]}}
+    if key:
+        payload['access_token'] = key
+    return {'topic': f'realtime:{schema}:{table}', 'event': 'phx_join', 'payload': payload, 'ref': str(ref)}
+
+
+def inserted_row(message):
+    """(table, row) carried by an INSERT notification, or None for any other message
+
+    Understands both the postgres_changes payload and the older per-table
+    INSERT event still sent by self-hosted Realtime servers.
+    """
+    payload = message.get('payload') or {}
+    if message.get('event') == 'postgres_changes':
+        data = payload.get('data') or {}
+        if data.get('type') == 'INSERT':
+            return data.get('table'), data.get('record')
+    elif message.get('event') == 'INSERT':
+        return payload.get('table'), payload.get('record')
+    return None
+
+
+def channel_error(message):
+    """Why the server refused or closed a channel, or None for any other message"""
+    event, payload = message.get('event'), message.get('payload') or {}
+    if event == 'phx_reply' and payload.get('status') != 'ok':
+        return f"{message.get('topic')}: join refused ({payload.get('response')})"
+    if event in ('phx_error', 'phx_close'):
+        return f"{message.get('topic')}: {event}"
+    if event == 'system' and payload.get('status') == 'error':
+        return f"{message.get('topic')}: {payload.get('message')}"
+    return None
+
+
+class RealtimeFeed:
+    """Websocket subscription to INSERTs on tables, delivered to callbacks on a background thread
+
+    on_insert(table, rows) receives the new rows of one table; on_connect() is
+    called once the server has accepted every join, before any row, so the
+    caller can catch up on what was inserted while disconnected, and again every
+    resync_interval seconds while connected. connected is only True between an
+    accepted join and the next channel error or disconnect. version counts
+    delivered batches.
+    """
+
+    def __init__(self, url, tables, on_insert, on_connect=None, key=None, resync_interval=RESYNC_INTERVAL):
+        self.url = url
+        self.tables = tuple(tables)
+        self.on_insert = on_insert
+        self.on_connect = on_connect
+        self.key = key
+        self.resync_interval = resync_interval
+        self.connected = False
+        self.version = 0
+        self.error = None
+        self._refs = itertools.count(1)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not available():
+            raise RuntimeError("Realtime needs the websockets package (pip install websockets)")
+        self._thread = threading.Thread(target=self._run, name='realtime-feed', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        asyncio.run(self._connect_forever())
+
+    async def _connect_forever(self):
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self.url) as socket:
+                    attempt = 0
+                    await self._listen(socket)
+            except Exception as e:
+                logger.warning("Realtime connection lost: %s", e)
+                self.error = e
+            finally:
+                self.connected = False
+            delay = RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)]
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _heartbeat(self, socket):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await socket.send(json.dumps(
+                {'topic': 'phoenix', 'event': 'heartbeat', 'payload': {}, 'ref': str(next(self._refs))}
+            ))
+
+    async def _resync(self):
+        while True:
+            await asyncio.sleep(self.resync_interval)
+            try:
+                await asyncio.to_thread(self.on_connect)
+            except Exception as e:
+                logger.error("Realtime resync failed: %s", e)
+
+    async def _join(self, socket):
+        """Join every table's channel and wait until the server has accepted each join
+
+        Raises on a refused join or when the replies do not arrive within
+        JOIN_TIMEOUT; inserts arriving meanwhile are dropped, on_connect
+        fetches them afterwards.
+        """
+        waiting = set()
+        for table in self.tables:
+            message = join_message(table, next(self._refs), self.key)
+            waiting.add(message['ref'])
+            await socket.send(json.dumps(message))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + JOIN_TIMEOUT
+        while waiting:
+            try:
+                message = json.loads(await asyncio.wait_for(socket.recv(), deadline - loop.time()))
+            except asyncio.TimeoutError:
+                raise ConnectionError(f"Realtime joins not acknowledged within {JOIN_TIMEOUT}s") from None
+            error = channel_error(message)
+            if error:
+                raise ConnectionError(error)
+            if message.get('event') == 'phx_reply':
+                waiting.discard(message.get('ref'))
+
+    async def _listen(self, socket):
+        await self._join(socket)
+        if self.on_connect:
+            await asyncio.to_thread(self.on_connect)
+        self.connected, self.error = True, None
+
+        heartbeat = asyncio.create_task(self._heartbeat(socket))
+        resync = asyncio.create_task(self._resync()) if self.on_connect and self.resync_interval else None
+        pending = {}
+        try:
+            while not self._stop.is_set():
+                try:
+                    raw = await asyncio.wait_for(socket.recv(), BATCH_WINDOW if pending else None)
+                except asyncio.TimeoutError:
+                    await self._deliver(pending)
+                    pending = {}
+                    continue
+                message = json.loads(raw)
+                error = channel_error(message)
+                if error:
+                    # The subscription is gone: reconnect, and let on_connect catch up
+                    await self._deliver(pending)
+                    raise ConnectionError(error)
+                inserted = inserted_row(message)
+                if inserted is None or inserted[0] not in self.tables or inserted[1] is None:
+                    continue
+                table, row = inserted
+                pending.setdefault(table, []).append(row)
+                if sum(map(len, pending.values())) >= MAX_BATCH_ROWS:
+                    await self._deliver(pending)
+                    pending = {}
+        finally:
+            heartbeat.cancel()
+            if resync:
+                resync.cancel()
+
+    async def _deliver(self, pending):
+        for table, rows in pending.items():
+            try:
+                # Callbacks touch SQLite and pandas: keep them off the event loop
+                await asyncio.to_thread(self.on_insert, table, rows)
+            except Exception as e:
+                logger.error("Handling %d realtime inserts on %s failed: %s", len(rows), table, e)
+        self.version += 1
@@ -0,0 +1,131 @@
+"""
+Incrementally maintained (bucket, event_type) rollups of vault events
+
+Charts read event counts per hour (or per day, summed from hours) from the
+rollup instead of grouping every event on each rerun. New events are folded in
+as the in-memory superset grows, so a rerender costs the number of buckets in
+the window, not the number of events in history.
+"""
+
+import threading
+
+import pandas as pd
+
+from dashboard import metrics
+
+DEFAULT_FREQ = 'h'
+
+
+def _timestamp(value, tz):
+    value = pd.Timestamp(value)
+    if tz is not None and value.tzinfo is None:
+        value = value.tz_localize('UTC')
+    return value
+
+
+class EventRollup:
+    """Event counts and distinct vault ids per (bucket, event_type)
+
+    fold() is shaped to be an IncrementalFrame subscriber. Distinct vaults are
+    kept as exact per-bucket sets: vault ids repeat heavily, so each set stays
+    small and windowed distinct counts are exact unions.
+    """
+
+    def __init__(self, freq=DEFAULT_FREQ):
+        self.freq = freq
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        index = pd.MultiIndex.from_arrays(
+            [pd.DatetimeIndex([]), pd.Index([], dtype=object)],
+            names=['bucket', 'event_type']
+        )
+        self._counts = pd.Series(0, index=index, dtype='int64')
+        self._vaults = {}
+
+    def _group(self, events):
+        buckets = events['timestamp'].dt.floor(self.freq).rename('bucket')
+        return [buckets, events['event_type'].astype(str).rename('event_type')]
+
+    def fold(self, events, reset=False):
+        """Add a batch of new events (timestamp, event_type, vault_id columns)"""
+        with self._lock, metrics.timed('frame'):
+            if reset:
+                self._reset()
+            if events.empty:
+                return
+
+            keys = self._group(events)
+            counts = events.groupby(keys).size()
+            if self._counts.empty:
+                self._counts = counts.astype('int64').sort_index()
+            else:
+                self._counts = self._counts.add(counts, fill_value=0).astype('int64').sort_index()
+
+            if 'vault_id' in events.columns:
+                vaults = events['vault_id'].astype(object).groupby(keys).unique()
+                for key, ids in vaults.items():
+                    self._vaults.setdefault(key, set()).update(v for v in ids if isinstance(v, str))
+
+    def _split(self, start, end, events):
+        """Whole buckets inside [start, end] and the window's events falling in partial edge buckets
+
+        events is the window's slice sorted newest-first; only its edges are read.
+        """
+        with self._lock:
+            counts = self._counts
+        buckets = counts.index.get_level_values('bucket')
+        tz = events['timestamp'].dt.tz if not events.empty else buckets.tz
+
+        lower = _timestamp(start, tz).ceil(self.freq) if start is not None else None
+        upper = _timestamp(end, tz).floor(self.freq) if end is not None else None
+        if lower is not None and upper is not None and lower >= upper:
+            # Window shorter than one bucket: nothing is whole
+            return counts.iloc[:0], events
+
+        whole = counts
+        if not counts.empty:
+            inside = pd.Series(True, index=counts.index)
+            if lower is not None:
+                inside &= buckets >= lower
+            if upper is not None:
+                inside &= buckets < upper
+            whole = counts[inside.to_numpy()]
+
+        if events.empty or (lower is None and upper is None):
+            return whole, events.iloc[:0]
+        oldest_first = events['timestamp'].iloc[::-1]
+        before = oldest_first.searchsorted(lower, side='left') if lower is not None else 0
+        after = oldest_first.searchsorted(upper, side='left') if upper is not None else len(events)
+        n = len(events)
+        # Positions in the newest-first frame: the newest (n - after) rows and the oldest `before` rows
+        edge_positions = list(range(0, n - after)) + list(range(n - before, n))
+        return whole, events.iloc[edge_positions]
+
+    def counts(self, start=None, end=None, events=None):
+        """Event counts per (bucket, event_type) within [start, end] as a DataFrame
+
+        start/end are ISO strings or timestamps (None for unbounded). events is
+        the window's newest-first slice, used for the partial buckets at the edges.
+        """
+        events = events if events is not None else pd.DataFrame(columns=['timestamp', 'event_type'])
+        whole, edges = self._split(start, end, events)
+        if not edges.empty:
+            edge_counts = edges.groupby(self._group(edges)).size()
+            whole = edge_counts if whole.empty else whole.add(edge_counts, fill_value=0).astype('int64')
+        return whole.sort_index().rename('count').reset_index()
+
+    def unique_vaults(self, start=None, end=None, events=None, event_types=None):
+        """Number of distinct vault ids within [start, end], optionally for some event types only"""
+        events = events if events is not None else pd.DataFrame(columns=['timestamp', 'event_type', 'vault_id'])
+        whole, edges = self._split(start, end, events)
+        if event_types:
+            edges = edges[edges['event_type'].isin(event_types)]
+
+        vaults = set(edges['vault_id'].dropna().astype(str)) if 'vault_id' in edges else set()
+        with self._lock:
+            for key in whole.index:
+                if not event_types or key[1] in event_types:
+                    vaults |= self._vaults.get(key, set())
+        return len(vaults)
@@ -0,0 +1,115 @@
+"""
+Cold-start profile: per-module import time and time to first render
+
+With MP_STARTUP_PROFILE=1 the first script run of the process times every
+module imported for the first time on the script thread, and the milestones the
+app marks (first paint, section rendered). When the run finishes the report is
+printed to stderr and kept for the Diagnostics panel. Later reruns find every
+module already imported, so only the first run of a process is profiled.
+"""
+
+import builtins
+import sys
+import threading
+import time
+
+# Slowest imports listed in the printed report
+REPORT_IMPORTS = 15
+
+_profile = None
+_report = None
+
+
+def _unloaded(name, fromlist):
+    """What an import statement would load, or None if it is all in sys.modules"""
+    if name not in sys.modules:
+        return name
+    # "from package import module" of a package that is already loaded
+    package = sys.modules[name]
+    missing = [f'{name}.{item}' for item in fromlist or () if item != '*' and not hasattr(package, item)]
+    return ', '.join(missing) or None
+
+
+class _ImportTimer:
+    """builtins.__import__ wrapper recording the inclusive load time of new modules
+
+    Only imports made on the installing thread are timed; loader threads import
+    concurrently and would skew the nesting.
+    """
+
+    def __init__(self, started):
+        self.started = started
+        self.imports = []
+        self._depth = 0
+        self._thread = threading.get_ident()
+        self._original = builtins.__import__
+
+    def __call__(self, name, globals=None, locals=None, fromlist=(), level=0):
+        label = None if level or threading.get_ident() != self._thread else _unloaded(name, fromlist)
+        if label is None:
+            return self._original(name, globals, locals, fromlist, level)
+        depth = self._depth
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            self._depth = depth
+            self.imports.append({
+                'module': label,
+                'depth': depth,
+                'at_s': round(start - self.started, 4),
+                'import_s': round(time.perf_counter() - start, 4),
+            })
+
+    def install(self):
+        builtins.__import__ = self
+
+    def uninstall(self):
+        if builtins.__import__ is self:
+            builtins.__import__ = self._original
+
+
+def begin(enabled):
+    """Start profiling this run if enabled and it is the first run of the process"""
+    global _profile
+    if _profile is not None:
+        finish()  # the profiled run was cut short (st.stop, st.rerun)
+    if not enabled or _report is not None:
+        return
+    _profile = {'timer': _ImportTimer(time.perf_counter()), 'marks': []}
+    _profile['timer'].install()
+
+
+def mark(milestone):
+    """Record the time since the run started at a milestone (e.g. 'first paint')"""
+    if _profile is not None:
+        _profile['marks'].append((milestone, round(time.perf_counter() - _profile['timer'].started, 4)))
+
+
+def finish():
+    """Stop profiling and print the report; a no-op outside the profiled run"""
+    global _profile, _report
+    if _profile is None:
+        return
+    timer = _profile['timer']
+    timer.uninstall()
+    _report = {'imports': timer.imports, 'marks': _profile['marks']}
+    _profile = None
+    print(format_report(_report), file=sys.stderr)
+
+
+def report():
+    """The finished startup report ({'imports': [...], 'marks': [...]}), or None"""
+    return _report
+
+
+def format_report(report):
+    # Modules imported directly by the app; nested imports are part of their time
+    direct = sorted((i for i in report['imports'] if i['depth'] == 0), key=lambda i: -i['import_s'])
+    lines = ["Startup profile (first run of this process)", "  imports (inclusive seconds):"]
+    lines += [f"    {i['module']:<40} {i['import_s']:>8.3f}  at {i['at_s']:.3f}s" for i in direct[:REPORT_IMPORTS]]
+    lines.append(f"    {'total':<40} {sum(i['import_s'] for i in direct):>8.3f}")
+    lines.append("  milestones (seconds since the run started):")
+    lines += [f"    {milestone:<40} {seconds:>8.3f}" for milestone, seconds in report['marks']]
+    return '\n'.join(lines)
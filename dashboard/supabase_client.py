@@ -0,0 +1,223 @@
+"""
+Pooled Supabase REST client shared by every dashboard loader
+"""
+
+import contextvars
+import importlib.util
+import io
+import logging
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from dashboard import metrics
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 30)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+# Supabase's default PostgREST max-rows, so a page is never silently truncated
+DEFAULT_PAGE_SIZE = 1000
+
+# get_frame() transfers tables as 'csv' (parsed column-wise) or 'json' (list of dicts)
+WIRE_FORMATS = ('csv', 'json')
+DEFAULT_WIRE_FORMAT = 'csv'
+# pyarrow's multithreaded CSV reader when available, pandas' C parser otherwise
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+# Set by showing_first_page(); a context variable so only the caller's own loads report to it
+_first_page = contextvars.ContextVar('first_page', default=None)
+
+
+@contextmanager
+def showing_first_page(show):
+    """Within the block, iter_pages hands its first page of rows to show(rows) before fetching the rest
+
+    Lets a view render the newest rows of a long paginated load while the older
+    pages are still being requested.
+    """
+    token = _first_page.set(show)
+    try:
+        yield
+    finally:
+        _first_page.reset(token)
+
+
+def _quote(value):
+    """Quote a value for use inside a PostgREST logic tree (or=/and=)"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def keyset_filter(keys, values, op):
+    """Build the PostgREST filter selecting rows strictly after (or before) a key tuple
+
+    For keys (timestamp, id) and op 'lt' this is
+    or=(timestamp.lt."T",and(timestamp.eq."T",id.lt."I"))
+    """
+    if len(keys) == 1:
+        return (keys[0], f'{op}.{values[0]}')
+
+    terms = []
+    for i, key in enumerate(keys):
+        equal = [f'{k}.eq.{_quote(v)}' for k, v in zip(keys[:i], values[:i])]
+        step = f'{key}.{op}.{_quote(values[i])}'
+        terms.append(f"and({','.join(equal + [step])})" if equal else step)
+    return ('or', f"({','.join(terms)})")
+
+
+class SupabaseClient:
+    """Keep-alive HTTP session for the Supabase REST API (PostgREST)
+
+    One instance is shared by the whole process, so every loader reuses the
+    same pooled TCP+TLS connections instead of paying a handshake per request.
+    """
+
+    def __init__(self, url, key, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, wire_format=DEFAULT_WIRE_FORMAT):
+        if wire_format not in WIRE_FORMATS:
+            raise ValueError(f"wire_format must be one of {WIRE_FORMATS}, not {wire_format!r}")
+        self.url = url.rstrip('/')
+        self.key = key
+        self.timeout = timeout
+        self.wire_format = wire_format
+        self.session = requests.Session()
+        self.session.headers.update({
+            'apikey': key,
+            'Authorization': f'Bearer {key}',
+        })
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD', 'POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=True,  # Cap concurrent connections instead of opening extras
+            max_retries=retry
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _request(self, method, url, **kwargs):
+        """Send one request over the shared session, accounting its time and size to the current fetch"""
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        metrics.add_http(time.perf_counter() - start, len(response.content))
+        return response
+
+    def rest_url(self, path):
+        """Build a /rest/v1 URL for a table, view or rpc path"""
+        return f"{self.url}/rest/v1/{path.lstrip('/')}"
+
+    def get(self, path, params=None, headers=None):
+        """GET a PostgREST path such as 'vault_events?select=*'"""
+        return self._request('GET', self.rest_url(path), params=params, headers=headers)
+
+    def get_frame(self, path, params=None):
+        """GET a PostgREST path straight into a DataFrame
+
+        With the csv wire format the table is requested as text/csv and parsed
+        column-wise; a server that answers with JSON anyway (or CSV the parser
+        rejects) falls back to the JSON path. Suited to flat tables: array and
+        JSON columns arrive as Postgres text literals in CSV.
+        """
+        headers = {'Accept': 'text/csv'} if self.wire_format == 'csv' else None
+        response = self.get(path, params=params, headers=headers)
+        response.raise_for_status()
+
+        with metrics.timed('decode'):
+            if response.headers.get('Content-Type', '').startswith('text/csv'):
+                if not response.content.strip():
+                    return pd.DataFrame()
+                try:
+                    return pd.read_csv(io.BytesIO(response.content), engine=CSV_ENGINE)
+                except (ValueError, pd.errors.ParserError) as e:
+                    logger.warning("CSV parse of %s failed (%s), refetching as JSON", path, e)
+                    response = self.get(path, params=params)
+                    response.raise_for_status()
+            return pd.DataFrame(response.json())
+
+    def rpc(self, name, args=None):
+        """Call a Postgres function exposed by PostgREST (POST /rest/v1/rpc/<name>)"""
+        return self._request('POST', self.rest_url(f'rpc/{name}'), json=args or {})
+
+    def count(self, table, filters=None):
+        """Exact number of matching rows from a HEAD request; no rows are transferred"""
+        params = list(filters or []) + [('select', 'id')]
+        response = self._request(
+            'HEAD',
+            self.rest_url(table),
+            params=params,
+            headers={'Prefer': 'count=exact'},
+            allow_redirects=False
+        )
+        response.raise_for_status()
+        # Content-Range looks like "0-24/3573458" or "*/0"
+        return int(response.headers['Content-Range'].rsplit('/', 1)[1])
+
+    def iter_pages(self, table, select='*', filters=None, keys=('id',), descending=False,
+                   page_size=DEFAULT_PAGE_SIZE):
+        """Yield a table's rows page by page using keyset pagination on keys
+
+        Each page is one request ordered by keys and continuing strictly after the
+        last key seen, so pages stay cheap however deep they go and no row is lost
+        to the server's max-rows cap. Iteration stops on the first empty page,
+        which keeps it correct even if the server caps pages below page_size.
+        filters is a list of (column, 'op.value') pairs. Inside
+        showing_first_page(show), the first page is also passed to show.
+        """
+        if select != '*':
+            columns = select.split(',')
+            select = ','.join(columns + [k for k in keys if k not in columns])
+
+        direction = 'desc' if descending else 'asc'
+        base_params = list(filters or []) + [
+            ('select', select),
+            ('order', ','.join(f'{k}.{direction}' for k in keys)),
+            ('limit', str(page_size)),
+        ]
+
+        last = None
+        while True:
+            params = list(base_params)
+            if last is not None:
+                params.append(keyset_filter(keys, last, 'lt' if descending else 'gt'))
+
+            response = self.get(table, params=params)
+            response.raise_for_status()
+            with metrics.timed('decode'):
+                rows = response.json()
+            if not rows:
+                return
+
+            show = _first_page.get() if last is None else None
+            if show is not None:
+                show(rows)
+            yield rows
+            last = tuple(rows[-1][k] for k in keys)
+
+    def get_external(self, url, params=None, timeout=None):
+        """GET a non-Supabase URL (e.g. the Vercel API) over the shared pool, without Supabase auth headers"""
+        return self._request(
+            'GET',
+            url,
+            params=params,
+            headers={'apikey': None, 'Authorization': None},
+            timeout=timeout or self.timeout
+        )
+
+    def close(self):
+        self.session.close()
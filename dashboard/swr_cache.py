@@ -0,0 +1,268 @@
+"""
+Stale-while-revalidate cache for the dashboard's fetch_* loaders
+
+A value older than its ttl is still served immediately while a background thread
+refreshes it, so page loads never wait on Supabase for data already held. A failed
+refresh keeps the previous value. Only the very first load of a key blocks.
+
+Inside refreshing(max_age), loaders marked live (those whose reload is an
+incremental fetch) reload values older than max_age in the caller's thread
+instead, so a timed auto-refresh shows the new rows on the same tick.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+from dashboard import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 64
+
+# Streamlit re-executes the app script on every rerun, redefining each loader;
+# caches are looked up by the loader's qualified name so entries survive reruns
+_registry = {}
+_registry_lock = threading.Lock()
+
+# Set by refreshing(); a context variable so prefetch workers can carry it over
+_max_age = contextvars.ContextVar('swr_max_age', default=None)
+
+
+def _make_key(args, kwargs):
+    def freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(v) for v in value)
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        if isinstance(value, set):
+            return frozenset(value)
+        return value
+    return freeze(args), freeze(kwargs)
+
+
+def _share(value):
+    """Hand out a shallow copy of DataFrames so callers can add columns without touching the cache"""
+    if hasattr(value, 'copy') and hasattr(value, 'columns'):
+        return value.copy(deep=False)
+    return value
+
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at', 'failed_at', 'refreshing', 'invalidated', 'error', 'lock')
+
+    def __init__(self):
+        self.value = None
+        self.fetched_at = None
+        self.failed_at = None
+        self.refreshing = False
+        self.invalidated = False
+        self.error = None
+        self.lock = threading.Lock()
+
+
+class SWRCache:
+    """Cache of one loader's results, keyed by its arguments"""
+
+    def __init__(self, func, ttl, label, default, on_error, max_entries, live=False):
+        self.func = func
+        self.ttl = ttl
+        self.label = label
+        self.default = default
+        self.on_error = on_error
+        self.max_entries = max_entries
+        self.live = live
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _refresh(self, entry, args, kwargs):
+        try:
+            with metrics.record(self.label, cache='refresh'):
+                value = self.func(*args, **kwargs)
+                metrics.set_rows(value)
+        except Exception as e:
+            logger.warning("Refreshing %s failed, keeping previous value: %s", self.label, e)
+            entry.error = e
+        else:
+            entry.value, entry.fetched_at, entry.error = value, time.monotonic(), None
+        finally:
+            entry.refreshing = False
+
+    def _reload(self, entry, args, kwargs, record):
+        """Reload in the caller's thread; a failure keeps the previous value"""
+        record['cache'] = 'refresh'
+        # Cleared first: an invalidate() arriving during the reload forces another one
+        entry.invalidated = False
+        try:
+            entry.value, entry.fetched_at, entry.error = self.func(*args, **kwargs), time.monotonic(), None
+        except Exception as e:
+            logger.warning("Refreshing %s failed, keeping previous value: %s", self.label, e)
+            entry.error, entry.failed_at = e, time.monotonic()
+
+    @staticmethod
+    def _last_attempt_age(entry):
+        """Seconds since the value was loaded or a reload last failed"""
+        return time.monotonic() - max(entry.fetched_at, entry.failed_at or 0)
+
+    def __call__(self, *args, **kwargs):
+        with metrics.record(self.label) as record:
+            value = self._get(args, kwargs, record)
+            metrics.set_rows(value)
+            return value
+
+    def _get(self, args, kwargs, record):
+        entry = self._entry(_make_key(args, kwargs))
+
+        if entry.fetched_at is None:
+            # Nothing to serve yet: load in the caller's thread (once per key)
+            with entry.lock:
+                if entry.fetched_at is None:
+                    # A failed first load is not retried until the ttl has passed
+                    if entry.failed_at is None or time.monotonic() - entry.failed_at > self.ttl:
+                        record['cache'] = 'miss'
+                        try:
+                            entry.value, entry.fetched_at, entry.error = self.func(*args, **kwargs), time.monotonic(), None
+                        except Exception as e:
+                            entry.error, entry.failed_at = e, time.monotonic()
+                    if entry.fetched_at is None:
+                        record['cache'] = record['cache'] or 'failed'
+                        record['error'] = str(entry.error)
+                        self.on_error(self.label, entry.error, None)
+                        return self.default()
+            record['cache'] = record['cache'] or 'hit'  # Loaded meanwhile by another thread
+            return _share(entry.value)
+
+        max_age = _max_age.get() if self.live else None
+        stale = time.monotonic() - entry.fetched_at > self.ttl
+        record['cache'] = 'stale' if stale else 'hit'
+        if entry.invalidated or (max_age is not None and self._last_attempt_age(entry) > max_age):
+            with entry.lock:
+                # Callers on the same tick reload once
+                if entry.invalidated or (max_age is not None and self._last_attempt_age(entry) > max_age):
+                    self._reload(entry, args, kwargs, record)
+        elif stale:
+            with entry.lock:
+                start = not entry.refreshing
+                entry.refreshing = True
+            if start:
+                threading.Thread(
+                    target=self._refresh,
+                    args=(entry, args, kwargs),
+                    name=f'swr-{self.label}',
+                    daemon=True
+                ).start()
+
+        if entry.error is not None:
+            record['error'] = str(entry.error)
+            self.on_error(self.label, entry.error, self.age(*args, **kwargs))
+        return _share(entry.value)
+
+    def age(self, *args, **kwargs):
+        """Seconds since the value for these arguments was fetched, or None if never loaded"""
+        with self._lock:
+            entry = self._entries.get(_make_key(args, kwargs))
+        if entry is None or entry.fetched_at is None:
+            return None
+        return time.monotonic() - entry.fetched_at
+
+    def peek(self, *args, **kwargs):
+        """The cached value for these arguments, or None when not loaded; never fetches"""
+        with self._lock:
+            entry = self._entries.get(_make_key(args, kwargs))
+        if entry is None or entry.fetched_at is None:
+            return None
+        return _share(entry.value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self):
+        """Reload every cached value in the caller's thread on its next read (e.g. after pushed inserts)"""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.invalidated = True
+
+
+def clear_all():
+    """Drop every cached value of every loader (e.g. between benchmark runs)"""
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
+
+
+@contextmanager
+def refreshing(max_age):
+    """Within the block, live loaders reload (in the calling thread) values older than max_age seconds
+
+    max_age=None leaves the block on plain stale-while-revalidate. A value whose
+    reload failed is served as is until max_age has passed again.
+    """
+    token = _max_age.set(max_age)
+    try:
+        yield
+    finally:
+        _max_age.reset(token)
+
+
+def _log_error(label, error, age):
+    logger.error("Error fetching %s: %s", label, error)
+
+
+def swr_cache(ttl, label, default=lambda: None, on_error=_log_error, max_entries=DEFAULT_MAX_ENTRIES, live=False):
+    """Decorate a loader with a stale-while-revalidate cache
+
+    The loader must raise on failure rather than return an empty result. When the
+    first load of a key fails, on_error(label, error, None) is called and default()
+    is returned until the load is retried after ttl seconds. When a background
+    refresh failed, every later call reports on_error(label, error, age) and still
+    returns the last good value. live marks a loader whose reload is cheap
+    (incremental), so refreshing() may reload it synchronously.
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+        with _registry_lock:
+            cache = _registry.get(name)
+            if cache is None:
+                cache = _registry[name] = SWRCache(func, ttl, label, default, on_error, max_entries, live)
+            else:
+                # Same loader redefined by a rerun: keep the entries, use the new code
+                cache.func, cache.ttl, cache.label = func, ttl, label
+                cache.default, cache.on_error, cache.live = default, on_error, live
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache(*args, **kwargs)
+
+        wrapper.age = cache.age
+        wrapper.clear = cache.clear
+        wrapper.peek = cache.peek
+        wrapper.invalidate = cache.invalidate
+        return wrapper
+
+    return decorator
+
+
+def loader_age(loader):
+    """Age of a decorated loader's cached value; loader may be a functools.partial of one"""
+    args, kwargs = (), {}
+    if hasattr(loader, 'func') and hasattr(loader, 'args'):
+        loader, args, kwargs = loader.func, loader.args, loader.keywords
+    age = getattr(loader, 'age', None)
+    return age(*args, **kwargs) if age else None
@@ -31,6 +31,15 @@ CREATE OR REPLACE TABLE indexer_state (
     last_updated TIMESTAMP_TZ DEFAULT CURRENT_TIMESTAMP()
 );
 
+-- Sync watermark per source table: last Supabase id loaded, committed with each batch
+CREATE TABLE IF NOT EXISTS sync_state (
+    source_table VARCHAR PRIMARY KEY,
+    last_id NUMBER NOT NULL,
+    last_processed_at TIMESTAMP_TZ,
+    rows_synced NUMBER DEFAULT 0,
+    updated_at TIMESTAMP_TZ DEFAULT CURRENT_TIMESTAMP()
+);
+
 -- Create analytics views
 CREATE OR REPLACE VIEW daily_vault_metrics AS
 SELECT 
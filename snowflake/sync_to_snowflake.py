@@ -4,7 +4,11 @@ This script pulls data from Supabase and loads it into Snowflake for analytics
 """
 
 import os
+import queue
+import threading
+import time
 import snowflake.connector
+from snowflake.connector.errors import ProgrammingError
 from supabase import create_client
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -29,16 +33,98 @@ SNOWFLAKE_CONFIG = {
     'role': os.getenv('SNOWFLAKE_ROLE', 'ACCOUNTADMIN')
 }
 
+# Rows per Supabase request; keep at or below the PostgREST max-rows setting
+PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '1000'))
+
+# Rows prepared and loaded into Snowflake at a time; bounds memory whatever the backlog
+BATCH_SIZE = int(os.getenv('SYNC_BATCH_SIZE', '10000'))
+
+# Batches allowed to wait between two pipeline stages (extract -> transform -> load)
+QUEUE_DEPTH = int(os.getenv('SYNC_QUEUE_DEPTH', '2'))
+
+# Seconds between checks for a failed stage while blocked on a queue
+QUEUE_POLL_INTERVAL = 0.5
+
+# 'merge' upserts each batch through a staging table (idempotent); 'append' bulk-inserts with write_pandas
+LOAD_MODES = ('merge', 'append')
+LOAD_MODE = os.getenv('SYNC_LOAD_MODE', 'merge')
+
+# Session-private table each batch is bulk-written to before the MERGE
+STAGING_TABLE = 'VAULT_EVENTS_STAGING'
+
+# Snowflake errors caused by row values (numeric/date/timestamp/JSON conversion, NULL in a NOT NULL
+# column): only these are isolated row by row; SQLSTATE class 22 is "data exception"
+ROW_ERRNOS = {100035, 100038, 100040, 100069, 100071, 100072}
+ROW_SQLSTATE_CLASS = '22'
+
+# Events Snowflake rejects (merge mode) are appended here (JSON lines, with the error) and skipped
+DEAD_LETTER_PATH = os.getenv(
+    'SYNC_DEAD_LETTER_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dead_letters.jsonl')
+)
+
 def get_supabase_client():
     """Initialize Supabase client"""
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 def get_snowflake_connection():
     """Create Snowflake connection"""
-    return snowflake.connector.connect(**SNOWFLAKE_CONFIG)
+    # Explicit commits: each batch is committed together with its sync watermark
+    return snowflake.connector.connect(**SNOWFLAKE_CONFIG, autocommit=False)
+
+def ensure_sync_state(conn):
+    """Create the sync_state watermark table if this deployment predates it"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                source_table VARCHAR PRIMARY KEY,
+                last_id NUMBER NOT NULL,
+                last_processed_at TIMESTAMP_TZ,
+                rows_synced NUMBER DEFAULT 0,
+                updated_at TIMESTAMP_TZ DEFAULT CURRENT_TIMESTAMP()
+            )
+        """)
+    finally:
+        cursor.close()
+
+def get_sync_watermark(conn, source_table='vault_events'):
+    """Last Supabase id loaded from source_table, or None before the first watermarked sync"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT last_id FROM sync_state WHERE source_table = %(source_table)s",
+            {'source_table': source_table}
+        )
+        result = cursor.fetchone()
+        return result[0] if result else None
+    finally:
+        cursor.close()
+
+def save_sync_watermark(conn, watermark, rows, source_table='vault_events'):
+    """Advance source_table's watermark; committed by the caller with the rows it covers"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            MERGE INTO sync_state t
+            USING (
+                SELECT %(source_table)s AS source_table, %(last_id)s AS last_id,
+                       %(last_processed_at)s::TIMESTAMP_TZ AS last_processed_at, %(rows)s AS rows
+            ) s
+            ON t.source_table = s.source_table
+            WHEN MATCHED THEN UPDATE SET
+                last_id = GREATEST(t.last_id, s.last_id),
+                last_processed_at = GREATEST_IGNORE_NULLS(t.last_processed_at, s.last_processed_at),
+                rows_synced = t.rows_synced + s.rows,
+                updated_at = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN INSERT (source_table, last_id, last_processed_at, rows_synced)
+                VALUES (s.source_table, s.last_id, s.last_processed_at, s.rows)
+        """, {'source_table': source_table, 'rows': rows, **watermark})
+    finally:
+        cursor.close()
 
 def get_last_sync_timestamp(conn):
-    """Get the last synchronized timestamp from Snowflake"""
+    """Get the last synchronized timestamp from Snowflake (first watermarked sync only: it scans vault_events)"""
     cursor = conn.cursor()
     try:
         cursor.execute("""
@@ -54,20 +140,45 @@ def get_last_sync_timestamp(conn):
     finally:
         cursor.close()
 
-def fetch_new_events(supabase, last_sync):
-    """Fetch events from Supabase newer than last_sync"""
-    try:
-        # Fetch events newer than last sync
-        response = supabase.table('vault_events')\
-            .select('*')\
-            .gt('timestamp', last_sync.isoformat())\
-            .order('timestamp', desc=False)\
-            .execute()
+def fetch_new_events(supabase, after_id, since=None, batch_size=BATCH_SIZE, page_size=PAGE_SIZE):
+    """Yield events with a Supabase id above after_id, in id order, in lists of batch_size
+
+    Ids grow with every insert, so events sharing a timestamp are never split
+    between runs and rows a backfill inserts later with older timestamps are
+    still picked up. since additionally limits the first sync to events newer
+    than a timestamp. Pages use keyset pagination on id: each request continues
+    strictly after the last row seen, so no page is cut short by the PostgREST
+    max-rows cap and only one batch is held in memory however large the backlog.
+    """
+    batch = []
+    last_id = after_id
+    while True:
+        query = supabase.table('vault_events').select('*').gt('id', last_id)
+        if since is not None:
+            query = query.gt('timestamp', since.isoformat())
+        try:
+            response = query.order('id').limit(page_size).execute()
+        except Exception as e:
+            # Loaded batches have committed their watermark, so the next run resumes after them
+            print(f"Error fetching from Supabase: {e}")
+            break
         
-        return response.data
-    except Exception as e:
-        print(f"Error fetching from Supabase: {e}")
-        return []
+        rows = response.data
+        if not rows:
+            break
+        batch.extend(rows)
+        last_id = rows[-1]['id']
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+    
+    if batch:
+        yield batch
+
+def batch_watermark(events):
+    """Watermark reached once a batch of events (in id order) is loaded"""
+    processed = [event['processed_at'] for event in events if event.get('processed_at')]
+    return {'last_id': events[-1]['id'], 'last_processed_at': max(processed, default=None)}
 
 def prepare_data_for_snowflake(events):
     """Prepare event data for Snowflake insertion"""
@@ -91,63 +202,194 @@ def prepare_data_for_snowflake(events):
     
     return prepared_data
 
+def prepare_batch(events):
+    """Snowflake rows for a batch of events and the watermark they advance to"""
+    return prepare_data_for_snowflake(events), batch_watermark(events)
+
 def load_to_snowflake(conn, data):
-    """Load data into Snowflake"""
+    """Append data to vault_events with one bulk load; returns the rows loaded
+
+    A row Snowflake rejects fails the whole load (and the batch, see load_batch)
+    instead of being skipped silently.
+    """
     if not data:
         print("No new data to load")
         return 0
     
+    # Create DataFrame
+    df = pd.DataFrame(data)
+    
+    # Use Snowflake's write_pandas for efficient bulk loading
+    from snowflake.connector.pandas_tools import write_pandas
+    
+    success, nchunks, nrows, _ = write_pandas(
+        conn, 
+        df, 
+        'VAULT_EVENTS',
+        auto_create_table=False
+    )
+    
+    if success:
+        print(f"Successfully loaded {nrows} rows to Snowflake")
+        return nrows
+    else:
+        print("Failed to load data to Snowflake")
+        return 0
+
+def merge_to_snowflake(conn, data):
+    """Upsert data into vault_events through a staging table; returns (inserted, updated)
+
+    The batch is bulk-written to a temporary staging table and merged into
+    vault_events with one set-based MERGE on the natural key (transaction_hash,
+    event_type, vault_id), which Snowflake does not enforce as a constraint.
+    Loading the same events again inserts and updates nothing. The caller commits.
+    """
+    if not data:
+        print("No new data to load")
+        return 0, 0
+    
+    from snowflake.connector.pandas_tools import write_pandas
+    
     cursor = conn.cursor()
     try:
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
-        # Use Snowflake's write_pandas for efficient bulk loading
-        from snowflake.connector.pandas_tools import write_pandas
-        
-        success, nchunks, nrows, _ = write_pandas(
-            conn, 
-            df, 
-            'VAULT_EVENTS',
-            auto_create_table=False,
-            on_error='continue'  # Continue on duplicate key errors
-        )
-        
-        if success:
-            print(f"Successfully loaded {nrows} rows to Snowflake")
-            return nrows
-        else:
-            print("Failed to load data to Snowflake")
-            return 0
-            
-    except Exception as e:
-        print(f"Error loading to Snowflake: {e}")
-        # Fallback to individual inserts
-        inserted = 0
-        for record in data:
-            try:
-                cursor.execute("""
-                    INSERT INTO vault_events (
-                        contract_address, event_type, transaction_hash,
-                        block_number, timestamp, topics, data, vault_id, processed_at
-                    ) VALUES (
-                        %(CONTRACT_ADDRESS)s, %(EVENT_TYPE)s, %(TRANSACTION_HASH)s,
-                        %(BLOCK_NUMBER)s, %(TIMESTAMP)s, PARSE_JSON(%(TOPICS)s), 
-                        %(DATA)s, %(VAULT_ID)s, %(PROCESSED_AT)s
-                    )
-                """, record)
-                inserted += 1
-            except Exception as insert_error:
-                # Skip duplicates
-                if 'Duplicate' not in str(insert_error):
-                    print(f"Error inserting record: {insert_error}")
+        # Timestamps and topics stay text here and are cast by the MERGE
+        cursor.execute(f"""
+            CREATE OR REPLACE TEMPORARY TABLE {STAGING_TABLE} (
+                contract_address VARCHAR,
+                event_type VARCHAR,
+                transaction_hash VARCHAR,
+                block_number NUMBER,
+                timestamp VARCHAR,
+                topics VARCHAR,
+                data VARCHAR,
+                vault_id VARCHAR,
+                processed_at VARCHAR
+            )
+        """)
+        success, _, nrows, _ = write_pandas(conn, pd.DataFrame(data), STAGING_TABLE, auto_create_table=False)
+        if not success:
+            raise RuntimeError(f"Bulk load into {STAGING_TABLE} failed")
         
-        conn.commit()
-        print(f"Inserted {inserted} records via fallback method")
-        return inserted
+        # A batch holding the same event twice keeps the most recently processed copy
+        cursor.execute(f"""
+            MERGE INTO vault_events t
+            USING (
+                SELECT
+                    contract_address, event_type, transaction_hash, block_number,
+                    timestamp::TIMESTAMP_TZ AS timestamp,
+                    PARSE_JSON(topics)::ARRAY AS topics,
+                    data, vault_id,
+                    COALESCE(processed_at::TIMESTAMP_TZ, CURRENT_TIMESTAMP()) AS processed_at
+                FROM {STAGING_TABLE}
+                QUALIFY ROW_NUMBER() OVER (
+                    PARTITION BY transaction_hash, event_type, vault_id ORDER BY processed_at DESC
+                ) = 1
+            ) s
+            ON t.transaction_hash = s.transaction_hash
+                AND t.event_type = s.event_type
+                AND EQUAL_NULL(t.vault_id, s.vault_id)
+            WHEN MATCHED AND (
+                t.contract_address IS DISTINCT FROM s.contract_address
+                OR t.block_number IS DISTINCT FROM s.block_number
+                OR t.timestamp IS DISTINCT FROM s.timestamp
+                OR t.topics IS DISTINCT FROM s.topics
+                OR t.data IS DISTINCT FROM s.data
+            ) THEN UPDATE SET
+                contract_address = s.contract_address,
+                block_number = s.block_number,
+                timestamp = s.timestamp,
+                topics = s.topics,
+                data = s.data,
+                processed_at = s.processed_at
+            WHEN NOT MATCHED THEN INSERT (
+                contract_address, event_type, transaction_hash,
+                block_number, timestamp, topics, data, vault_id, processed_at
+            ) VALUES (
+                s.contract_address, s.event_type, s.transaction_hash,
+                s.block_number, s.timestamp, s.topics, s.data, s.vault_id, s.processed_at
+            )
+        """)
+        inserted, updated = cursor.fetchone()
+        print(f"Merged {nrows} rows: {inserted} inserted, {updated} updated")
+        return inserted, updated
     finally:
         cursor.close()
 
+def write_dead_letter(row, error, path=DEAD_LETTER_PATH):
+    """Append a row Snowflake rejected, with the error, to the dead-letter JSON-lines file"""
+    record = {
+        'failed_at': datetime.now().isoformat(),
+        'source_table': 'vault_events',
+        'error': str(error),
+        'row': row
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, default=str) + '\n')
+
+def is_row_error(error):
+    """Whether a Snowflake error is caused by the values of some rows (not the table, privileges or SQL)"""
+    return error.errno in ROW_ERRNOS or str(error.sqlstate or '').startswith(ROW_SQLSTATE_CLASS)
+
+def bisect_load(load, data, on_rejected):
+    """Bulk-load data with load(); on a row-level data error, retry each half until the bad rows are isolated
+
+    load(part) returns (inserted, updated). A rejected single row is handed to
+    on_rejected(row, error) instead of failing the batch, so one malformed event
+    costs O(log n) bulk loads. Errors that affect the whole batch (missing table,
+    privileges, schema mismatch, connection) propagate without retrying.
+    """
+    try:
+        return load(data)
+    except ProgrammingError as e:
+        if not is_row_error(e):
+            raise
+        if len(data) == 1:
+            on_rejected(data[0], e)
+            return 0, 0
+        print(f"Load of {len(data)} rows failed ({e}); retrying in halves")
+        middle = len(data) // 2
+        first = bisect_load(load, data[:middle], on_rejected)
+        second = bisect_load(load, data[middle:], on_rejected)
+        return first[0] + second[0], first[1] + second[1]
+
+def load_batch(conn, batch, counts):
+    """Load one prepared batch and advance the watermark in the same transaction
+
+    In merge mode, rows Snowflake rejects are isolated by bisect_load, written
+    to the dead-letter file once the batch commits, and skipped. Every retried
+    half runs write_pandas again, whose CREATE TEMP STAGE commits the halves
+    already loaded; that is harmless only because replaying a MERGE changes
+    nothing. In append mode a replay would duplicate rows, so any load error
+    fails the batch and the watermark stays put.
+    A batch whose rows were all rejected fails too instead of being skipped.
+    Adds the batch's inserted, updated and rejected rows to counts; returns the rows written.
+    """
+    data, watermark = batch
+    rejected = []
+    
+    try:
+        if LOAD_MODE == 'merge':
+            load = lambda part: merge_to_snowflake(conn, part)
+            inserted, updated = bisect_load(load, data, lambda row, error: rejected.append((row, error)))
+        else:
+            inserted, updated = load_to_snowflake(conn, data), 0
+        if rejected and len(rejected) == len(data):
+            raise RuntimeError(f"All {len(data)} rows of the batch were rejected, e.g.: {rejected[0][1]}")
+        rows_loaded = inserted + updated
+        save_sync_watermark(conn, watermark, rows_loaded)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    
+    for row, error in rejected:
+        print(f"Rejected event {row.get('TRANSACTION_HASH')} ({row.get('EVENT_TYPE')}): {error}")
+        write_dead_letter(row, error)
+    counts['rejected'] += len(rejected)
+    counts['inserted'] += inserted
+    counts['updated'] += updated
+    return rows_loaded
+
 def update_analytics_views(conn):
     """Refresh materialized views and run analytics procedures"""
     cursor = conn.cursor()
@@ -172,31 +414,170 @@ def update_analytics_views(conn):
     finally:
         cursor.close()
 
+class StageStats:
+    """Batches, rows, busy time and time blocked on its queues for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.batches = 0
+        self.rows = 0
+        self.busy = 0.0
+        self.waiting = 0.0
+
+    def add(self, rows, seconds):
+        self.batches += 1
+        self.rows += rows
+        self.busy += seconds
+
+    def summary(self):
+        rate = self.rows / self.busy if self.busy else 0
+        return (f"{self.name:<9} {self.batches} batches, {self.rows} rows, {self.busy:.1f}s busy "
+                f"({rate:,.0f} rows/s), {self.waiting:.1f}s blocked on queues")
+
+_DONE = object()
+
+def run_pipeline(batches, transform, load, depth=QUEUE_DEPTH):
+    """Extract, transform and load batches with the three stages overlapping
+
+    A fetcher thread pulls batches from the batches iterator while a transformer
+    thread converts the previous one and load() uploads the one before that on
+    this thread (which owns the Snowflake connection). Bounded queues between the
+    stages hold at most depth batches each, so a slow stage holds the others back
+    instead of letting batches pile up in memory. load() returns the rows it
+    loaded; their sum is returned. The first error of any stage stops the others and is raised.
+    """
+    extracted = queue.Queue(maxsize=depth)
+    transformed = queue.Queue(maxsize=depth)
+    stats = {name: StageStats(name) for name in ('extract', 'transform', 'load')}
+    failed = threading.Event()
+    errors = []
+    
+    def put(q, item, stage):
+        start = time.perf_counter()
+        while not failed.is_set():
+            try:
+                q.put(item, timeout=QUEUE_POLL_INTERVAL)
+                break
+            except queue.Full:
+                pass
+        stage.waiting += time.perf_counter() - start
+    
+    def get(q, stage):
+        start = time.perf_counter()
+        try:
+            while not failed.is_set():
+                try:
+                    return q.get(timeout=QUEUE_POLL_INTERVAL)
+                except queue.Empty:
+                    pass
+            return _DONE
+        finally:
+            stage.waiting += time.perf_counter() - start
+    
+    def extract_stage():
+        stage = stats['extract']
+        try:
+            pages = iter(batches)
+            while not failed.is_set():
+                start = time.perf_counter()
+                batch = next(pages, _DONE)
+                if batch is _DONE:
+                    break
+                stage.add(len(batch), time.perf_counter() - start)
+                put(extracted, batch, stage)
+        except Exception as e:
+            errors.append(e)
+            failed.set()
+        finally:
+            put(extracted, _DONE, stage)
+    
+    def transform_stage():
+        stage = stats['transform']
+        try:
+            while True:
+                batch = get(extracted, stage)
+                if batch is _DONE:
+                    break
+                start = time.perf_counter()
+                prepared = transform(batch)
+                stage.add(len(batch), time.perf_counter() - start)
+                put(transformed, prepared, stage)
+        except Exception as e:
+            errors.append(e)
+            failed.set()
+        finally:
+            put(transformed, _DONE, stage)
+    
+    threads = [
+        threading.Thread(target=extract_stage, name='sync-extract', daemon=True),
+        threading.Thread(target=transform_stage, name='sync-transform', daemon=True)
+    ]
+    for thread in threads:
+        thread.start()
+    
+    stage = stats['load']
+    total = 0
+    try:
+        while True:
+            data = get(transformed, stage)
+            if data is _DONE:
+                break
+            start = time.perf_counter()
+            rows = load(data)
+            total += rows
+            stage.add(rows, time.perf_counter() - start)
+            print(f"Batch {stage.batches}: loaded {rows} rows "
+                  f"(queued: {extracted.qsize()} to transform, {transformed.qsize()} to load)")
+    except Exception:
+        failed.set()
+        raise
+    finally:
+        for thread in threads:
+            thread.join()
+        for stage_stats in stats.values():
+            print(stage_stats.summary())
+    
+    if errors:
+        raise errors[0]
+    return total
+
 def main():
     """Main sync process"""
     print(f"Starting sync at {datetime.now()}")
+    if LOAD_MODE not in LOAD_MODES:
+        raise ValueError(f"SYNC_LOAD_MODE must be one of {', '.join(LOAD_MODES)}, not {LOAD_MODE!r}")
     
     # Initialize connections
     try:
         supabase = get_supabase_client()
         conn = get_snowflake_connection()
         
-        # Get last sync timestamp
-        last_sync = get_last_sync_timestamp(conn)
-        print(f"Last sync: {last_sync}")
+        # Resume after the last loaded Supabase id; no scan of vault_events is needed
+        ensure_sync_state(conn)
+        last_id = get_sync_watermark(conn)
+        since = None
+        if last_id is None:
+            # First watermarked sync: continue from the newest event already in Snowflake
+            last_id = 0
+            since = get_last_sync_timestamp(conn)
+            print(f"No sync watermark yet, syncing events after {since}")
+        else:
+            print(f"Last synced id: {last_id}")
         
-        # Fetch new events
-        events = fetch_new_events(supabase, last_sync)
-        print(f"Found {len(events)} new events")
+        # Fetch, prepare and load overlap: at most a few batches are in memory at a time
+        counts = {'inserted': 0, 'updated': 0, 'rejected': 0}
+        rows_loaded = run_pipeline(
+            fetch_new_events(supabase, last_id, since),
+            prepare_batch,
+            lambda batch: load_batch(conn, batch, counts)
+        )
+        print(f"Loaded {rows_loaded} events ({LOAD_MODE}): {counts['inserted']} inserted, {counts['updated']} updated")
+        if counts['rejected']:
+            print(f"{counts['rejected']} rejected events written to {DEAD_LETTER_PATH}")
         
-        if events:
-            # Prepare and load data
-            prepared_data = prepare_data_for_snowflake(events)
-            rows_loaded = load_to_snowflake(conn, prepared_data)
-            
-            # Update analytics views
-            if rows_loaded > 0:
-                update_analytics_views(conn)
+        # Update analytics views
+        if rows_loaded > 0:
+            update_analytics_views(conn)
         
         # Close connection
         conn.close()
@@ -1,15 +1,18 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import partial
 import os
-import requests
 from dotenv import load_dotenv
 
+from dashboard import startup
+
 # Load environment variables
 load_dotenv()
 
+# Cold-start profiling: MP_STARTUP_PROFILE=1 reports per-module import time and time to first render
+MP_STARTUP_PROFILE = os.getenv("MP_STARTUP_PROFILE", "0") == "1"
+startup.begin(MP_STARTUP_PROFILE)
+
 # Page config
 st.set_page_config(
     page_title="Money Protocol Analytics",
@@ -18,20 +21,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize Supabase connection
-@st.cache_data(ttl=60)
-def get_supabase_config():
-    url = os.getenv("SUPABASE_URL") or st.secrets.get("SUPABASE_URL")
-    key = os.getenv("SUPABASE_ANON_KEY") or st.secrets.get("SUPABASE_ANON_KEY")
-    
-    if not url or not key:
-        st.error("Missing Supabase credentials. Please add SUPABASE_URL and SUPABASE_ANON_KEY to Streamlit Secrets")
-        st.stop()
-    
-    return url, key
-
-SUPABASE_URL, SUPABASE_KEY = get_supabase_config()
-
 # Custom CSS
 st.markdown("""
 <style>
@@ -62,11 +51,93 @@ st.markdown("""
 # Title
 st.title("🏦 Money Protocol Analytics Dashboard")
 st.markdown("Real-time analytics for Money Protocol on RSK testnet")
+startup.mark("first paint")
+
+# The data layer (pandas and the modules built on it) is imported once the header is on screen;
+# plotly is imported by the section renderers that draw charts
+import pandas as pd
+
+from dashboard import fixtures, metrics, realtime
+from dashboard.downsample import downsample
+from dashboard.dtypes import MEMORY_REPORTS, apply_dtypes
+from dashboard.event_store import DEFAULT_CACHE_DIR, EventStore
+from dashboard.frames import IncrementalFrame, category_mask, time_mask
+from dashboard.rollups import EventRollup
+from dashboard.prefetch import prefetch, warm
+from dashboard.supabase_client import SupabaseClient, showing_first_page
+from dashboard.swr_cache import DEFAULT_MAX_ENTRIES, loader_age, refreshing, swr_cache
+
+# Initialize Supabase connection
+@st.cache_data(ttl=60)
+def get_supabase_config():
+    url = os.getenv("SUPABASE_URL") or st.secrets.get("SUPABASE_URL")
+    key = os.getenv("SUPABASE_ANON_KEY") or st.secrets.get("SUPABASE_ANON_KEY")
+    
+    if not url or not key:
+        st.error("Missing Supabase credentials. Please add SUPABASE_URL and SUPABASE_ANON_KEY to Streamlit Secrets")
+        st.stop()
+    
+    return url, key
+
+SUPABASE_URL, SUPABASE_KEY = get_supabase_config()
+
+# Wallet breakdown API; point it elsewhere (e.g. benchmarks/postgrest_stub.py) with MP_STAKING_WALLETS_URL
+MP_STAKING_WALLETS_URL = os.getenv("MP_STAKING_WALLETS_URL", "https://mp-indexer.vercel.app/api/mp-staking-wallets")
+
+# The wallet scanner walks on-chain logs, so it gets a longer read timeout than Supabase
+MP_STAKING_WALLETS_TIMEOUT = (3.05, 120)
+
+# Rows per paged Supabase request; keep at or below the PostgREST max-rows setting
+SUPABASE_PAGE_SIZE = int(os.getenv("SUPABASE_PAGE_SIZE", "1000"))
+
+# Table loads travel as CSV by default; set SUPABASE_WIRE_FORMAT=json to go back to JSON
+SUPABASE_WIRE_FORMAT = os.getenv("SUPABASE_WIRE_FORMAT", "csv")
+
+# Offline profiling: MP_FIXTURE_MODE=record saves every HTTP response, =replay serves them from disk
+MP_FIXTURE_MODE = os.getenv("MP_FIXTURE_MODE")
+MP_FIXTURE_DIR = os.getenv("MP_FIXTURE_DIR", fixtures.DEFAULT_FIXTURE_DIR)
+MP_REPLAY_LATENCY_MS = fixtures.parse_latency(os.getenv("MP_REPLAY_LATENCY_MS"))
+
+# Optional push ingestion: MP_REALTIME=1 subscribes to inserts over Supabase Realtime (needs websockets);
+# MP_REALTIME_URL overrides the project's websocket endpoint (e.g. a local stand-in server)
+MP_REALTIME = os.getenv("MP_REALTIME", "0") == "1"
+MP_REALTIME_URL = os.getenv("MP_REALTIME_URL")
+
+@st.cache_resource
+def get_supabase_client():
+    """Process-wide pooled REST client shared by every fetch_* loader"""
+    client = SupabaseClient(SUPABASE_URL, SUPABASE_KEY, wire_format=SUPABASE_WIRE_FORMAT)
+    if MP_FIXTURE_MODE:
+        fixtures.install(client.session, MP_FIXTURE_MODE, MP_FIXTURE_DIR, MP_REPLAY_LATENCY_MS)
+    return client
+
+# Local event store and fetch metrics log live here
+CACHE_DIR = os.getenv("MP_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+# One JSON line per loader call; set MP_METRICS_LOG to another file, or empty to disable
+METRICS_LOG = os.getenv("MP_METRICS_LOG", os.path.join(CACHE_DIR, "fetch_metrics.jsonl"))
+metrics.set_log_path(METRICS_LOG)
+
+@st.cache_resource
+def get_event_store():
+    """Process-wide on-disk copy of the append-only tables (set MP_CACHE_DIR to move it)"""
+    return EventStore(os.path.join(CACHE_DIR, "events.sqlite"))
 
 # ===========================================
 # SIDEBAR NAVIGATION
 # ===========================================
 
+# Granularity of the sidebar time window
+WINDOW_RESOLUTION = timedelta(minutes=1)
+
+def quantize_up(moment, resolution=WINDOW_RESOLUTION):
+    """Round a datetime up to the next resolution boundary"""
+    floor = datetime.min + (moment - datetime.min) // resolution * resolution
+    return floor if floor == moment else floor + resolution
+
+# Loader calls recorded after this point belong to the current rerun (Diagnostics panel)
+RUN_STARTED_AT = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+
 st.sidebar.markdown("## 📊 Analytics Navigation")
 
 # Main navigation
@@ -93,18 +164,24 @@ time_range = st.sidebar.selectbox(
     index=4  # Default to "All Time"
 )
 
+def time_range_window(time_range):
+    """(start, end) of a relative time range; the window ends on the next whole minute
+    so every rerun within that minute asks the loaders for the same (cacheable) range"""
+    end_date = quantize_up(datetime.now())
+    if time_range == "Last 24 Hours":
+        start_date = end_date - timedelta(days=1)
+    elif time_range == "Last 7 Days":
+        start_date = end_date - timedelta(days=7)
+    elif time_range == "Last 30 Days":
+        start_date = end_date - timedelta(days=30)
+    elif time_range == "Last 90 Days":
+        start_date = end_date - timedelta(days=90)
+    else:
+        start_date = datetime(2023, 1, 1)  # All time
+    return start_date, end_date
+
 # Calculate date range
-end_date = datetime.now()
-if time_range == "Last 24 Hours":
-    start_date = end_date - timedelta(days=1)
-elif time_range == "Last 7 Days":
-    start_date = end_date - timedelta(days=7)
-elif time_range == "Last 30 Days":
-    start_date = end_date - timedelta(days=30)
-elif time_range == "Last 90 Days":
-    start_date = end_date - timedelta(days=90)
-else:
-    start_date = datetime(2023, 1, 1)  # All time
+start_date, end_date = time_range_window(time_range)
 
 # Custom date range
 use_custom = st.sidebar.checkbox("Use Custom Date Range")
@@ -131,424 +208,530 @@ else:
 # DATA FETCHING FUNCTIONS
 # ===========================================
 
-@st.cache_data(ttl=60)
-def fetch_vault_events(start_date, end_date, event_types):
-    """Fetch vault events from Supabase"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        # Build URL
-        url = f'{SUPABASE_URL}/rest/v1/vault_events?select=*'
-        if start_date.year != 2023:  # Not "All Time"
-            url += f'&timestamp=gte.{start_date.isoformat()}'
-            url += f'&timestamp=lte.{end_date.isoformat()}'
-        
-        # Add event type filter
-        if event_types and len(event_types) < 2:
-            event_filter = '|'.join(event_types)
-            url += f'&event_type=in.({event_filter})'
-        
-        url += '&order=timestamp.desc'
-        
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            st.sidebar.error(f"Error fetching vault events: {response.status_code}")
-            return pd.DataFrame()
-            
-    except Exception as e:
-        st.sidebar.error(f"Error fetching vault events: {str(e)}")
+# Seconds before a loaded dataset is revalidated in the background
+DATA_TTL = 60
+
+# Seconds between auto-refresh ticks; the sidebar can change it per session
+AUTO_REFRESH_INTERVAL = int(os.getenv("MP_REFRESH_INTERVAL", "60"))
+MIN_REFRESH_INTERVAL = 5
+
+# Failures already shown in this run: prefetch and the section's render both read each loader
+st.session_state['reported_fetch_errors'] = set()
+
+def report_fetch_error(label, error, age):
+    """Surface a loader failure once per run; age is set when an older value is still being shown"""
+    reported = st.session_state.setdefault('reported_fetch_errors', set())
+    if (label, str(error)) in reported:
+        return
+    reported.add((label, str(error)))
+    if age is None:
+        st.sidebar.error(f"Error fetching {label}: {str(error)}")
+    else:
+        st.sidebar.warning(f"Showing {label} from {age:.0f}s ago, refresh failed: {str(error)}")
+
+def cached_loader(label, default=pd.DataFrame, live=False, max_entries=DEFAULT_MAX_ENTRIES):
+    """Stale-while-revalidate cache for a fetch_* loader; loaders raise on failure
+
+    live marks loaders that only fetch rows newer than the local copy: auto-refresh
+    reloads those on every tick. max_entries caps the argument combinations kept.
+    """
+    return swr_cache(
+        ttl=DATA_TTL, label=label, default=default, on_error=report_fetch_error, live=live, max_entries=max_entries
+    )
+
+def response_json(response):
+    """Decode a JSON response, timed for the Diagnostics panel"""
+    with metrics.timed('decode'):
+        return response.json()
+
+def json_frame(rows):
+    """Build a DataFrame from decoded JSON rows, timed for the Diagnostics panel"""
+    with metrics.timed('frame'):
+        return pd.DataFrame(rows)
+
+# Columns each vault_events consumer reads; loaders select only the union a view needs
+VAULT_EVENT_COLUMNS = {
+    'summary': ['vault_id', 'event_type', 'block_number'],
+    'overview': ['timestamp'],  # Overview KPIs and the event type pie come from summary_stats
+    'trends': ['timestamp', 'event_type'],
+    'top_vaults': ['vault_id', 'event_type', 'timestamp'],
+    'event_details': ['timestamp', 'event_type', 'block_number', 'vault_id', 'transaction_hash'],
+    'raw': ['*']  # Only the Raw Data tab needs topics/data and the rest of the row
+}
+
+def vault_event_columns(*views):
+    """Narrowest column tuple covering the given views (hashable, so usable as a cache key)
+
+    timestamp and event_type are always kept: the sidebar filters on them in memory.
+    """
+    columns = set()
+    for view in views:
+        columns.update(VAULT_EVENT_COLUMNS[view])
+    if '*' in columns:
+        return ('*',)
+    return tuple(sorted(columns | {'timestamp', 'event_type'}))
+
+# Columns mirrored in the local event store: everything but the Raw Data tab's full row
+VAULT_EVENT_STORE_COLUMNS = vault_event_columns(*[view for view in VAULT_EVENT_COLUMNS if view != 'raw'])
+
+def vault_event_window(start_date, end_date):
+    """Normalise the sidebar dates to (start, end) ISO strings, with None meaning unbounded"""
+    if start_date.year == 2023:  # "All Time"
+        return None, None
+    return start_date.isoformat(), end_date.isoformat()
+
+def selected_event_types(event_types):
+    """Event types to keep, or None when the selection does not narrow anything"""
+    return list(event_types) if event_types and len(event_types) < 2 else None
+
+def filter_event_types(df, event_types):
+    """Apply the sidebar event type selection to a loaded frame (in memory, no request)"""
+    types = selected_event_types(event_types)
+    if not types or df.empty:
+        return df
+    return df[category_mask(df['event_type'], types)].reset_index(drop=True)
+
+def window_rest_filters(start, end):
+    """PostgREST filters for a normalised (start, end) window"""
+    if start:
+        return [('timestamp', f'gte.{start}'), ('timestamp', f'lte.{end}')]
+    return []
+
+def vault_event_rest_filters(start_date, end_date):
+    """PostgREST filters for the sidebar time window"""
+    return window_rest_filters(*vault_event_window(start_date, end_date))
+
+def vault_event_sql_filters(start_date, end_date):
+    """SQLite WHERE clauses and params for the sidebar time window, for the local event store"""
+    start, end = vault_event_window(start_date, end_date)
+    if start:
+        return ['timestamp >= ? AND timestamp <= ?'], [start, end]
+    return [], []
+
+def iter_vault_event_pages(start, end, page_size=None):
+    """Stream vault events of a normalised window newest-first as page-sized DataFrames (keyset pagination on timestamp, id)"""
+    filters = window_rest_filters(start, end)
+    
+    pages = get_supabase_client().iter_pages(
+        'vault_events',
+        filters=filters,
+        keys=('timestamp', 'id'),
+        descending=True,
+        page_size=page_size or SUPABASE_PAGE_SIZE
+    )
+    for rows in pages:
+        yield vault_event_page(rows)
+
+def vault_event_page(rows):
+    """DataFrame of one page of vault_events rows from the REST API"""
+    page_df = json_frame(rows)
+    page_df['timestamp'] = pd.to_datetime(page_df['timestamp'], format='ISO8601')
+    return page_df
+
+def sync_append_only(table, select='*', indexes=()):
+    """Pull only rows newer than the local copy of an append-only table; returns the store"""
+    store = get_event_store()
+    store.sync(get_supabase_client(), table, page_size=SUPABASE_PAGE_SIZE, select=select, indexes=indexes)
+    return store
+
+def read_append_only(table, order_by, where=None, params=(), limit=None, columns=None, select='*', indexes=()):
+    """Refresh an append-only table's local copy, then read it from disk"""
+    store = sync_append_only(table, select=select, indexes=indexes)
+    return store.read(table, columns=columns, where=where, params=params, order_by=order_by, limit=limit)
+
+def sync_vault_events():
+    """Refresh the local vault_events copy (projected columns, indexed by timestamp)"""
+    return sync_append_only('vault_events', select=','.join(VAULT_EVENT_STORE_COLUMNS), indexes=('timestamp',))
+
+def parse_event_timestamps(df):
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+    return df
+
+@st.cache_resource
+def get_vault_event_frame():
+    """Process-wide in-memory superset of the stored vault events, newest first"""
+    return IncrementalFrame(
+        get_event_store(),
+        'vault_events',
+        columns=VAULT_EVENT_STORE_COLUMNS,
+        prepare=parse_event_timestamps,
+        sort_by=('timestamp', 'id')
+    )
+
+@st.cache_resource
+def get_vault_event_rollup():
+    """Process-wide hourly (bucket, event_type) rollup, fed by the in-memory superset"""
+    rollup = EventRollup()
+    get_vault_event_frame().subscribe(rollup.fold)
+    return rollup
+
+@cached_loader("vault event superset", live=True)
+def fetch_vault_event_superset():
+    """Fetch every stored vault event; only rows newer than the superset are requested
+
+    New rows travel Supabase -> local store -> memory; everything older is
+    already held, so a refresh costs one small request when nothing changed,
+    and none while the realtime feed is subscribed and pushing inserts into the
+    store (the feed still catches up over REST every few minutes).
+    """
+    feed = get_realtime_feed()
+    if feed is None or not feed.connected:
+        sync_vault_events()
+    return get_vault_event_frame().refresh()
+
+# Each cached window is a copy of part of the superset, and relative windows move every minute
+VAULT_EVENT_WINDOW_ENTRIES = 4
+
+@cached_loader("vault events", live=True, max_entries=VAULT_EVENT_WINDOW_ENTRIES)
+def fetch_vault_event_window(start, end, columns=VAULT_EVENT_STORE_COLUMNS):
+    """Every vault event between two ISO bounds (None = unbounded) as a slice of the in-memory superset
+
+    Keyed on the normalised window from vault_event_window(), so "All Time" is one
+    entry whatever the sidebar dates. Event types are not part of the key: callers
+    narrow with filter_event_types(). columns comes from vault_event_columns() so
+    each view keeps only what it uses.
+    """
+    df = fetch_vault_event_superset()
+    if df.empty:
         return pd.DataFrame()
+    
+    mask = time_mask(df['timestamp'], start, end)
+    return df.loc[mask, list(columns)].reset_index(drop=True)
 
-@st.cache_data(ttl=60)
+def fetch_vault_events(start_date, end_date, columns=VAULT_EVENT_STORE_COLUMNS):
+    """Fetch every vault event in a sidebar time window (cut out of the superset without another request)"""
+    return fetch_vault_event_window(*vault_event_window(start_date, end_date), columns)
+
+# Full rows are the widest frames cached, and relative windows move every minute
+RAW_VAULT_EVENT_WINDOW_ENTRIES = 2
+
+@cached_loader("raw vault events", max_entries=RAW_VAULT_EVENT_WINDOW_ENTRIES)
+def fetch_raw_vault_event_window(start, end):
+    """Fetch complete vault event rows (topics, data, ...) between two ISO bounds straight from Supabase"""
+    # The first page is the most recent activity; pages are concatenated once at the end
+    pages = list(iter_vault_event_pages(start, end))
+    if pages:
+        return apply_dtypes(pd.concat(pages, ignore_index=True), 'vault_events')
+    else:
+        return pd.DataFrame()
+
+def fetch_vault_events_full(start_date, end_date):
+    """Fetch complete vault event rows in a sidebar time window for the Raw Data tab"""
+    return fetch_raw_vault_event_window(*vault_event_window(start_date, end_date))
+
+@cached_loader("TVL data", live=True)
 def fetch_tvl_data():
     """Fetch TVL data from Supabase"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/tvl_snapshots?select=*&order=timestamp.desc&limit=100'
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching TVL data: {str(e)}")
+    df = read_append_only('tvl_snapshots', order_by='timestamp DESC, id DESC', limit=100)
+    
+    if not df.empty:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+        return apply_dtypes(df, 'tvl_snapshots')
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("enhanced TVL data", live=True)
 def fetch_enhanced_tvl_data():
     """Fetch enhanced TVL data with cumulative calculations (Dune style)"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
+    # Try to get data from enhanced TVL table (if it exists)
+    df = read_append_only('tvl_snapshots', order_by='timestamp ASC, id ASC', limit=1000)
+    
+    if not df.empty:
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
         
-        # Try to get data from enhanced TVL table (if it exists)
-        url = f'{SUPABASE_URL}/rest/v1/tvl_snapshots?select=*&order=timestamp.asc&limit=1000'
-        response = requests.get(url, headers=headers)
+        # Calculate cumulative values (like Dune query)
+        df = df.sort_values('timestamp')
+        df['cumulative_btc'] = df['active_pool_btc'].cumsum()  # Cumulative BTC
         
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                
-                # Calculate cumulative values (like Dune query)
-                df = df.sort_values('timestamp')
-                df['cumulative_btc'] = df['active_pool_btc'].cumsum()  # Cumulative BTC
-                
-                # Add USD calculation if price data available
-                df['cumulative_usd'] = df['cumulative_btc'] * 65000  # Mock BTC price
-                
-                # Rename for consistency with Dune query
-                df = df.rename(columns={'timestamp': 'time'})
-                
-                return df[['time', 'cumulative_btc', 'cumulative_usd', 'active_pool_btc']].copy()
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching enhanced TVL data: {str(e)}")
+        # Add USD calculation if price data available
+        df['cumulative_usd'] = df['cumulative_btc'] * 65000  # Mock BTC price
+        
+        # Rename for consistency with Dune query
+        df = df.rename(columns={'timestamp': 'time'})
+        
+        return df[['time', 'cumulative_btc', 'cumulative_usd', 'active_pool_btc']].copy()
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("BPD supply data", live=True)
 def fetch_bpd_supply_data():
     """Fetch BPD supply data from Supabase"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/bpd_supply_snapshots?select=*&order=timestamp.desc&limit=100'
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching BPD supply data: {str(e)}")
+    df = read_append_only('bpd_supply_snapshots', order_by='timestamp DESC, id DESC', limit=100)
+    
+    if not df.empty:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+        return df
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("staking gains data")
 def fetch_staking_gains_data():
     """Fetch staking gains data from Supabase"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/staking_gains_daily?select=*&order=day.desc'
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['day'] = pd.to_datetime(df['day'], format='ISO8601')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching staking gains data: {str(e)}")
+    client = get_supabase_client()
+    
+    path = 'staking_gains_daily?select=*&order=day.desc'
+    df = client.get_frame(path)
+    if not df.empty:
+        df['day'] = pd.to_datetime(df['day'], format='ISO8601')
+        return df
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("redemption gains data")
 def fetch_redemption_gains_data():
     """Fetch redemption gains data from Supabase"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/redemption_gains_daily?select=*&order=day.desc'
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['day'] = pd.to_datetime(df['day'], format='ISO8601')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching redemption gains data: {str(e)}")
+    client = get_supabase_client()
+    
+    path = 'redemption_gains_daily?select=*&order=day.desc'
+    df = client.get_frame(path)
+    if not df.empty:
+        df['day'] = pd.to_datetime(df['day'], format='ISO8601')
+        return df
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("MP staking data")
 def fetch_mp_staking_data():
     """Fetch MP staking data from Supabase"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/mp_staking_hourly?select=*&order=hour.desc&limit=168'  # Last 7 days hourly
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['hour'] = pd.to_datetime(df['hour'], format='ISO8601')
-                df = df.fillna(0)
-                # Convert to numeric
-                df['total_mp_staked'] = pd.to_numeric(df['total_mp_staked'], errors='coerce')
-                df['total_mp_claimed'] = pd.to_numeric(df['total_mp_claimed'], errors='coerce')
-                df['mp_claimed_in_hour'] = pd.to_numeric(df['mp_claimed_in_hour'], errors='coerce')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching MP staking data: {str(e)}")
+    client = get_supabase_client()
+    
+    path = 'mp_staking_hourly?select=*&order=hour.desc&limit=168'  # Last 7 days hourly
+    df = client.get_frame(path)
+    if not df.empty:
+        df['hour'] = pd.to_datetime(df['hour'], format='ISO8601')
+        df = df.fillna(0)
+        # Convert to numeric
+        df['total_mp_staked'] = pd.to_numeric(df['total_mp_staked'], errors='coerce')
+        df['total_mp_claimed'] = pd.to_numeric(df['total_mp_claimed'], errors='coerce')
+        df['mp_claimed_in_hour'] = pd.to_numeric(df['mp_claimed_in_hour'], errors='coerce')
+        return df
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("MP staking wallets", default=lambda: (pd.DataFrame(), {}))
 def fetch_mp_staking_wallets():
     """Fetch individual MP staking wallet breakdown from API"""
-    try:
-        url = 'https://mp-indexer.vercel.app/api/mp-staking-wallets'
-        response = requests.get(url)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success') and data.get('wallets'):
-                wallets_df = pd.DataFrame(data['wallets'])
-                summary = data.get('summary', {})
-                return wallets_df, summary
-            else:
-                return pd.DataFrame(), {}
-        else:
-            return pd.DataFrame(), {}
-    except Exception as e:
-        st.sidebar.error(f"Error fetching MP staking wallets: {str(e)}")
+    response = get_supabase_client().get_external(MP_STAKING_WALLETS_URL, timeout=MP_STAKING_WALLETS_TIMEOUT)
+    response.raise_for_status()
+    
+    data = response_json(response)
+    if data.get('success') and data.get('wallets'):
+        wallets_df = json_frame(data['wallets'])
+        summary = data.get('summary', {})
+        return wallets_df, summary
+    else:
         return pd.DataFrame(), {}
 
-@st.cache_data(ttl=60)
+@cached_loader("hourly BPD supply data")
 def fetch_bpd_supply_hourly_data():
     """Fetch hourly BPD supply data with cumulative calculations (Dune style)"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
+    client = get_supabase_client()
+    
+    # Try to get hourly BPD supply data
+    path = 'bpd_supply_hourly?select=*&order=hour.asc&limit=1000'
+    df = client.get_frame(path)
+    if not df.empty:
+        df['hour'] = pd.to_datetime(df['hour'])
         
-        # Try to get hourly BPD supply data
-        url = f'{SUPABASE_URL}/rest/v1/bpd_supply_hourly?select=*&order=hour.asc&limit=1000'
-        response = requests.get(url, headers=headers)
+        # Ensure cumulative supply calculation
+        if 'cumulative_supply' not in df.columns:
+            df = df.sort_values('hour')
+            df['cumulative_supply'] = df['supply_change'].cumsum()
         
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['hour'] = pd.to_datetime(df['hour'])
-                
-                # Ensure cumulative supply calculation
-                if 'cumulative_supply' not in df.columns:
-                    df = df.sort_values('hour')
-                    df['cumulative_supply'] = df['supply_change'].cumsum()
-                
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching hourly BPD supply data: {str(e)}")
+        return df
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("BPD transfer events", live=True)
 def fetch_bpd_transfer_events():
     """Fetch BPD transfer events (mint/burn)"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/bpd_transfer_events?select=*&order=block_timestamp.desc&limit=200'
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['block_timestamp'] = pd.to_datetime(df['block_timestamp'])
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching BPD transfer events: {str(e)}")
+    df = read_append_only('bpd_transfer_events', order_by='block_timestamp DESC, id DESC', limit=200)
+    
+    if not df.empty:
+        df['block_timestamp'] = pd.to_datetime(df['block_timestamp'])
+        return apply_dtypes(df, 'bpd_transfer_events')
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("vault count data")
 def fetch_vault_count_hourly_data():
     """Fetch hourly vault count data with cumulative calculations (Dune style)"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
+    client = get_supabase_client()
+    
+    # Get hourly vault count data
+    path = 'vault_count_hourly?select=*&order=hour.asc&limit=1000'
+    df = client.get_frame(path)
+    if not df.empty:
+        df['hour'] = pd.to_datetime(df['hour'])
         
-        # Get hourly vault count data
-        url = f'{SUPABASE_URL}/rest/v1/vault_count_hourly?select=*&order=hour.asc&limit=1000'
-        response = requests.get(url, headers=headers)
+        # Ensure cumulative vault count calculation
+        if 'number_of_vaults' not in df.columns:
+            df = df.sort_values('hour')
+            df['number_of_vaults'] = df['vault_count_change'].cumsum()
+            # Ensure non-negative values
+            df['number_of_vaults'] = df['number_of_vaults'].clip(lower=0)
         
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['hour'] = pd.to_datetime(df['hour'])
-                
-                # Ensure cumulative vault count calculation
-                if 'number_of_vaults' not in df.columns:
-                    df = df.sort_values('hour')
-                    df['number_of_vaults'] = df['vault_count_change'].cumsum()
-                    # Ensure non-negative values
-                    df['number_of_vaults'] = df['number_of_vaults'].clip(lower=0)
-                
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching vault count data: {str(e)}")
+        return df
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("vault lifecycle events", live=True)
 def fetch_vault_lifecycle_events():
     """Fetch vault lifecycle events (creation/closure/liquidation)"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/vault_lifecycle_events?select=*&order=block_timestamp.desc&limit=200'
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['block_timestamp'] = pd.to_datetime(df['block_timestamp'])
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching vault lifecycle events: {str(e)}")
+    df = read_append_only('vault_lifecycle_events', order_by='block_timestamp DESC, id DESC', limit=200)
+    
+    if not df.empty:
+        df['block_timestamp'] = pd.to_datetime(df['block_timestamp'])
+        return apply_dtypes(df, 'vault_lifecycle_events')
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("balance tracking data")
 def fetch_balance_tracking_data():
     """Fetch balance tracking data from Supabase (Dune Analytics style)"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        # Fetch hourly balance data
-        url = f'{SUPABASE_URL}/rest/v1/pool_balance_hourly?select=*&order=hour.desc&limit=168'  # Last 7 days
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['hour'] = pd.to_datetime(df['hour'], format='ISO8601')
-                df = df.fillna(0)
-                # Convert to numeric
-                numeric_columns = ['hourly_change_btc', 'ending_balance_btc', 'transaction_count', 'btc_price_usd', 'ending_balance_usd']
-                for col in numeric_columns:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching balance tracking data: {str(e)}")
+    client = get_supabase_client()
+    
+    # Fetch hourly balance data
+    path = 'pool_balance_hourly?select=*&order=hour.desc&limit=168'  # Last 7 days
+    df = client.get_frame(path)
+    if not df.empty:
+        df['hour'] = pd.to_datetime(df['hour'], format='ISO8601')
+        df = df.fillna(0)
+        # Convert to numeric
+        numeric_columns = ['hourly_change_btc', 'ending_balance_btc', 'transaction_count', 'btc_price_usd', 'ending_balance_usd']
+        for col in numeric_columns:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return apply_dtypes(df, 'pool_balance_hourly')
+    else:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
+@cached_loader("current pool balances")
 def fetch_current_pool_balances():
     """Fetch current pool balances from Supabase view"""
-    try:
-        headers = {
-            'apikey': SUPABASE_KEY,
-            'Authorization': f'Bearer {SUPABASE_KEY}',
-        }
-        
-        url = f'{SUPABASE_URL}/rest/v1/pool_balances_current?select=*'
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                df = pd.DataFrame(data)
-                df['last_updated'] = pd.to_datetime(df['last_updated'], format='ISO8601')
-                # Convert to numeric
-                numeric_columns = ['current_balance_btc', 'current_balance_usd', 'last_btc_price']
-                for col in numeric_columns:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                return df
-            else:
-                return pd.DataFrame()
-        else:
-            return pd.DataFrame()
-    except Exception as e:
-        st.sidebar.error(f"Error fetching current pool balances: {str(e)}")
+    client = get_supabase_client()
+    
+    path = 'pool_balances_current?select=*'
+    df = client.get_frame(path)
+    if not df.empty:
+        df['last_updated'] = pd.to_datetime(df['last_updated'], format='ISO8601')
+        # Convert to numeric
+        numeric_columns = ['current_balance_btc', 'current_balance_usd', 'last_btc_price']
+        for col in numeric_columns:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return apply_dtypes(df, 'pool_balances_current')
+    else:
         return pd.DataFrame()
 
+@cached_loader("summary stats", default=lambda: calculate_summary_stats(pd.DataFrame()))
+def fetch_summary_stats(start_date, end_date):
+    """Fetch summary KPIs over all event types computed on the server, without downloading any event rows"""
+    client = get_supabase_client()
+    start, end = vault_event_window(start_date, end_date)
+    
+    # One row from the vault_event_summary RPC (supabase-vault-summary-schema.sql)
+    response = client.rpc('vault_event_summary', {'start_ts': start, 'end_ts': end, 'event_types': None})
+    if response.status_code == 200:
+        row = response_json(response)[0]
+        return {key: int(value or 0) for key, value in row.items()}
+    
+    # RPC not deployed: exact counts via HEAD requests, distinct vaults from the local store
+    filters = vault_event_rest_filters(start_date, end_date)
+    response = client.get('vault_events', params=filters + [
+        ('select', 'block_number'), ('order', 'block_number.desc'), ('limit', '1')
+    ])
+    response.raise_for_status()
+    latest = response_json(response)
+    where, params = vault_event_sql_filters(start_date, end_date)
+    return {
+        'total_events': client.count('vault_events', filters),
+        'unique_vaults': sync_vault_events().count_distinct('vault_events', 'vault_id', where, params),
+        'total_updates': client.count('vault_events', filters + [('event_type', 'eq.VaultUpdated')]),
+        'total_liquidations': client.count('vault_events', filters + [('event_type', 'eq.VaultLiquidated')]),
+        'latest_block': latest[0]['block_number'] if latest else 0
+    }
+
+# Seconds between checks for pushed rows; a rerun only happens when some arrived
+REALTIME_POLL_INTERVAL = 1
+
+@st.cache_resource
+def get_realtime_feed():
+    """Process-wide Realtime subscription pushing inserts into the cached frames, or None when off
+
+    Pushed vault events are appended to the local store and the in-memory
+    superset (and so the rollup) without a REST request. The dashboard only
+    shows hourly aggregates of pool balance and MP staking events, so those
+    inserts invalidate the loaders reading the aggregates instead.
+    """
+    if not MP_REALTIME or not realtime.available():
+        return None
+
+    store, client, frame = get_event_store(), get_supabase_client(), get_vault_event_frame()
+    get_vault_event_rollup()  # Subscribed before the first pushed row
+    invalidates = {
+        'vault_events': [fetch_vault_event_superset, fetch_vault_event_window, fetch_summary_stats],
+        'pool_balance_events': [fetch_balance_tracking_data, fetch_current_pool_balances],
+        'mp_staking_events': [fetch_mp_staking_data],
+    }
+    store_columns = ['id', *VAULT_EVENT_STORE_COLUMNS]
+
+    def sync():
+        store.sync(client, 'vault_events', page_size=SUPABASE_PAGE_SIZE,
+                   select=','.join(VAULT_EVENT_STORE_COLUMNS), indexes=('timestamp',))
+
+    def catch_up():
+        # Inserts missed while disconnected come over REST once; pushes take over from here.
+        # Also runs every realtime.RESYNC_INTERVAL while connected, in case a push was lost
+        sync()
+        frame.refresh()
+        for loaders in invalidates.values():
+            for loader in loaders:
+                loader.invalidate()
+
+    def on_insert(table, rows):
+        if table == 'vault_events':
+            rows = sorted(rows, key=lambda row: row['id'])
+            stored = store.max_id('vault_events')
+            if stored is None or rows[0]['id'] > stored + 1:
+                # Nothing stored yet, or an id was skipped (dropped message or rolled back insert): REST fills the gap
+                sync()
+            else:
+                store.append('vault_events', [{col: row.get(col) for col in store_columns} for row in rows],
+                             indexes=('timestamp',))
+            frame.refresh()
+        for loader in invalidates[table]:
+            loader.invalidate()
+
+    url = MP_REALTIME_URL or realtime.realtime_url(SUPABASE_URL, SUPABASE_KEY)
+    return realtime.RealtimeFeed(url, invalidates, on_insert, on_connect=catch_up, key=SUPABASE_KEY).start()
+
+# Column sets requested by each vault events consumer
+OVERVIEW_COLUMNS = vault_event_columns('overview')
+SUMMARY_COLUMNS = vault_event_columns('summary')
+VAULT_ANALYTICS_COLUMNS = vault_event_columns('summary', 'trends', 'top_vaults', 'event_details')
+
+def vault_event_counts(start_date, end_date, event_types, events):
+    """Hourly event counts per type for the sidebar selection, read from the rollup
+
+    events is the window's slice from fetch_vault_events (newest first); only the
+    rows in the partial hours at the window's edges are counted from it.
+    """
+    start, end = vault_event_window(start_date, end_date)
+    counts = get_vault_event_rollup().counts(start, end, events)
+    return filter_event_types(counts, event_types)
+
+def summary_stats(start_date, end_date, event_types):
+    """Summary KPIs for the sidebar selection
+
+    The unfiltered KPIs come from the server; narrowing to one event type is
+    computed from the in-memory events, so toggling types costs no request.
+    """
+    if selected_event_types(event_types) is None:
+        return fetch_summary_stats(start_date, end_date)
+    df = filter_event_types(fetch_vault_events(start_date, end_date, SUMMARY_COLUMNS), event_types)
+    return calculate_summary_stats(df)
+
 def calculate_summary_stats(df):
     """Calculate summary statistics from vault events"""
     if df.empty:
@@ -572,20 +755,38 @@ def calculate_summary_stats(df):
 # CONTENT SECTIONS
 # ===========================================
 
+def lazy_tabs(labels, key, datasets=None):
+    """st.tabs whose bodies run only while open (guard each with tab.open)
+
+    datasets maps a tab label to the loaders only that tab reads, so they are
+    fetched when the tab is first viewed. Tabs viewed earlier in the session are
+    the likely next ones: their datasets are warmed in the background while the
+    open tab renders (a prefetch hint), so switching back is instant.
+    """
+    tabs = st.tabs(labels, key=key, on_change="rerun")
+    viewed = st.session_state.setdefault(f"{key}_viewed", set())
+    viewed.update(label for label, tab in zip(labels, tabs) if tab.open)
+    warm([
+        loader
+        for label, tab in zip(labels, tabs) if label in viewed and not tab.open
+        for loader in (datasets or {}).get(label, [])
+    ])
+    return tabs
+
 def render_overview():
     """Render the overview section"""
+    import plotly.express as px
     st.markdown("## Welcome to Money Protocol Analytics")
     st.markdown("Select a specific analytics section from the sidebar to dive deeper into the data.")
     
-    # Fetch overview data
-    df = fetch_vault_events(start_date, end_date, event_types)
-    stats = calculate_summary_stats(df)
+    # Summary KPIs are computed server-side; no event rows are needed for them
+    stats = summary_stats(start_date, end_date, event_types)
     
     # Connection status
     col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
-        if not df.empty:
-            st.success(f"✅ Connected to Supabase - Found {len(df)} events")
+        if stats['total_events'] > 0:
+            st.success(f"✅ Connected to Supabase - Found {stats['total_events']} events")
         else:
             st.warning("⚠️ No vault events found for selected filters")
     with col2:
@@ -615,13 +816,17 @@ def render_overview():
             """, unsafe_allow_html=True)
     
     # Quick charts
-    if not df.empty:
+    if stats['total_events'] > 0:
         st.markdown("## 📊 Quick Overview")
         col1, col2 = st.columns(2)
         
         with col1:
             # Event type distribution
-            event_counts = df['event_type'].value_counts()
+            event_counts = pd.Series({
+                'VaultUpdated': stats['total_updates'],
+                'VaultLiquidated': stats['total_liquidations']
+            })
+            event_counts = event_counts[event_counts > 0]
             fig = px.pie(
                 values=event_counts.values,
                 names=event_counts.index,
@@ -633,8 +838,9 @@ def render_overview():
         
         with col2:
             # Recent activity trend
-            df['date'] = df['timestamp'].dt.date
-            daily_events = df.groupby('date').size().reset_index(name='count')
+            df = fetch_vault_events(start_date, end_date, OVERVIEW_COLUMNS)
+            counts = vault_event_counts(start_date, end_date, event_types, df)
+            daily_events = counts.groupby(counts['bucket'].dt.date.rename('date'))['count'].sum().reset_index()
             fig = px.line(
                 daily_events.tail(14),
                 x='date',
@@ -647,16 +853,18 @@ def render_overview():
 
 def render_vault_analytics():
     """Render vault analytics section"""
-    df = fetch_vault_events(start_date, end_date, event_types)
+    import plotly.express as px
+    import plotly.graph_objects as go
+    window_df = fetch_vault_events(start_date, end_date, VAULT_ANALYTICS_COLUMNS)
+    df = filter_event_types(window_df, event_types)
     stats = calculate_summary_stats(df)
     
     if df.empty:
         st.warning("No vault events found for the selected time range and filters.")
         return
     
-    # Convert timestamp and add derived columns
-    df['date'] = df['timestamp'].dt.date
-    df['hour'] = df['timestamp'].dt.hour
+    # Hourly counts per event type from the rollup; the charts aggregate these
+    counts = vault_event_counts(start_date, end_date, event_types, window_df)
     
     # Key metrics
     st.markdown("## 📊 Vault Metrics")
@@ -672,230 +880,260 @@ def render_vault_analytics():
         st.metric("Liquidations", f"{stats['total_liquidations']:,}")
     
     # Create tabs for different views
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Trends", "🏆 Top Vaults", "📊 Number of Vaults (Dune Style)", "🔍 Event Details", "📋 Raw Data"])
+    tab1, tab2, tab3, tab4, tab5 = lazy_tabs(
+        ["📈 Trends", "🏆 Top Vaults", "📊 Number of Vaults (Dune Style)", "🔍 Event Details", "📋 Raw Data"],
+        key="vault_tabs",
+        datasets={"📊 Number of Vaults (Dune Style)": [fetch_vault_count_hourly_data, fetch_vault_lifecycle_events]}
+    )
     
     with tab1:
-        col1, col2 = st.columns(2)
+        if tab1.open:
+            col1, col2 = st.columns(2)
         
-        with col1:
-            # Daily events trend
-            daily_events = df.groupby(['date', 'event_type']).size().reset_index(name='count')
-            fig = px.line(
-                daily_events,
-                x='date',
-                y='count',
-                color='event_type',
-                title="Daily Event Trends",
-                labels={'date': 'Date', 'count': 'Event Count'},
-                color_discrete_map={'VaultUpdated': '#3b82f6', 'VaultLiquidated': '#ef4444'}
-            )
-            fig.update_layout(hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
+            with col1:
+                # Daily events trend
+                daily_events = counts.groupby(
+                    [counts['bucket'].dt.date.rename('date'), 'event_type']
+                )['count'].sum().reset_index()
+                fig = px.line(
+                    daily_events,
+                    x='date',
+                    y='count',
+                    color='event_type',
+                    title="Daily Event Trends",
+                    labels={'date': 'Date', 'count': 'Event Count'},
+                    color_discrete_map={'VaultUpdated': '#3b82f6', 'VaultLiquidated': '#ef4444'}
+                )
+                fig.update_layout(hovermode='x unified')
+                st.plotly_chart(fig, use_container_width=True)
         
-        with col2:
-            # Hourly distribution
-            hourly_data = df.groupby('hour').size().reset_index(name='count')
-            fig = px.bar(
-                hourly_data,
-                x='hour',
-                y='count',
-                title="Activity by Hour of Day",
-                labels={'hour': 'Hour of Day', 'count': 'Event Count'},
-                color_discrete_sequence=['#3b82f6']
+            with col2:
+                # Hourly distribution
+                hourly_data = counts.groupby(counts['bucket'].dt.hour.rename('hour'))['count'].sum().reset_index()
+                fig = px.bar(
+                    hourly_data,
+                    x='hour',
+                    y='count',
+                    title="Activity by Hour of Day",
+                    labels={'hour': 'Hour of Day', 'count': 'Event Count'},
+                    color_discrete_sequence=['#3b82f6']
+                )
+                st.plotly_chart(fig, use_container_width=True)
+        
+            # Cumulative events
+            st.markdown("### Cumulative Events Over Time")
+            cumulative = counts.groupby('bucket')['count'].sum().cumsum().rename('cumulative')
+            cumulative = cumulative.rename_axis('timestamp').reset_index()
+            fig = px.area(
+                downsample(cumulative, 'timestamp', 'cumulative'),
+                x='timestamp',
+                y='cumulative',
+                title="Cumulative Events",
+                labels={'timestamp': 'Time', 'cumulative': 'Total Events'},
+                color_discrete_sequence=['#10b981']
             )
             st.plotly_chart(fig, use_container_width=True)
-        
-        # Cumulative events
-        st.markdown("### Cumulative Events Over Time")
-        df_sorted = df.sort_values('timestamp')
-        df_sorted['cumulative'] = range(1, len(df_sorted) + 1)
-        fig = px.area(
-            df_sorted,
-            x='timestamp',
-            y='cumulative',
-            title="Cumulative Events",
-            labels={'timestamp': 'Time', 'cumulative': 'Total Events'},
-            color_discrete_sequence=['#10b981']
-        )
-        st.plotly_chart(fig, use_container_width=True)
     
     with tab2:
-        # Top vaults analysis
-        if 'vault_id' in df.columns:
-            vault_activity = df[df['vault_id'].notna()].groupby('vault_id').agg({
-                'event_type': 'count',
-                'timestamp': ['min', 'max']
-            }).reset_index()
-            vault_activity.columns = ['vault_id', 'event_count', 'first_seen', 'last_seen']
-            vault_activity = vault_activity.sort_values('event_count', ascending=False).head(10)
+        if tab2.open:
+            # Top vaults analysis
+            if 'vault_id' in df.columns:
+                vault_activity = df[df['vault_id'].notna()].groupby('vault_id', observed=True).agg({
+                    'event_type': 'count',
+                    'timestamp': ['min', 'max']
+                }).reset_index()
+                vault_activity.columns = ['vault_id', 'event_count', 'first_seen', 'last_seen']
+                vault_activity = vault_activity.sort_values('event_count', ascending=False).head(10)
+                vault_activity['vault_id'] = vault_activity['vault_id'].astype(str)
             
-            st.markdown("### Most Active Vaults")
-            st.dataframe(vault_activity, use_container_width=True)
+                st.markdown("### Most Active Vaults")
+                st.dataframe(vault_activity, use_container_width=True)
             
-            # Bar chart
-            fig = px.bar(
-                vault_activity,
-                x='vault_id',
-                y='event_count',
-                title="Top 10 Most Active Vaults",
-                labels={'vault_id': 'Vault ID', 'event_count': 'Event Count'},
-                color_discrete_sequence=['#3b82f6']
-            )
-            fig.update_layout(xaxis_tickangle=45)
-            st.plotly_chart(fig, use_container_width=True)
+                # Bar chart
+                fig = px.bar(
+                    vault_activity,
+                    x='vault_id',
+                    y='event_count',
+                    title="Top 10 Most Active Vaults",
+                    labels={'vault_id': 'Vault ID', 'event_count': 'Event Count'},
+                    color_discrete_sequence=['#3b82f6']
+                )
+                fig.update_layout(xaxis_tickangle=45)
+                st.plotly_chart(fig, use_container_width=True)
     
     with tab3:
-        # Number of Vaults - Dune Analytics style
-        st.markdown("### 📊 Number of Vaults")
-        st.markdown("Cumulative count of active vaults over time - equivalent to Liquity's Number of Troves")
+        if tab3.open:
+            # Number of Vaults - Dune Analytics style
+            st.markdown("### 📊 Number of Vaults")
+            st.markdown("Cumulative count of active vaults over time - equivalent to Liquity's Number of Troves")
         
-        # Fetch vault count data
-        vault_count_df = fetch_vault_count_hourly_data()
+            # Fetch vault count data
+            vault_count_df = fetch_vault_count_hourly_data()
         
-        if vault_count_df.empty:
-            st.warning("⚠️ No vault count data available yet")
-            st.info("💡 Run the vault count tracker to collect data: `node run-vault-count-tracker.js`")
+            if vault_count_df.empty:
+                st.warning("⚠️ No vault count data available yet")
+                st.info("💡 Run the vault count tracker to collect data: `node run-vault-count-tracker.js`")
             
-            # Show sample data structure
-            with st.expander("📋 Expected Data Structure"):
-                sample_data = pd.DataFrame({
-                    'hour': ['2024-01-01 00:00:00', '2024-01-01 01:00:00'],
-                    'vault_count_change': [3, -1],
-                    'number_of_vaults': [3, 2],
-                    'created_count': [3, 0],
-                    'closed_count': [0, 1]
-                })
-                st.dataframe(sample_data)
-        else:
-            # Create Dune-style chart
-            fig = go.Figure()
+                # Show sample data structure
+                with st.expander("📋 Expected Data Structure"):
+                    sample_data = pd.DataFrame({
+                        'hour': ['2024-01-01 00:00:00', '2024-01-01 01:00:00'],
+                        'vault_count_change': [3, -1],
+                        'number_of_vaults': [3, 2],
+                        'created_count': [3, 0],
+                        'closed_count': [0, 1]
+                    })
+                    st.dataframe(sample_data)
+            else:
+                # Create Dune-style chart
+                fig = go.Figure()
+                chart_df = downsample(vault_count_df, 'hour', 'number_of_vaults')
             
-            # Add vault count line (blue like Dune)
-            fig.add_trace(go.Scatter(
-                x=vault_count_df['hour'],
-                y=vault_count_df['number_of_vaults'],
-                mode='lines',
-                name='Number of Vaults',
-                line=dict(color='#3b82f6', width=2),
-                hovertemplate='<b>Number of Vaults</b><br>%{y:,.0f} vaults<br>%{x}<extra></extra>'
-            ))
+                # Add vault count line (blue like Dune)
+                fig.add_trace(go.Scatter(
+                    x=chart_df['hour'],
+                    y=chart_df['number_of_vaults'],
+                    mode='lines',
+                    name='Number of Vaults',
+                    line=dict(color='#3b82f6', width=2),
+                    hovertemplate='<b>Number of Vaults</b><br>%{y:,.0f} vaults<br>%{x}<extra></extra>'
+                ))
             
-            # Style like Dune Analytics
-            fig.update_layout(
-                title={
-                    'text': 'Number of Vaults',
-                    'x': 0.02,
-                    'font': {'size': 16, 'color': '#374151'}
-                },
-                xaxis=dict(
-                    title='',
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)',
-                    showline=False,
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    title='Vaults',
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)',
-                    showline=False,
-                    zeroline=False
-                ),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                hovermode='x unified',
-                height=500,
-                margin=dict(l=0, r=0, t=40, b=0)
-            )
+                # Style like Dune Analytics
+                fig.update_layout(
+                    title={
+                        'text': 'Number of Vaults',
+                        'x': 0.02,
+                        'font': {'size': 16, 'color': '#374151'}
+                    },
+                    xaxis=dict(
+                        title='',
+                        showgrid=True,
+                        gridwidth=1,
+                        gridcolor='rgba(128,128,128,0.2)',
+                        showline=False,
+                        zeroline=False
+                    ),
+                    yaxis=dict(
+                        title='Vaults',
+                        showgrid=True,
+                        gridwidth=1,
+                        gridcolor='rgba(128,128,128,0.2)',
+                        showline=False,
+                        zeroline=False
+                    ),
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    hovermode='x unified',
+                    height=500,
+                    margin=dict(l=0, r=0, t=40, b=0)
+                )
             
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            # Vault count metrics
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                current_vaults = vault_count_df['number_of_vaults'].iloc[-1]
-                st.metric("Current Vaults", f"{current_vaults:,.0f}")
-            with col2:
-                if len(vault_count_df) > 1:
-                    prev_vaults = vault_count_df['number_of_vaults'].iloc[-2]
-                    change = current_vaults - prev_vaults
-                    st.metric("Last Change", f"{change:+,.0f}")
-                else:
-                    st.metric("Last Change", "N/A")
-            with col3:
-                max_vaults = vault_count_df['number_of_vaults'].max()
-                st.metric("All-Time High", f"{max_vaults:,.0f}")
-            with col4:
-                total_created = vault_count_df['created_count'].sum()
-                st.metric("Total Created", f"{total_created:,.0f}")
+                # Vault count metrics
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    current_vaults = vault_count_df['number_of_vaults'].iloc[-1]
+                    st.metric("Current Vaults", f"{current_vaults:,.0f}")
+                with col2:
+                    if len(vault_count_df) > 1:
+                        prev_vaults = vault_count_df['number_of_vaults'].iloc[-2]
+                        change = current_vaults - prev_vaults
+                        st.metric("Last Change", f"{change:+,.0f}")
+                    else:
+                        st.metric("Last Change", "N/A")
+                with col3:
+                    max_vaults = vault_count_df['number_of_vaults'].max()
+                    st.metric("All-Time High", f"{max_vaults:,.0f}")
+                with col4:
+                    total_created = vault_count_df['created_count'].sum()
+                    st.metric("Total Created", f"{total_created:,.0f}")
             
-            # Recent vault activity
-            st.markdown("### Recent Vault Activity")
-            recent_df = vault_count_df.tail(10).copy()
-            recent_df['hour'] = pd.to_datetime(recent_df['hour']).dt.strftime('%Y-%m-%d %H:%M')
-            display_cols = ['hour', 'number_of_vaults', 'vault_count_change', 'created_count', 'closed_count', 'liquidated_count']
-            available_cols = [col for col in display_cols if col in recent_df.columns]
-            st.dataframe(recent_df[available_cols], use_container_width=True)
+                # Recent vault activity
+                st.markdown("### Recent Vault Activity")
+                recent_df = vault_count_df.tail(10).copy()
+                recent_df['hour'] = pd.to_datetime(recent_df['hour']).dt.strftime('%Y-%m-%d %H:%M')
+                display_cols = ['hour', 'number_of_vaults', 'vault_count_change', 'created_count', 'closed_count', 'liquidated_count']
+                available_cols = [col for col in display_cols if col in recent_df.columns]
+                st.dataframe(recent_df[available_cols], use_container_width=True)
             
-            # Vault lifecycle events
-            lifecycle_df = fetch_vault_lifecycle_events()
-            if not lifecycle_df.empty:
-                st.markdown("### Recent Vault Events")
-                recent_events = lifecycle_df.head(10).copy()
-                recent_events['block_timestamp'] = recent_events['block_timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-                display_cols = ['block_timestamp', 'event_type', 'vault_address', 'collateral_amount', 'debt_amount', 'transaction_hash']
-                available_cols = [col for col in display_cols if col in recent_events.columns]
-                st.dataframe(recent_events[available_cols], use_container_width=True)
+                # Vault lifecycle events
+                lifecycle_df = fetch_vault_lifecycle_events()
+                if not lifecycle_df.empty:
+                    st.markdown("### Recent Vault Events")
+                    recent_events = lifecycle_df.head(10).copy()
+                    recent_events['block_timestamp'] = recent_events['block_timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+                    display_cols = ['block_timestamp', 'event_type', 'vault_address', 'collateral_amount', 'debt_amount', 'transaction_hash']
+                    available_cols = [col for col in display_cols if col in recent_events.columns]
+                    st.dataframe(recent_events[available_cols], use_container_width=True)
     
     with tab4:
-        # Recent events
-        st.markdown("### Recent Events")
+        if tab4.open:
+            # Recent events
+            st.markdown("### Recent Events")
         
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            search_vault = st.text_input("Search by Vault ID", placeholder="Enter vault ID...")
-        with col2:
-            limit = st.number_input("Show events", min_value=10, max_value=100, value=20, step=10)
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                search_vault = st.text_input("Search by Vault ID", placeholder="Enter vault ID...")
+            with col2:
+                limit = st.number_input("Show events", min_value=10, max_value=100, value=20, step=10)
         
-        recent_df = df.sort_values('timestamp', ascending=False)
+            recent_df = df.sort_values('timestamp', ascending=False)
         
-        if search_vault:
-            recent_df = recent_df[recent_df['vault_id'].str.contains(search_vault, case=False, na=False)]
+            if search_vault:
+                recent_df = recent_df[recent_df['vault_id'].str.contains(search_vault, case=False, na=False)]
         
-        recent_df = recent_df.head(limit)
+            recent_df = recent_df.head(limit)
         
-        for _, event in recent_df.iterrows():
-            event_color = "#3b82f6" if event['event_type'] == 'VaultUpdated' else "#ef4444"
-            st.markdown(f"""
-            <div style="border-left: 3px solid {event_color}; padding: 10px; margin: 10px 0; background-color: #f9fafb;">
-                <strong>{event['event_type']}</strong> | Block: {event['block_number']} | {event['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}
-                <br>Vault: <code>{event['vault_id']}</code>
-                <br>Tx: <code>{event['transaction_hash']}</code>
-            </div>
-            """, unsafe_allow_html=True)
+            for _, event in recent_df.iterrows():
+                event_color = "#3b82f6" if event['event_type'] == 'VaultUpdated' else "#ef4444"
+                st.markdown(f"""
+                <div style="border-left: 3px solid {event_color}; padding: 10px; margin: 10px 0; background-color: #f9fafb;">
+                    <strong>{event['event_type']}</strong> | Block: {event['block_number']} | {event['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}
+                    <br>Vault: <code>{event['vault_id']}</code>
+                    <br>Tx: <code>{event['transaction_hash']}</code>
+                </div>
+                """, unsafe_allow_html=True)
     
     with tab5:
-        # Raw data
-        st.markdown("### Raw Event Data")
-        st.info(f"Showing {len(df)} events")
+        if tab5.open:
+            # Raw data
+            st.markdown("### Raw Event Data")
+        
+            # Full rows (topics, raw data hex) are only downloaded on request
+            if st.toggle("Include raw log fields (topics, data)", value=False):
+                # On a first load the newest page is shown while older pages are still being fetched
+                preview = st.empty()
+                
+                def show_first_page(rows):
+                    with preview.container():
+                        st.caption("Showing the most recent events while older ones load...")
+                        st.dataframe(filter_event_types(vault_event_page(rows), event_types), use_container_width=True)
+                
+                with showing_first_page(show_first_page):
+                    raw_df = filter_event_types(fetch_vault_events_full(start_date, end_date), event_types)
+                preview.empty()
+            else:
+                raw_df = df
+            st.info(f"Showing {len(raw_df)} events")
         
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv,
-            file_name=f"vault_events_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+            csv = raw_df.to_csv(index=False)
+            st.download_button(
+                label="📥 Download CSV",
+                data=csv,
+                file_name=f"vault_events_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
         
-        st.dataframe(df.sort_values('timestamp', ascending=False), use_container_width=True)
+            if not raw_df.empty:
+                st.dataframe(raw_df.sort_values('timestamp', ascending=False), use_container_width=True)
 
 def render_tvl_analytics():
     """Render TVL analytics section"""
+    import plotly.express as px
+    import plotly.graph_objects as go
     tvl_df = fetch_tvl_data()
-    balance_tracking_df = fetch_balance_tracking_data()
-    current_balances_df = fetch_current_pool_balances()
     
     if tvl_df.empty:
         st.warning("No TVL data available yet. The indexer will collect this data during regular operations.")
@@ -944,513 +1182,543 @@ def render_tvl_analytics():
             st.metric("Recent Change", "N/A")
     
     # Create tabs for different TVL views
-    tab1, tab2, tab3 = st.tabs(["📈 TVL Trends", "📊 Pool Distribution", "🔍 Balance Tracking (Dune Style)"])
+    tab1, tab2, tab3 = lazy_tabs(
+        ["📈 TVL Trends", "📊 Pool Distribution", "🔍 Balance Tracking (Dune Style)"],
+        key="tvl_tabs",
+        datasets={
+            "📊 Pool Distribution": [fetch_current_pool_balances],
+            "🔍 Balance Tracking (Dune Style)": [fetch_enhanced_tvl_data, fetch_balance_tracking_data]
+        }
+    )
     
     with tab1:
-        # TVL Chart
-        st.markdown("### TVL Over Time")
-        fig = px.line(
-            tvl_df.sort_values('timestamp'),
-            x='timestamp',
-            y='total_btc',
-            title='Total Value Locked Over Time',
-            labels={'timestamp': 'Time', 'total_btc': 'BTC Locked'}
-        )
-        fig.update_layout(hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        if tab1.open:
+            # TVL Chart
+            st.markdown("### TVL Over Time")
+            fig = px.line(
+                tvl_df.sort_values('timestamp'),
+                x='timestamp',
+                y='total_btc',
+                title='Total Value Locked Over Time',
+                labels={'timestamp': 'Time', 'total_btc': 'BTC Locked'}
+            )
+            fig.update_layout(hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
         
-        # Pool trends over time
-        st.markdown("### Pool Trends Over Time")
-        fig = go.Figure()
+            # Pool trends over time
+            st.markdown("### Pool Trends Over Time")
+            fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=tvl_df['timestamp'],
-            y=tvl_df['active_pool_btc'],
-            mode='lines',
-            name='Active Pool',
-            line=dict(color='#3b82f6')
-        ))
+            fig.add_trace(go.Scatter(
+                x=tvl_df['timestamp'],
+                y=tvl_df['active_pool_btc'],
+                mode='lines',
+                name='Active Pool',
+                line=dict(color='#3b82f6')
+            ))
         
-        fig.add_trace(go.Scatter(
-            x=tvl_df['timestamp'],
-            y=tvl_df['default_pool_btc'],
-            mode='lines',
-            name='Default Pool',
-            line=dict(color='#ef4444')
-        ))
+            fig.add_trace(go.Scatter(
+                x=tvl_df['timestamp'],
+                y=tvl_df['default_pool_btc'],
+                mode='lines',
+                name='Default Pool',
+                line=dict(color='#ef4444')
+            ))
         
-        fig.update_layout(
-            title='Individual Pool Balances Over Time',
-            xaxis_title='Time',
-            yaxis_title='BTC Amount',
-            hovermode='x unified'
-        )
+            fig.update_layout(
+                title='Individual Pool Balances Over Time',
+                xaxis_title='Time',
+                yaxis_title='BTC Amount',
+                hovermode='x unified'
+            )
         
-        st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True)
     
     with tab2:
-        # Pool breakdown
-        col1, col2 = st.columns(2)
+        if tab2.open:
+            current_balances_df = fetch_current_pool_balances()
+            
+            # Pool breakdown
+            col1, col2 = st.columns(2)
         
-        with col1:
-            # Current pool distribution pie chart
-            pools = ['Active Pool', 'Default Pool']
-            values = [latest_tvl['active_pool_btc'], latest_tvl['default_pool_btc']]
+            with col1:
+                # Current pool distribution pie chart
+                pools = ['Active Pool', 'Default Pool']
+                values = [latest_tvl['active_pool_btc'], latest_tvl['default_pool_btc']]
             
-            fig = px.pie(
-                values=values,
-                names=pools,
-                title='Current Pool Distribution'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+                fig = px.pie(
+                    values=values,
+                    names=pools,
+                    title='Current Pool Distribution'
+                )
+                st.plotly_chart(fig, use_container_width=True)
         
-        with col2:
-            # Current balances table (if available from balance tracking)
-            if not current_balances_df.empty:
-                st.markdown("### Current Pool Balances")
+            with col2:
+                # Current balances table (if available from balance tracking)
+                if not current_balances_df.empty:
+                    st.markdown("### Current Pool Balances")
                 
-                # Format the data for display
-                display_df = current_balances_df.copy()
-                display_df = display_df.rename(columns={
-                    'pool_type': 'Pool Type',
-                    'current_balance_btc': 'Balance (BTC)',
-                    'current_balance_usd': 'Balance (USD)',
-                    'last_updated': 'Last Updated'
-                })
+                    # Format the data for display
+                    display_df = current_balances_df.copy()
+                    display_df = display_df.rename(columns={
+                        'pool_type': 'Pool Type',
+                        'current_balance_btc': 'Balance (BTC)',
+                        'current_balance_usd': 'Balance (USD)',
+                        'last_updated': 'Last Updated'
+                    })
                 
-                # Format numeric columns
-                if 'Balance (BTC)' in display_df.columns:
-                    display_df['Balance (BTC)'] = display_df['Balance (BTC)'].round(8)
-                if 'Balance (USD)' in display_df.columns:
-                    display_df['Balance (USD)'] = display_df['Balance (USD)'].round(2)
+                    # Format numeric columns
+                    if 'Balance (BTC)' in display_df.columns:
+                        display_df['Balance (BTC)'] = display_df['Balance (BTC)'].round(8)
+                    if 'Balance (USD)' in display_df.columns:
+                        display_df['Balance (USD)'] = display_df['Balance (USD)'].round(2)
                 
-                st.dataframe(
-                    display_df[['Pool Type', 'Balance (BTC)', 'Balance (USD)', 'Last Updated']],
-                    use_container_width=True,
-                    hide_index=True
-                )
-            else:
-                st.info("Balance tracking data will appear here once the enhanced indexer runs")
+                    st.dataframe(
+                        display_df[['Pool Type', 'Balance (BTC)', 'Balance (USD)', 'Last Updated']],
+                        use_container_width=True,
+                        hide_index=True
+                    )
+                else:
+                    st.info("Balance tracking data will appear here once the enhanced indexer runs")
     
     with tab3:
-        # Enhanced TVL Analysis - Dune Style
-        st.markdown("### 📊 Total Value Locked (Dune Analytics Style)")
-        st.markdown("Cumulative RBTC flows to/from Active Pool, excluding Stability Pool - similar to Liquity on Ethereum")
-        
-        # Fetch enhanced TVL data
-        enhanced_tvl_df = fetch_enhanced_tvl_data()
-        
-        if enhanced_tvl_df.empty:
-            st.warning("⚠️ No enhanced TVL data available yet")
-            st.info("💡 Run the TVL tracker to collect cumulative flow data: `node run-tvl-tracker-enhanced.js`")
+        if tab3.open:
+            # Enhanced TVL Analysis - Dune Style
+            st.markdown("### 📊 Total Value Locked (Dune Analytics Style)")
+            st.markdown("Cumulative RBTC flows to/from Active Pool, excluding Stability Pool - similar to Liquity on Ethereum")
+        
+            # Fetch enhanced TVL data
+            enhanced_tvl_df = fetch_enhanced_tvl_data()
+            balance_tracking_df = fetch_balance_tracking_data()
+        
+            if enhanced_tvl_df.empty:
+                st.warning("⚠️ No enhanced TVL data available yet")
+                st.info("💡 Run the TVL tracker to collect cumulative flow data: `node run-tvl-tracker-enhanced.js`")
             
-            # Show sample data structure
-            with st.expander("📋 Expected Data Structure"):
-                sample_data = pd.DataFrame({
-                    'time': ['2024-01-01 00:00:00', '2024-01-01 01:00:00'],
-                    'cumulative_btc': [1.2345, 1.2456], 
-                    'cumulative_usd': [75000, 78000],
-                    'active_pool_btc': [1.2345, 0.0111]
-                })
-                st.dataframe(sample_data)
-        else:
-            # Create dual-axis chart like Dune Analytics
-            fig = go.Figure()
-            
-            # Add BTC line (left axis) - Orange like Dune
-            fig.add_trace(go.Scatter(
-                x=enhanced_tvl_df['time'],
-                y=enhanced_tvl_df['cumulative_btc'],
-                mode='lines',
-                name='RBTC',
-                line=dict(color='#f97316', width=2),
-                yaxis='y',
-                hovertemplate='<b>RBTC</b><br>%{y:.4f} RBTC<br>%{x}<extra></extra>'
-            ))
+                # Show sample data structure
+                with st.expander("📋 Expected Data Structure"):
+                    sample_data = pd.DataFrame({
+                        'time': ['2024-01-01 00:00:00', '2024-01-01 01:00:00'],
+                        'cumulative_btc': [1.2345, 1.2456], 
+                        'cumulative_usd': [75000, 78000],
+                        'active_pool_btc': [1.2345, 0.0111]
+                    })
+                    st.dataframe(sample_data)
+            else:
+                # Create dual-axis chart like Dune Analytics
+                fig = go.Figure()
+                chart_df = downsample(enhanced_tvl_df, 'time', ['cumulative_btc', 'cumulative_usd'])
             
-            # Add USD line (right axis) - Blue like Dune
-            if 'cumulative_usd' in enhanced_tvl_df.columns and not enhanced_tvl_df['cumulative_usd'].isna().all():
+                # Add BTC line (left axis) - Orange like Dune
                 fig.add_trace(go.Scatter(
-                    x=enhanced_tvl_df['time'],
-                    y=enhanced_tvl_df['cumulative_usd'],
+                    x=chart_df['time'],
+                    y=chart_df['cumulative_btc'],
                     mode='lines',
-                    name='USD',
-                    line=dict(color='#3b82f6', width=2),
-                    yaxis='y2',
-                    hovertemplate='<b>USD</b><br>$%{y:,.0f}<br>%{x}<extra></extra>'
+                    name='RBTC',
+                    line=dict(color='#f97316', width=2),
+                    yaxis='y',
+                    hovertemplate='<b>RBTC</b><br>%{y:.4f} RBTC<br>%{x}<extra></extra>'
                 ))
             
-            # Style like Dune Analytics
-            fig.update_layout(
-                title={
-                    'text': 'Total Value Locked (excluding Stability Pool)',
-                    'x': 0.02,
-                    'font': {'size': 16, 'color': '#374151'}
-                },
-                xaxis=dict(
-                    title='',
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)',
-                    showline=False,
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    title='RBTC',
-                    side='left',
-                    color='#f97316',
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)',
-                    showline=False,
-                    zeroline=False
-                ),
-                yaxis2=dict(
-                    title='USD',
-                    side='right',
-                    overlaying='y',
-                    color='#3b82f6',
-                    showgrid=False,
-                    showline=False,
-                    zeroline=False
-                ),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                hovermode='x unified',
-                height=500,
-                margin=dict(l=0, r=0, t=40, b=0),
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
+                # Add USD line (right axis) - Blue like Dune
+                if 'cumulative_usd' in enhanced_tvl_df.columns and not enhanced_tvl_df['cumulative_usd'].isna().all():
+                    fig.add_trace(go.Scatter(
+                        x=chart_df['time'],
+                        y=chart_df['cumulative_usd'],
+                        mode='lines',
+                        name='USD',
+                        line=dict(color='#3b82f6', width=2),
+                        yaxis='y2',
+                        hovertemplate='<b>USD</b><br>$%{y:,.0f}<br>%{x}<extra></extra>'
+                    ))
+            
+                # Style like Dune Analytics
+                fig.update_layout(
+                    title={
+                        'text': 'Total Value Locked (excluding Stability Pool)',
+                        'x': 0.02,
+                        'font': {'size': 16, 'color': '#374151'}
+                    },
+                    xaxis=dict(
+                        title='',
+                        showgrid=True,
+                        gridwidth=1,
+                        gridcolor='rgba(128,128,128,0.2)',
+                        showline=False,
+                        zeroline=False
+                    ),
+                    yaxis=dict(
+                        title='RBTC',
+                        side='left',
+                        color='#f97316',
+                        showgrid=True,
+                        gridwidth=1,
+                        gridcolor='rgba(128,128,128,0.2)',
+                        showline=False,
+                        zeroline=False
+                    ),
+                    yaxis2=dict(
+                        title='USD',
+                        side='right',
+                        overlaying='y',
+                        color='#3b82f6',
+                        showgrid=False,
+                        showline=False,
+                        zeroline=False
+                    ),
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    hovermode='x unified',
+                    height=500,
+                    margin=dict(l=0, r=0, t=40, b=0),
+                    legend=dict(
+                        orientation="h",
+                        yanchor="bottom",
+                        y=1.02,
+                        xanchor="right",
+                        x=1
+                    )
                 )
-            )
             
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            # TVL metrics summary
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                current_tvl = enhanced_tvl_df['cumulative_btc'].iloc[-1]
-                st.metric("Current TVL", f"{current_tvl:.4f} RBTC")
-            with col2:
-                if len(enhanced_tvl_df) > 1:
-                    prev_tvl = enhanced_tvl_df['cumulative_btc'].iloc[-2]
-                    change = current_tvl - prev_tvl
-                    st.metric("Last Change", f"{change:+.4f} RBTC")
-                else:
-                    st.metric("Last Change", "N/A")
-            with col3:
-                max_tvl = enhanced_tvl_df['cumulative_btc'].max()
-                st.metric("All-Time High", f"{max_tvl:.4f} RBTC")
-            with col4:
-                data_points = len(enhanced_tvl_df)
-                st.metric("Data Points", f"{data_points:,}")
+                # TVL metrics summary
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    current_tvl = enhanced_tvl_df['cumulative_btc'].iloc[-1]
+                    st.metric("Current TVL", f"{current_tvl:.4f} RBTC")
+                with col2:
+                    if len(enhanced_tvl_df) > 1:
+                        prev_tvl = enhanced_tvl_df['cumulative_btc'].iloc[-2]
+                        change = current_tvl - prev_tvl
+                        st.metric("Last Change", f"{change:+.4f} RBTC")
+                    else:
+                        st.metric("Last Change", "N/A")
+                with col3:
+                    max_tvl = enhanced_tvl_df['cumulative_btc'].max()
+                    st.metric("All-Time High", f"{max_tvl:.4f} RBTC")
+                with col4:
+                    data_points = len(enhanced_tvl_df)
+                    st.metric("Data Points", f"{data_points:,}")
             
-            # Recent data table
-            st.markdown("### Recent TVL Data")
-            recent_df = enhanced_tvl_df.tail(10).copy()
-            recent_df['time'] = pd.to_datetime(recent_df['time']).dt.strftime('%Y-%m-%d %H:%M')
-            recent_df = recent_df.round(6)
-            st.dataframe(recent_df, use_container_width=True)
-        
-        # Balance tracking data (existing functionality)
-        
-        if not balance_tracking_df.empty:
-            # Balance tracking metrics
-            col1, col2, col3, col4 = st.columns(4)
+                # Recent data table
+                st.markdown("### Recent TVL Data")
+                recent_df = enhanced_tvl_df.tail(10).copy()
+                recent_df['time'] = pd.to_datetime(recent_df['time']).dt.strftime('%Y-%m-%d %H:%M')
+                recent_df = recent_df.round(6)
+                st.dataframe(recent_df, use_container_width=True)
+        
+            # Balance tracking data (existing functionality)
+        
+            if not balance_tracking_df.empty:
+                # Balance tracking metrics
+                col1, col2, col3, col4 = st.columns(4)
             
-            with col1:
-                total_hours = len(balance_tracking_df)
-                st.metric("Hours Tracked", f"{total_hours:,}")
+                with col1:
+                    total_hours = len(balance_tracking_df)
+                    st.metric("Hours Tracked", f"{total_hours:,}")
             
-            with col2:
-                avg_change = balance_tracking_df['hourly_change_btc'].mean()
-                st.metric("Avg Hourly Change", f"{avg_change:.6f} BTC")
+                with col2:
+                    avg_change = balance_tracking_df['hourly_change_btc'].mean()
+                    st.metric("Avg Hourly Change", f"{avg_change:.6f} BTC")
             
-            with col3:
-                total_transactions = balance_tracking_df['transaction_count'].sum()
-                st.metric("Total Transactions", f"{total_transactions:,}")
+                with col3:
+                    total_transactions = balance_tracking_df['transaction_count'].sum()
+                    st.metric("Total Transactions", f"{total_transactions:,}")
             
-            with col4:
-                active_pools = balance_tracking_df['pool_type'].nunique()
-                st.metric("Active Pools", f"{active_pools}")
+                with col4:
+                    active_pools = balance_tracking_df['pool_type'].nunique()
+                    st.metric("Active Pools", f"{active_pools}")
             
-            # Balance tracking data table
-            st.markdown("### Hourly Balance Changes")
+                # Balance tracking data table
+                st.markdown("### Hourly Balance Changes")
             
-            # Format the data for display
-            display_df = balance_tracking_df.copy()
-            display_df = display_df.rename(columns={
-                'hour': 'Hour',
-                'pool_type': 'Pool Type',
-                'hourly_change_btc': 'Hourly Change (BTC)',
-                'ending_balance_btc': 'Ending Balance (BTC)',
-                'transaction_count': 'Transactions',
-                'ending_balance_usd': 'Ending Balance (USD)'
-            })
+                # Format the data for display
+                display_df = balance_tracking_df.copy()
+                display_df = display_df.rename(columns={
+                    'hour': 'Hour',
+                    'pool_type': 'Pool Type',
+                    'hourly_change_btc': 'Hourly Change (BTC)',
+                    'ending_balance_btc': 'Ending Balance (BTC)',
+                    'transaction_count': 'Transactions',
+                    'ending_balance_usd': 'Ending Balance (USD)'
+                })
             
-            # Format numeric columns
-            numeric_format_cols = ['Hourly Change (BTC)', 'Ending Balance (BTC)']
-            for col in numeric_format_cols:
-                if col in display_df.columns:
-                    display_df[col] = display_df[col].round(8)
+                # Format numeric columns
+                numeric_format_cols = ['Hourly Change (BTC)', 'Ending Balance (BTC)']
+                for col in numeric_format_cols:
+                    if col in display_df.columns:
+                        display_df[col] = display_df[col].round(8)
             
-            if 'Ending Balance (USD)' in display_df.columns:
-                display_df['Ending Balance (USD)'] = display_df['Ending Balance (USD)'].round(2)
+                if 'Ending Balance (USD)' in display_df.columns:
+                    display_df['Ending Balance (USD)'] = display_df['Ending Balance (USD)'].round(2)
             
-            # Show data table with filters
-            pool_filter = st.multiselect(
-                "Filter by Pool Type",
-                options=display_df['Pool Type'].unique(),
-                default=display_df['Pool Type'].unique()
-            )
+                # Show data table with filters
+                pool_types = list(display_df['Pool Type'].unique())
+                pool_filter = st.multiselect(
+                    "Filter by Pool Type",
+                    options=pool_types,
+                    default=pool_types
+                )
             
-            filtered_df = display_df[display_df['Pool Type'].isin(pool_filter)]
+                filtered_df = display_df[display_df['Pool Type'].isin(pool_filter)]
             
-            st.dataframe(
-                filtered_df[['Hour', 'Pool Type', 'Hourly Change (BTC)', 'Ending Balance (BTC)', 'Transactions']].head(50),
-                use_container_width=True,
-                hide_index=True
-            )
+                st.dataframe(
+                    filtered_df[['Hour', 'Pool Type', 'Hourly Change (BTC)', 'Ending Balance (BTC)', 'Transactions']].head(50),
+                    use_container_width=True,
+                    hide_index=True
+                )
             
-            # Download option
-            csv = filtered_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Balance Tracking Data",
-                data=csv,
-                file_name=f"balance_tracking_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+                # Download option
+                csv = filtered_df.to_csv(index=False)
+                st.download_button(
+                    label="📥 Download Balance Tracking Data",
+                    data=csv,
+                    file_name=f"balance_tracking_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
             
-            # Balance changes chart
-            if len(filtered_df) > 1:
-                st.markdown("### Balance Changes Over Time")
+                # Balance changes chart
+                if len(filtered_df) > 1:
+                    st.markdown("### Balance Changes Over Time")
                 
-                fig = go.Figure()
+                    fig = go.Figure()
                 
-                for pool_type in filtered_df['Pool Type'].unique():
-                    pool_data = filtered_df[filtered_df['Pool Type'] == pool_type].sort_values('Hour')
+                    for pool_type in filtered_df['Pool Type'].unique():
+                        pool_data = filtered_df[filtered_df['Pool Type'] == pool_type].sort_values('Hour')
                     
-                    fig.add_trace(go.Scatter(
-                        x=pool_data['Hour'],
-                        y=pool_data['Ending Balance (BTC)'],
-                        mode='lines+markers',
-                        name=f'{pool_type.title()} Pool',
-                        line=dict(width=2)
-                    ))
+                        fig.add_trace(go.Scatter(
+                            x=pool_data['Hour'],
+                            y=pool_data['Ending Balance (BTC)'],
+                            mode='lines+markers',
+                            name=f'{pool_type.title()} Pool',
+                            line=dict(width=2)
+                        ))
                 
-                fig.update_layout(
-                    title='Pool Balances Over Time (Dune Analytics Style)',
-                    xaxis_title='Time',
-                    yaxis_title='Balance (BTC)',
-                    hovermode='x unified',
-                    legend=dict(x=0.02, y=0.98)
-                )
+                    fig.update_layout(
+                        title='Pool Balances Over Time (Dune Analytics Style)',
+                        xaxis_title='Time',
+                        yaxis_title='Balance (BTC)',
+                        hovermode='x unified',
+                        legend=dict(x=0.02, y=0.98)
+                    )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(fig, use_container_width=True)
                 
-        else:
-            st.info("Balance tracking data will appear here once the enhanced indexer runs with the new balance tracking module.")
-            st.markdown("""
-            **What this will show:**
-            - Hourly balance changes for each pool (Active, Default, Stability, CollSurplus)
-            - Cumulative balance tracking over time
-            - Transaction counts and flow analysis
-            - Equivalent to Dune Analytics balance tracking queries
-            """)
+            else:
+                st.info("Balance tracking data will appear here once the enhanced indexer runs with the new balance tracking module.")
+                st.markdown("""
+                **What this will show:**
+                - Hourly balance changes for each pool (Active, Default, Stability, CollSurplus)
+                - Cumulative balance tracking over time
+                - Transaction counts and flow analysis
+                - Equivalent to Dune Analytics balance tracking queries
+                """)
 
 def render_bpd_analytics():
     """Render BPD analytics section"""
+    import plotly.express as px
+    import plotly.graph_objects as go
     st.markdown("## 🪙 BPD Supply Analytics")
     
     # Create tabs for different BPD analytics
-    tab1, tab2, tab3 = st.tabs(["📈 Total BPD Supply (Dune Style)", "📊 Supply Metrics", "🔄 Mint/Burn Events"])
+    tab1, tab2, tab3 = lazy_tabs(
+        ["📈 Total BPD Supply (Dune Style)", "📊 Supply Metrics", "🔄 Mint/Burn Events"],
+        key="bpd_tabs",
+        datasets={
+            "📈 Total BPD Supply (Dune Style)": [fetch_bpd_supply_hourly_data],
+            "📊 Supply Metrics": [fetch_bpd_supply_data],
+            "🔄 Mint/Burn Events": [fetch_bpd_transfer_events]
+        }
+    )
     
     with tab1:
-        # Dune Analytics style BPD supply chart
-        st.markdown("### Total BPD Supply")
-        st.markdown("Cumulative BPD token supply based on mint/burn events - equivalent to Liquity's LUSD supply tracking")
+        if tab1.open:
+            # Dune Analytics style BPD supply chart
+            st.markdown("### Total BPD Supply")
+            st.markdown("Cumulative BPD token supply based on mint/burn events - equivalent to Liquity's LUSD supply tracking")
         
-        # Fetch hourly supply data
-        hourly_df = fetch_bpd_supply_hourly_data()
+            # Fetch hourly supply data
+            hourly_df = fetch_bpd_supply_hourly_data()
         
-        if hourly_df.empty:
-            st.warning("⚠️ No BPD supply data available yet")
-            st.info("💡 Run the BPD supply tracker to collect data: `node run-bpd-supply-tracker.js`")
+            if hourly_df.empty:
+                st.warning("⚠️ No BPD supply data available yet")
+                st.info("💡 Run the BPD supply tracker to collect data: `node run-bpd-supply-tracker.js`")
             
-            # Show sample data structure
-            with st.expander("📋 Expected Data Structure"):
-                sample_data = pd.DataFrame({
-                    'hour': ['2024-01-01 00:00:00', '2024-01-01 01:00:00'],
-                    'supply_change': [1000.0, 500.0],
-                    'cumulative_supply': [1000.0, 1500.0],
-                    'mint_count': [2, 1],
-                    'burn_count': [0, 0]
-                })
-                st.dataframe(sample_data)
-        else:
-            # Create Dune-style chart
-            fig = go.Figure()
+                # Show sample data structure
+                with st.expander("📋 Expected Data Structure"):
+                    sample_data = pd.DataFrame({
+                        'hour': ['2024-01-01 00:00:00', '2024-01-01 01:00:00'],
+                        'supply_change': [1000.0, 500.0],
+                        'cumulative_supply': [1000.0, 1500.0],
+                        'mint_count': [2, 1],
+                        'burn_count': [0, 0]
+                    })
+                    st.dataframe(sample_data)
+            else:
+                # Create Dune-style chart
+                fig = go.Figure()
+                chart_df = downsample(hourly_df, 'hour', 'cumulative_supply')
             
-            # Add BPD supply line (blue like Dune)
-            fig.add_trace(go.Scatter(
-                x=hourly_df['hour'],
-                y=hourly_df['cumulative_supply'],
-                mode='lines',
-                name='BPD Supply',
-                line=dict(color='#3b82f6', width=2),
-                hovertemplate='<b>BPD Supply</b><br>%{y:,.2f} BPD<br>%{x}<extra></extra>'
-            ))
+                # Add BPD supply line (blue like Dune)
+                fig.add_trace(go.Scatter(
+                    x=chart_df['hour'],
+                    y=chart_df['cumulative_supply'],
+                    mode='lines',
+                    name='BPD Supply',
+                    line=dict(color='#3b82f6', width=2),
+                    hovertemplate='<b>BPD Supply</b><br>%{y:,.2f} BPD<br>%{x}<extra></extra>'
+                ))
             
-            # Style like Dune Analytics
-            fig.update_layout(
-                title={
-                    'text': 'Total BPD Supply',
-                    'x': 0.02,
-                    'font': {'size': 16, 'color': '#374151'}
-                },
-                xaxis=dict(
-                    title='',
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)',
-                    showline=False,
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    title='BPD',
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)',
-                    showline=False,
-                    zeroline=False
-                ),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                hovermode='x unified',
-                height=500,
-                margin=dict(l=0, r=0, t=40, b=0)
-            )
+                # Style like Dune Analytics
+                fig.update_layout(
+                    title={
+                        'text': 'Total BPD Supply',
+                        'x': 0.02,
+                        'font': {'size': 16, 'color': '#374151'}
+                    },
+                    xaxis=dict(
+                        title='',
+                        showgrid=True,
+                        gridwidth=1,
+                        gridcolor='rgba(128,128,128,0.2)',
+                        showline=False,
+                        zeroline=False
+                    ),
+                    yaxis=dict(
+                        title='BPD',
+                        showgrid=True,
+                        gridwidth=1,
+                        gridcolor='rgba(128,128,128,0.2)',
+                        showline=False,
+                        zeroline=False
+                    ),
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    hovermode='x unified',
+                    height=500,
+                    margin=dict(l=0, r=0, t=40, b=0)
+                )
             
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            # Supply metrics
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                current_supply = hourly_df['cumulative_supply'].iloc[-1]
-                st.metric("Current Supply", f"{current_supply:,.2f} BPD")
-            with col2:
-                if len(hourly_df) > 1:
-                    prev_supply = hourly_df['cumulative_supply'].iloc[-2]
-                    change = current_supply - prev_supply
-                    st.metric("Last Change", f"{change:+,.2f} BPD")
-                else:
-                    st.metric("Last Change", "N/A")
-            with col3:
-                max_supply = hourly_df['cumulative_supply'].max()
-                st.metric("All-Time High", f"{max_supply:,.2f} BPD")
-            with col4:
-                total_hours = len(hourly_df)
-                st.metric("Data Points", f"{total_hours:,}")
+                # Supply metrics
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    current_supply = hourly_df['cumulative_supply'].iloc[-1]
+                    st.metric("Current Supply", f"{current_supply:,.2f} BPD")
+                with col2:
+                    if len(hourly_df) > 1:
+                        prev_supply = hourly_df['cumulative_supply'].iloc[-2]
+                        change = current_supply - prev_supply
+                        st.metric("Last Change", f"{change:+,.2f} BPD")
+                    else:
+                        st.metric("Last Change", "N/A")
+                with col3:
+                    max_supply = hourly_df['cumulative_supply'].max()
+                    st.metric("All-Time High", f"{max_supply:,.2f} BPD")
+                with col4:
+                    total_hours = len(hourly_df)
+                    st.metric("Data Points", f"{total_hours:,}")
     
     with tab2:
-        # Traditional supply metrics
-        bpd_df = fetch_bpd_supply_data()
+        if tab2.open:
+            # Traditional supply metrics
+            bpd_df = fetch_bpd_supply_data()
         
-        if not bpd_df.empty:
-            latest_supply = bpd_df.iloc[0]
+            if not bpd_df.empty:
+                latest_supply = bpd_df.iloc[0]
             
-            # Supply metrics
-            col1, col2, col3, col4 = st.columns(4)
+                # Supply metrics
+                col1, col2, col3, col4 = st.columns(4)
             
-            with col1:
-                st.metric(
-                    "Current Supply",
-                    f"{latest_supply['total_supply_bpd']:,.2f}",
-                    help="Total BPD tokens in circulation"
-                )
+                with col1:
+                    st.metric(
+                        "Current Supply",
+                        f"{latest_supply['total_supply_bpd']:,.2f}",
+                        help="Total BPD tokens in circulation"
+                    )
             
-            with col2:
-                if len(bpd_df) > 1:
-                    prev_supply = bpd_df.iloc[1]['total_supply_bpd']
-                    supply_change = latest_supply['total_supply_bpd'] - prev_supply
+                with col2:
+                    if len(bpd_df) > 1:
+                        prev_supply = bpd_df.iloc[1]['total_supply_bpd']
+                        supply_change = latest_supply['total_supply_bpd'] - prev_supply
+                        st.metric(
+                            "Recent Change",
+                            f"{supply_change:+,.2f}",
+                            help="Change since last snapshot"
+                        )
+                    else:
+                        st.metric("Recent Change", "N/A")
+            
+                with col3:
+                    max_supply = bpd_df['total_supply_bpd'].max()
                     st.metric(
-                        "Recent Change",
-                        f"{supply_change:+,.2f}",
-                        help="Change since last snapshot"
+                        "Max Supply",
+                        f"{max_supply:,.2f}",
+                        help="Maximum supply recorded"
                     )
-                else:
-                    st.metric("Recent Change", "N/A")
             
-            with col3:
-                max_supply = bpd_df['total_supply_bpd'].max()
-                st.metric(
-                    "Max Supply",
-                    f"{max_supply:,.2f}",
-                    help="Maximum supply recorded"
-                )
+                with col4:
+                    min_supply = bpd_df['total_supply_bpd'].min()
+                    st.metric(
+                        "Min Supply", 
+                        f"{min_supply:,.2f}",
+                        help="Minimum supply recorded"
+                    )
             
-            with col4:
-                min_supply = bpd_df['total_supply_bpd'].min()
-                st.metric(
-                    "Min Supply", 
-                    f"{min_supply:,.2f}",
-                    help="Minimum supply recorded"
+                # Traditional supply chart
+                st.markdown("### BPD Supply Over Time")
+                fig = px.line(
+                    bpd_df.sort_values('timestamp'),
+                    x='timestamp',
+                    y='total_supply_bpd',
+                    title='BPD Token Supply Over Time',
+                    labels={'timestamp': 'Time', 'total_supply_bpd': 'BPD Supply'}
                 )
-            
-            # Traditional supply chart
-            st.markdown("### BPD Supply Over Time")
-            fig = px.line(
-                bpd_df.sort_values('timestamp'),
-                x='timestamp',
-                y='total_supply_bpd',
-                title='BPD Token Supply Over Time',
-                labels={'timestamp': 'Time', 'total_supply_bpd': 'BPD Supply'}
-            )
-            fig.update_layout(hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("No traditional BPD supply data available")
+                fig.update_layout(hovermode='x unified')
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.warning("No traditional BPD supply data available")
     
     with tab3:
-        # Mint/Burn events
-        st.markdown("### Mint and Burn Events")
+        if tab3.open:
+            # Mint/Burn events
+            st.markdown("### Mint and Burn Events")
         
-        events_df = fetch_bpd_transfer_events()
+            events_df = fetch_bpd_transfer_events()
         
-        if not events_df.empty:
-            # Event summary
-            col1, col2, col3, col4 = st.columns(4)
+            if not events_df.empty:
+                # Event summary
+                col1, col2, col3, col4 = st.columns(4)
             
-            mint_events = events_df[events_df['event_type'] == 'mint']
-            burn_events = events_df[events_df['event_type'] == 'burn']
+                mint_events = events_df[events_df['event_type'] == 'mint']
+                burn_events = events_df[events_df['event_type'] == 'burn']
             
-            with col1:
-                st.metric("Total Mint Events", f"{len(mint_events):,}")
-            with col2:
-                st.metric("Total Burn Events", f"{len(burn_events):,}")
-            with col3:
-                total_minted = mint_events['value_bpd'].sum() if len(mint_events) > 0 else 0
-                st.metric("Total Minted", f"{total_minted:,.2f} BPD")
-            with col4:
-                total_burned = burn_events['value_bpd'].sum() if len(burn_events) > 0 else 0
-                st.metric("Total Burned", f"{total_burned:,.2f} BPD")
+                with col1:
+                    st.metric("Total Mint Events", f"{len(mint_events):,}")
+                with col2:
+                    st.metric("Total Burn Events", f"{len(burn_events):,}")
+                with col3:
+                    total_minted = mint_events['value_bpd'].sum() if len(mint_events) > 0 else 0
+                    st.metric("Total Minted", f"{total_minted:,.2f} BPD")
+                with col4:
+                    total_burned = burn_events['value_bpd'].sum() if len(burn_events) > 0 else 0
+                    st.metric("Total Burned", f"{total_burned:,.2f} BPD")
             
-            # Recent events table
-            st.markdown("### Recent Transfer Events")
-            recent_events = events_df.head(20).copy()
-            recent_events['block_timestamp'] = recent_events['block_timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-            recent_events = recent_events[['block_timestamp', 'event_type', 'value_bpd', 'transaction_hash', 'block_number']]
-            st.dataframe(recent_events, use_container_width=True)
-        else:
-            st.warning("No BPD transfer events available yet")
-            st.info("Run the BPD supply tracker to collect mint/burn events")
+                # Recent events table
+                st.markdown("### Recent Transfer Events")
+                recent_events = events_df.head(20).copy()
+                recent_events['block_timestamp'] = recent_events['block_timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+                recent_events = recent_events[['block_timestamp', 'event_type', 'value_bpd', 'transaction_hash', 'block_number']]
+                st.dataframe(recent_events, use_container_width=True)
+            else:
+                st.warning("No BPD transfer events available yet")
+                st.info("Run the BPD supply tracker to collect mint/burn events")
 
 def render_staking_gains_analytics():
     """Render staking gains analytics section"""
+    import plotly.express as px
     staking_df = fetch_staking_gains_data()
     
     if staking_df.empty:
@@ -1521,6 +1789,7 @@ def render_staking_gains_analytics():
 
 def render_redemption_gains_analytics():
     """Render redemption gains analytics section"""
+    import plotly.express as px
     redemption_df = fetch_redemption_gains_data()
     
     if redemption_df.empty:
@@ -1579,8 +1848,15 @@ def render_redemption_gains_analytics():
 
 def render_mp_staking_analytics():
     """Render MP staking analytics section"""
+    import plotly.express as px
+    import plotly.graph_objects as go
     mp_staking_df = fetch_mp_staking_data()
-    wallets_df, summary = fetch_mp_staking_wallets()
+    # The wallet scanner is slow and fetched by the Wallets tab; its totals are used here
+    # once loaded, or straight away when the database has nothing to show instead
+    wallets = fetch_mp_staking_wallets.peek()
+    if wallets is None and mp_staking_df.empty:
+        wallets = fetch_mp_staking_wallets()
+    summary = wallets[1] if wallets is not None else {}
     
     st.markdown("## 🎯 MP Staking Analytics")
     st.markdown("Track total MP staked and individual wallet breakdown (equivalent to Liquity's LQTY staking)")
@@ -1637,266 +1913,397 @@ def render_mp_staking_analytics():
             help="Range of blocks scanned for staking events"
         )
     
-    # Individual Wallet Breakdown Table
-    if not wallets_df.empty:
-        st.markdown("### 👥 Individual MP Staking Wallets")
-        st.markdown("Real-time breakdown of all wallets staking MP tokens")
+    trends_tab, wallets_tab = lazy_tabs(
+        ["📈 Historical Trends", "👥 Wallets"],
+        key="mp_staking_tabs",
+        datasets={"👥 Wallets": [fetch_mp_staking_wallets]}
+    )
+    
+    with wallets_tab:
+        if wallets_tab.open:
+            wallets_df, summary = fetch_mp_staking_wallets()
+            
+            # Individual Wallet Breakdown Table
+            if not wallets_df.empty:
+                st.markdown("### 👥 Individual MP Staking Wallets")
+                st.markdown("Real-time breakdown of all wallets staking MP tokens")
         
-        try:
-            # Prepare display data
-            display_df = wallets_df.copy()
+                try:
+                    # Prepare display data
+                    display_df = wallets_df.copy()
             
-            # Debug: Show column names
-            st.write("Debug - Available columns:", list(wallets_df.columns))
+                    # Debug: Show column names
+                    st.write("Debug - Available columns:", list(wallets_df.columns))
             
-            # Format wallet addresses (show first 6 and last 4 characters)
-            if 'wallet_address' in display_df.columns:
-                display_df['wallet_display'] = display_df['wallet_address'].apply(
-                    lambda x: f"{x[:6]}...{x[-4:]}"
-                )
-            else:
-                st.error("Missing 'wallet_address' column in API response")
-                return
-        
-            # Create formatted display table
-            table_data = []
-            required_columns = ['total_mp_staked', 'percentage_of_total', 'last_activity_block', 'transaction_count']
+                    # Format wallet addresses (show first 6 and last 4 characters)
+                    if 'wallet_address' in display_df.columns:
+                        display_df['wallet_display'] = display_df['wallet_address'].apply(
+                            lambda x: f"{x[:6]}...{x[-4:]}"
+                        )
+                    else:
+                        st.error("Missing 'wallet_address' column in API response")
+                        return
+        
+                    # Create formatted display table
+                    table_data = []
+                    required_columns = ['total_mp_staked', 'percentage_of_total', 'last_activity_block', 'transaction_count']
             
-            # Check if all required columns exist
-            missing_columns = [col for col in required_columns if col not in display_df.columns]
-            if missing_columns:
-                st.error(f"Missing required columns: {missing_columns}")
-                st.write("Available data:", display_df.head())
-                return
+                    # Check if all required columns exist
+                    missing_columns = [col for col in required_columns if col not in display_df.columns]
+                    if missing_columns:
+                        st.error(f"Missing required columns: {missing_columns}")
+                        st.write("Available data:", display_df.head())
+                        return
             
-            for _, row in display_df.iterrows():
-                table_data.append({
-                    'Wallet': row['wallet_display'],
-                    'MP Staked': f"{row['total_mp_staked']:,.0f}",
-                    'Percentage': f"{row['percentage_of_total']:.2f}%",
-                    'Last Activity': f"Block {row['last_activity_block']:,}",
-                    'Transactions': f"{row['transaction_count']:,}",
-                    'Full Address': row['wallet_address']
-                })
+                    for _, row in display_df.iterrows():
+                        table_data.append({
+                            'Wallet': row['wallet_display'],
+                            'MP Staked': f"{row['total_mp_staked']:,.0f}",
+                            'Percentage': f"{row['percentage_of_total']:.2f}%",
+                            'Last Activity': f"Block {row['last_activity_block']:,}",
+                            'Transactions': f"{row['transaction_count']:,}",
+                            'Full Address': row['wallet_address']
+                        })
             
-            table_df = pd.DataFrame(table_data)
+                    table_df = pd.DataFrame(table_data)
             
-            # Display table
-            st.dataframe(
-                table_df[['Wallet', 'MP Staked', 'Percentage', 'Last Activity', 'Transactions']],
-                use_container_width=True,
-                hide_index=True
-            )
+                    # Display table
+                    st.dataframe(
+                        table_df[['Wallet', 'MP Staked', 'Percentage', 'Last Activity', 'Transactions']],
+                        use_container_width=True,
+                        hide_index=True
+                    )
         
-            # Pie chart of wallet distribution
-            col1, col2 = st.columns(2)
+                    # Pie chart of wallet distribution
+                    col1, col2 = st.columns(2)
             
-            with col1:
-                # Pie chart
-                try:
-                    fig = px.pie(
-                        display_df,
-                        values='total_mp_staked',
-                        names='wallet_display',
-                        title='MP Staking Distribution by Wallet',
-                        color_discrete_sequence=px.colors.qualitative.Set3
-                    )
-                    fig.update_traces(textposition='inside', textinfo='percent+label')
-                    fig.update_layout(showlegend=False)
-                    st.plotly_chart(fig, use_container_width=True)
-                except Exception as e:
-                    st.error(f"Error creating pie chart: {str(e)}")
-                    st.write("Data for pie chart:", display_df[['wallet_display', 'total_mp_staked']].head())
+                    with col1:
+                        # Pie chart
+                        try:
+                            fig = px.pie(
+                                display_df,
+                                values='total_mp_staked',
+                                names='wallet_display',
+                                title='MP Staking Distribution by Wallet',
+                                color_discrete_sequence=px.colors.qualitative.Set3
+                            )
+                            fig.update_traces(textposition='inside', textinfo='percent+label')
+                            fig.update_layout(showlegend=False)
+                            st.plotly_chart(fig, use_container_width=True)
+                        except Exception as e:
+                            st.error(f"Error creating pie chart: {str(e)}")
+                            st.write("Data for pie chart:", display_df[['wallet_display', 'total_mp_staked']].head())
             
-            with col2:
-                # Bar chart
-                try:
-                    fig = px.bar(
-                        display_df.sort_values('total_mp_staked', ascending=True),
-                        x='total_mp_staked',
-                        y='wallet_display',
-                        orientation='h',
-                        title='MP Staked by Wallet',
-                        labels={'total_mp_staked': 'MP Staked', 'wallet_display': 'Wallet'},
-                        color='total_mp_staked',
-                        color_continuous_scale='Blues'
-                    )
-                    fig.update_layout(showlegend=False, yaxis={'categoryorder': 'total ascending'})
-                    st.plotly_chart(fig, use_container_width=True)
-                except Exception as e:
-                    st.error(f"Error creating bar chart: {str(e)}")
-                    st.write("Data for bar chart:", display_df[['wallet_display', 'total_mp_staked']].head())
+                    with col2:
+                        # Bar chart
+                        try:
+                            fig = px.bar(
+                                display_df.sort_values('total_mp_staked', ascending=True),
+                                x='total_mp_staked',
+                                y='wallet_display',
+                                orientation='h',
+                                title='MP Staked by Wallet',
+                                labels={'total_mp_staked': 'MP Staked', 'wallet_display': 'Wallet'},
+                                color='total_mp_staked',
+                                color_continuous_scale='Blues'
+                            )
+                            fig.update_layout(showlegend=False, yaxis={'categoryorder': 'total ascending'})
+                            st.plotly_chart(fig, use_container_width=True)
+                        except Exception as e:
+                            st.error(f"Error creating bar chart: {str(e)}")
+                            st.write("Data for bar chart:", display_df[['wallet_display', 'total_mp_staked']].head())
             
-            # Recent transactions
-            st.markdown("### 📋 Recent MP Staking Transactions")
+                    # Recent transactions
+                    st.markdown("### 📋 Recent MP Staking Transactions")
             
-            try:
-                # Flatten transaction data
-                all_transactions = []
-                for _, wallet in wallets_df.iterrows():
-                    wallet_display = f"{wallet['wallet_address'][:6]}...{wallet['wallet_address'][-4:]}"
-                    for tx in wallet.get('recent_transactions', []):
-                        all_transactions.append({
-                            'Wallet': wallet_display,
-                            'Transaction Hash': tx.get('hash', ''),
-                            'Block': tx.get('block', ''),
-                            'Event Type': tx.get('eventType', ''),
-                            'Amount': f"{tx.get('amount', 0):,.2f}",
-                            'Full Address': wallet['wallet_address']
-                        })
+                    try:
+                        # Flatten transaction data
+                        all_transactions = []
+                        for _, wallet in wallets_df.iterrows():
+                            wallet_display = f"{wallet['wallet_address'][:6]}...{wallet['wallet_address'][-4:]}"
+                            for tx in wallet.get('recent_transactions', []):
+                                all_transactions.append({
+                                    'Wallet': wallet_display,
+                                    'Transaction Hash': tx.get('hash', ''),
+                                    'Block': tx.get('block', ''),
+                                    'Event Type': tx.get('eventType', ''),
+                                    'Amount': f"{tx.get('amount', 0):,.2f}",
+                                    'Full Address': wallet['wallet_address']
+                                })
                 
-                if all_transactions:
-                    tx_df = pd.DataFrame(all_transactions)
-                    tx_df = tx_df.sort_values('Block', ascending=False)
+                        if all_transactions:
+                            tx_df = pd.DataFrame(all_transactions)
+                            tx_df = tx_df.sort_values('Block', ascending=False)
                     
-                    st.dataframe(
-                        tx_df[['Wallet', 'Transaction Hash', 'Block', 'Event Type', 'Amount']].head(20),
-                        use_container_width=True,
-                        hide_index=True
-                    )
-                else:
-                    st.info("No recent transactions found")
-            except Exception as e:
-                st.error(f"Error processing transaction data: {str(e)}")
-                st.write("Available wallet data:", wallets_df.columns.tolist())
+                            st.dataframe(
+                                tx_df[['Wallet', 'Transaction Hash', 'Block', 'Event Type', 'Amount']].head(20),
+                                use_container_width=True,
+                                hide_index=True
+                            )
+                        else:
+                            st.info("No recent transactions found")
+                    except Exception as e:
+                        st.error(f"Error processing transaction data: {str(e)}")
+                        st.write("Available wallet data:", wallets_df.columns.tolist())
             
-            # Download button for full wallet data
-            csv = wallets_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download MP Staking Data",
-                data=csv,
-                file_name=f"mp_staking_wallets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+                    # Download button for full wallet data
+                    csv = wallets_df.to_csv(index=False)
+                    st.download_button(
+                        label="📥 Download MP Staking Data",
+                        data=csv,
+                        file_name=f"mp_staking_wallets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv"
+                    )
                 
-        except Exception as e:
-            st.error(f"Error processing MP staking wallet data: {str(e)}")
-            st.write("Raw API response:", summary)
-            st.write("Wallets dataframe shape:", wallets_df.shape if not wallets_df.empty else "Empty")
-    else:
-        st.info("No MP staking wallet data available. Wallets will appear here once staking events are detected.")
+                except Exception as e:
+                    st.error(f"Error processing MP staking wallet data: {str(e)}")
+                    st.write("Raw API response:", summary)
+                    st.write("Wallets dataframe shape:", wallets_df.shape if not wallets_df.empty else "Empty")
+            else:
+                st.info("No MP staking wallet data available. Wallets will appear here once staking events are detected.")
     
-    # Time Series Charts (only show if historical data available)
-    if not mp_staking_df.empty:
-        st.markdown("---")
-        st.markdown("### 📈 Historical MP Staking Trends")
-        st.markdown("*Note: Real-time current data shown above, historical trends below*")
-        
-        st.markdown("#### MP Staked Over Time")
-        fig = px.line(
-            mp_staking_df.sort_values('hour'),
-            x='hour',
-            y='total_mp_staked',
-            title='Total MP Staked',
-            labels={'hour': 'Time', 'total_mp_staked': 'MP Staked'}
-        )
-        fig.update_layout(hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Combined staking and claims chart
-        st.markdown("#### MP Staking vs Claims (Dune-style Analytics)")
+    with trends_tab:
+        if trends_tab.open:
+            # Time Series Charts (only show if historical data available)
+            if not mp_staking_df.empty:
+                st.markdown("---")
+                st.markdown("### 📈 Historical MP Staking Trends")
+                st.markdown("*Note: Real-time current data shown above, historical trends below*")
+        
+                st.markdown("#### MP Staked Over Time")
+                fig = px.line(
+                    mp_staking_df.sort_values('hour'),
+                    x='hour',
+                    y='total_mp_staked',
+                    title='Total MP Staked',
+                    labels={'hour': 'Time', 'total_mp_staked': 'MP Staked'}
+                )
+                fig.update_layout(hovermode='x unified')
+                st.plotly_chart(fig, use_container_width=True)
         
-        fig = go.Figure()
+                # Combined staking and claims chart
+                st.markdown("#### MP Staking vs Claims (Dune-style Analytics)")
         
-        fig.add_trace(go.Scatter(
-            x=mp_staking_df['hour'],
-            y=mp_staking_df['total_mp_staked'],
-            mode='lines',
-            name='Total MP Staked',
-            line=dict(color='#3b82f6', width=2)
-        ))
+                fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=mp_staking_df['hour'],
-            y=mp_staking_df['total_mp_claimed'],
-            mode='lines',
-            name='Total MP Claimed',
-            line=dict(color='#10b981', width=2)
-        ))
+                fig.add_trace(go.Scatter(
+                    x=mp_staking_df['hour'],
+                    y=mp_staking_df['total_mp_staked'],
+                    mode='lines',
+                    name='Total MP Staked',
+                    line=dict(color='#3b82f6', width=2)
+                ))
         
-        fig.update_layout(
-            title='MP Staking Analytics (Total Staked vs Total Claimed)',
-            xaxis_title='Time',
-            yaxis_title='MP Amount',
-            hovermode='x unified',
-            legend=dict(x=0.02, y=0.98)
-        )
+                fig.add_trace(go.Scatter(
+                    x=mp_staking_df['hour'],
+                    y=mp_staking_df['total_mp_claimed'],
+                    mode='lines',
+                    name='Total MP Claimed',
+                    line=dict(color='#10b981', width=2)
+                ))
         
-        st.plotly_chart(fig, use_container_width=True)
+                fig.update_layout(
+                    title='MP Staking Analytics (Total Staked vs Total Claimed)',
+                    xaxis_title='Time',
+                    yaxis_title='MP Amount',
+                    hovermode='x unified',
+                    legend=dict(x=0.02, y=0.98)
+                )
         
-        # Claims analysis
-        st.markdown("#### MP Claims Analysis")
-        col1, col2 = st.columns(2)
+                st.plotly_chart(fig, use_container_width=True)
         
-        with col1:
-            # Total MP claimed over time
-            fig = px.line(
-                mp_staking_df.sort_values('hour'),
-                x='hour',
-                y='total_mp_claimed',
-                title='Cumulative MP Claimed',
-                labels={'hour': 'Time', 'total_mp_claimed': 'Total MP Claimed'},
-                color_discrete_sequence=['#10b981']
-            )
-            fig.update_layout(hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
+                # Claims analysis
+                st.markdown("#### MP Claims Analysis")
+                col1, col2 = st.columns(2)
+        
+                with col1:
+                    # Total MP claimed over time
+                    fig = px.line(
+                        mp_staking_df.sort_values('hour'),
+                        x='hour',
+                        y='total_mp_claimed',
+                        title='Cumulative MP Claimed',
+                        labels={'hour': 'Time', 'total_mp_claimed': 'Total MP Claimed'},
+                        color_discrete_sequence=['#10b981']
+                    )
+                    fig.update_layout(hovermode='x unified')
+                    st.plotly_chart(fig, use_container_width=True)
         
-        with col2:
-            # Hourly MP claims
-            hourly_claims = mp_staking_df[mp_staking_df['mp_claimed_in_hour'] > 0]
-            if not hourly_claims.empty:
-                fig = px.bar(
-                    hourly_claims.sort_values('hour'),
-                    x='hour',
-                    y='mp_claimed_in_hour',
-                    title='MP Claimed Per Hour',
-                    labels={'hour': 'Time', 'mp_claimed_in_hour': 'MP Claimed'},
-                    color_discrete_sequence=['#f59e0b']
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No MP claims recorded yet")
+                with col2:
+                    # Hourly MP claims
+                    hourly_claims = mp_staking_df[mp_staking_df['mp_claimed_in_hour'] > 0]
+                    if not hourly_claims.empty:
+                        fig = px.bar(
+                            hourly_claims.sort_values('hour'),
+                            x='hour',
+                            y='mp_claimed_in_hour',
+                            title='MP Claimed Per Hour',
+                            labels={'hour': 'Time', 'mp_claimed_in_hour': 'MP Claimed'},
+                            color_discrete_sequence=['#f59e0b']
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+                    else:
+                        st.info("No MP claims recorded yet")
 
 # ===========================================
 # MAIN CONTENT RENDERING
 # ===========================================
 
-# Render content based on selected section
-if analytics_section == "🏠 Overview":
-    render_overview()
-elif analytics_section == "🏦 Vault Analytics":
-    render_vault_analytics()
-elif analytics_section == "💰 TVL Analytics":
-    render_tvl_analytics()
-elif analytics_section == "🪙 BPD Analytics":
-    render_bpd_analytics()
-elif analytics_section == "📈 Gains from Staking Analytics":
-    render_staking_gains_analytics()
-elif analytics_section == "🔄 Redemption Gains from Staking Analytics":
-    render_redemption_gains_analytics()
-elif analytics_section == "🎯 MP Staking Analytics":
-    render_mp_staking_analytics()
+def section_datasets(section):
+    """Datasets a section reads whichever tab is open; they are fetched concurrently before it renders
+
+    Datasets of a single tab are left to that tab (see lazy_tabs).
+    """
+    return {
+        "🏠 Overview": [
+            partial(fetch_summary_stats, start_date, end_date),
+            partial(fetch_vault_event_window, *vault_event_window(start_date, end_date), OVERVIEW_COLUMNS)
+        ],
+        "🏦 Vault Analytics": [
+            partial(fetch_vault_event_window, *vault_event_window(start_date, end_date), VAULT_ANALYTICS_COLUMNS)
+        ],
+        "💰 TVL Analytics": [fetch_tvl_data],
+        "🪙 BPD Analytics": [],
+        "📈 Gains from Staking Analytics": [fetch_staking_gains_data],
+        "🔄 Redemption Gains from Staking Analytics": [fetch_redemption_gains_data],
+        "🎯 MP Staking Analytics": [fetch_mp_staking_data]
+    }.get(section, [])
+
+SECTION_RENDERERS = {
+    "🏠 Overview": render_overview,
+    "🏦 Vault Analytics": render_vault_analytics,
+    "💰 TVL Analytics": render_tvl_analytics,
+    "🪙 BPD Analytics": render_bpd_analytics,
+    "📈 Gains from Staking Analytics": render_staking_gains_analytics,
+    "🔄 Redemption Gains from Staking Analytics": render_redemption_gains_analytics,
+    "🎯 MP Staking Analytics": render_mp_staking_analytics
+}
+
+@st.fragment(run_every=REALTIME_POLL_INTERVAL)
+def watch_realtime(feed):
+    """Rerun the app once pushed rows have been ingested; otherwise only this status line reruns"""
+    if feed.version != st.session_state.get('realtime_version'):
+        st.session_state['realtime_version'] = feed.version
+        st.rerun()
+    st.caption("🟢 Live updates" if feed.connected else "🟠 Live updates connecting...")
+
+realtime_feed = get_realtime_feed()
+if realtime_feed is not None:
+    # Everything ingested so far is rendered by this run
+    st.session_state['realtime_version'] = realtime_feed.version
+    with st.sidebar:
+        watch_realtime(realtime_feed)
+elif MP_REALTIME:
+    st.sidebar.warning("Realtime updates need the websockets package; polling instead")
+
+# Timed auto-refresh reruns only the section fragment below, never the whole script
+auto_refresh = st.sidebar.checkbox("Auto-refresh", value=False)
+refresh_interval = None
+if auto_refresh:
+    refresh_interval = st.sidebar.number_input(
+        "Refresh every (seconds)",
+        min_value=MIN_REFRESH_INTERVAL,
+        value=max(AUTO_REFRESH_INTERVAL, MIN_REFRESH_INTERVAL),
+        step=5
+    )
+
+def render_footer(datasets):
+    """Data age and auto-refresh state under the section"""
+    # Oldest dataset shown in this section (values may be served stale while they revalidate)
+    data_ages = [age for age in map(loader_age, datasets) if age is not None]
+    last_updated = datetime.now() - timedelta(seconds=max(data_ages, default=0))
+    refresh_text = f"Every {refresh_interval}s" if auto_refresh else "Disabled"
+
+    st.markdown("---")
+    st.markdown(
+        f"""
+        <div style="text-align: center; color: #6b7280; padding: 1rem;">
+            Money Protocol Analytics Dashboard | Real-time RSK Testnet Data
+            <br>Last updated: {last_updated.strftime("%Y-%m-%d %H:%M:%S")}<br>
+            <small>Auto-refresh: {refresh_text}</small>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+@st.fragment(run_every=refresh_interval)
+def render_section():
+    """The selected section and the footer; an auto-refresh tick reruns only this
+
+    On a tick, relative windows move forward and live (append-only) datasets are
+    reloaded incrementally, fetching only rows newer than the local copy. The
+    other datasets keep revalidating in the background on DATA_TTL.
+    """
+    global start_date, end_date
+    if auto_refresh and not use_custom:
+        start_date, end_date = time_range_window(time_range)
+    datasets = section_datasets(analytics_section)
+
+    with refreshing(refresh_interval):
+        # Prefetch stage: warm the cache for every dataset of the selected section
+        with st.spinner("Loading data..."):
+            prefetch(datasets)
+        SECTION_RENDERERS[analytics_section]()
+    render_footer(datasets)
+
+render_section()
+startup.mark("section rendered")
+startup.finish()
 
 # ===========================================
-# FOOTER
+# DIAGNOSTICS
 # ===========================================
 
-# Auto-refresh option in sidebar
-auto_refresh = st.sidebar.checkbox("Auto-refresh", value=False)
+def render_diagnostics():
+    """Sidebar panel with per-loader timings, bytes, rows and cache outcomes"""
+    records = pd.DataFrame(metrics.history())
+    with st.sidebar.expander("🩺 Diagnostics", expanded=True):
+        if records.empty:
+            st.info("No loader calls recorded yet")
+            return
 
-# Footer
-st.markdown("---")
-st.markdown(
-    f"""
-    <div style="text-align: center; color: #6b7280; padding: 1rem;">
-        Money Protocol Analytics Dashboard | Real-time RSK Testnet Data
-        <br>Last updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}<br>
-        <small>Auto-refresh: {'Enabled' if auto_refresh else 'Disabled'}</small>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+        records['kib'] = (records['bytes'] / 1024).round(1)
+        timing_columns = ['wall_s', 'http_s', 'decode_s', 'store_s', 'frame_s']
 
-# Auto-refresh logic
-if auto_refresh:
-    st.rerun()
\ No newline at end of file
+        st.markdown("**This run**")
+        this_run = records[records['at'] >= RUN_STARTED_AT]
+        st.dataframe(
+            this_run[['loader', 'cache'] + timing_columns + ['requests', 'kib', 'rows', 'error']],
+            hide_index=True
+        )
+
+        st.markdown(f"**Per loader (last {len(records)} calls)**")
+        summary = records.groupby('loader').agg(
+            calls=('loader', 'size'),
+            hits=('cache', lambda c: c.isin(['hit', 'stale']).sum()),
+            misses=('cache', lambda c: c.isin(['miss', 'refresh']).sum()),
+            p50_wall_s=('wall_s', 'median'),
+            max_wall_s=('wall_s', 'max'),
+            http_s=('http_s', 'sum'),
+            kib=('kib', 'sum'),
+            errors=('error', 'count')
+        ).sort_values('max_wall_s', ascending=False)
+        st.dataframe(summary.round(3))
+
+        if MEMORY_REPORTS:
+            st.markdown("**Frame memory (compact dtypes)**")
+            memory = pd.DataFrame.from_dict(MEMORY_REPORTS, orient='index')
+            memory['kib_before'] = (memory.pop('bytes_before') / 1024).round(1)
+            memory['kib_after'] = (memory.pop('bytes_after') / 1024).round(1)
+            st.dataframe(memory)
+
+        startup_report = startup.report()
+        if startup_report:
+            st.markdown("**Cold start (first run of this process)**")
+            st.dataframe(pd.DataFrame(startup_report['marks'], columns=['milestone', 'seconds']), hide_index=True)
+            imports = pd.DataFrame(startup_report['imports'])
+            st.dataframe(
+                imports[imports['depth'] == 0].sort_values('import_s', ascending=False).drop(columns='depth'),
+                hide_index=True
+            )
+
+        if METRICS_LOG:
+            st.caption(f"Every call is logged to {METRICS_LOG}")
+
+if st.sidebar.checkbox("Show diagnostics", value=False):
+    render_diagnostics()
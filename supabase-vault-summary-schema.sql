@@ -0,0 +1,33 @@
+-- Vault Event Summary RPC
+-- Computes the dashboard's overview KPIs in Postgres so the client fetches one row instead of every event
+-- Called as POST /rest/v1/rpc/vault_event_summary
+
+CREATE OR REPLACE FUNCTION vault_event_summary(
+  start_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+  end_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+  event_types TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+  total_events BIGINT,
+  unique_vaults BIGINT,
+  total_updates BIGINT,
+  total_liquidations BIGINT,
+  latest_block INTEGER
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    COUNT(*) AS total_events,
+    COUNT(DISTINCT vault_id) AS unique_vaults,
+    COUNT(*) FILTER (WHERE event_type = 'VaultUpdated') AS total_updates,
+    COUNT(*) FILTER (WHERE event_type = 'VaultLiquidated') AS total_liquidations,
+    COALESCE(MAX(block_number), 0) AS latest_block
+  FROM vault_events
+  WHERE (start_ts IS NULL OR timestamp >= start_ts)
+    AND (end_ts IS NULL OR timestamp <= end_ts)
+    AND (event_types IS NULL OR event_type = ANY(event_types));
+$$;
+
+-- Allow the dashboard's anon key to call it
+GRANT EXECUTE ON FUNCTION vault_event_summary(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE, TEXT[]) TO anon;